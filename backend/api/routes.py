@@ -38,6 +38,7 @@ from backend.stream_profiles import get_stream_profile_definitions, TVH_COMPATIB
 from backend.plex.runtime import build_plex_settings_for_runtime, parse_plex_servers_json, plex_runtime_summary
 from backend.tvheadend.tvh_requests import configure_tvh
 from backend.utils import convert_to_int, to_utc_iso
+from backend.xc.cache import invalidate_xc_catalogue
 
 _TVH_PROXY_CONNECT_TIMEOUT = float(os.environ.get("TVH_PROXY_CONNECT_TIMEOUT_SECONDS", "15"))
 _TVH_PROXY_STREAM_READ_TIMEOUT = float(os.environ.get("TVH_PROXY_STREAM_READ_TIMEOUT_SECONDS", "120"))
@@ -408,6 +409,7 @@ async def api_get_background_tasks():
             "current_task": await task_broker.get_currently_running_task(),
             "current_concurrent_tasks": await task_broker.get_currently_running_concurrent_tasks(),
             "pending_tasks": await task_broker.get_pending_tasks(),
+            "source_refreshes": await task_broker.get_source_refresh_progress(),
         }
 
     task_broker = await TaskQueueBroker.get_instance()
@@ -499,6 +501,7 @@ async def api_save_config():
     # Save the config
     config.update_settings(json_data)
     config.save_settings()
+    invalidate_xc_catalogue()
 
     # Store settings for TVH service (async via task queue)
     tvh_update_requested = any(
@@ -1,12 +1,12 @@
 #!/usr/bin/env python3
 # -*- coding:utf-8 -*-
-import io
 import json
+import os
 import time
 from datetime import datetime
 from typing import Any
 from backend.api import blueprint
-from quart import request, jsonify, current_app, send_file
+from quart import request, jsonify, current_app, Response
 from urllib.parse import unquote, urlparse
 
 from backend.auth import admin_auth_required, audit_stream_event, get_request_user, streamer_or_admin_required
@@ -20,6 +20,8 @@ from backend.channels import (
     update_channels_order,
     queue_background_channel_update_tasks,
     read_channel_logo,
+    invalidate_channel_logo_cache,
+    CHANNEL_LOGO_IMMUTABLE_MAX_AGE_SECONDS,
     add_channels_from_groups,
     read_logo_health_map,
     build_bulk_epg_match_preview,
@@ -29,6 +31,7 @@ from backend.channels import (
     build_cso_channel_stream_url,
 )
 from backend.epgs import build_channel_logo_output_url
+from backend.http_headers import etag_matches
 from backend.streaming import build_local_hls_proxy_url, normalize_local_proxy_url
 from backend.url_resolver import get_request_base_url
 from backend.utils import fast_url_hash, parse_entity_id, is_truthy, to_utc_iso
@@ -669,6 +672,7 @@ async def api_apply_channel_logo_suggestion(channel_id):
 
             channel.logo_url = chosen
             channel.logo_base64 = None
+            invalidate_channel_logo_cache(channel.id)
 
     config = current_app.config["APP_CONFIG"]
     await queue_background_channel_update_tasks(config)
@@ -1209,12 +1213,21 @@ async def api_get_channel_logo(channel_id, file_placeholder):
         channel_id = parse_entity_id(channel_id, "channel")
     except ValueError:
         return jsonify({"success": False, "message": "Invalid channel id"}), 400
-    image_base64_string, mime_type = await read_channel_logo(channel_id)
-    # Convert to a BytesIO object for sending file
-    image_io = io.BytesIO(image_base64_string)
-    image_io.seek(0)
-    # Return file blob
-    return await send_file(image_io, mimetype=mime_type)
+    # The file name is the logo URL's version token, so a URL whose token matches the current source
+    # logo can be cached by clients indefinitely.
+    source_token = os.path.splitext(file_placeholder)[0]
+    logo = await read_channel_logo(channel_id, source_token)
+    if logo is None:
+        return jsonify({"success": False, "message": "Channel not found"}), 404
+    headers = {
+        "ETag": logo.etag,
+        "Cache-Control": (
+            f"public, max-age={CHANNEL_LOGO_IMMUTABLE_MAX_AGE_SECONDS}, immutable" if logo.immutable else "no-cache"
+        ),
+    }
+    if etag_matches(request.headers.get("If-None-Match"), logo.etag):
+        return Response(status=304, headers=headers)
+    return Response(logo.data, mimetype=logo.mime_type, headers=headers)
 
 
 @blueprint.route("/tic-api/channels/settings/groups/add", methods=["POST"])
@@ -1,26 +1,49 @@
 #!/usr/bin/env python3
 # -*- coding:utf-8 -*-
-import unicodedata
+import os
 
-from quart import Response, current_app, request
+from quart import Response, current_app, request, send_file
 
 from backend.api import blueprint
 from backend.auth import audit_stream_event, get_request_stream_user, stream_key_required
-from backend.epgs import render_xmltv_payload
+from backend.epgs import ensure_xmltv_variant
+from backend.http_headers import accepts_gzip, etag_matches
 from backend.url_resolver import get_request_base_url
 
 
-def _strip_unicode_format_chars(value: str) -> str:
-    return "".join(ch for ch in str(value or "") if unicodedata.category(ch) != "Cf")
-
-
 async def build_xmltv_response(sanitise_unicode: bool = False):
     config = current_app.config["APP_CONFIG"]
     base_url = get_request_base_url(request)
-    payload = render_xmltv_payload(config, base_url)
-    if sanitise_unicode:
-        payload = _strip_unicode_format_chars(payload)
-    return Response(payload, mimetype="application/xml")
+    try:
+        variant = await ensure_xmltv_variant(config, base_url, sanitise_unicode=sanitise_unicode)
+    except FileNotFoundError:
+        return Response("XMLTV guide has not been built yet.", status=404, mimetype="text/plain")
+
+    use_gzip = accepts_gzip(request.headers.get("Accept-Encoding")) and os.path.exists(variant["gz_path"])
+    etag = variant["etag"]
+    if use_gzip:
+        etag = f'{etag[:-1]}-gz"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+    }
+    if etag_matches(request.headers.get("If-None-Match"), etag):
+        response = Response("", status=304)
+        response.headers.update(headers)
+        response.last_modified = variant["last_modified"]
+        return response
+
+    response = await send_file(
+        variant["gz_path"] if use_gzip else variant["xml_path"],
+        mimetype="application/xml",
+        add_etags=False,
+        last_modified=variant["last_modified"],
+    )
+    response.headers.update(headers)
+    if use_gzip:
+        response.headers["Content-Encoding"] = "gzip"
+    return response
 
 
 @blueprint.route("/tic-api/epg/xmltv.xml")
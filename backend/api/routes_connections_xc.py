@@ -16,12 +16,14 @@ from backend.auth import (
     audit_stream_event,
     forbidden_response,
     get_request_client_ip,
+    lookup_user_by_xc_credentials,
     mark_stream_key_usage,
     precheck_stream_auth_limit,
     record_failed_stream_auth,
 )
 from backend.channels import read_config_all_channels
 from backend.epgs import build_channel_logo_output_url, load_preferred_epg_channel_row
+from backend.http_headers import etag_matches
 from backend.models import EpgChannelProgrammes, PlaylistStreams, Session, XcAccount
 from backend.cso import (
     CS_VOD_USE_PROXY_SESSION,
@@ -35,11 +37,11 @@ from backend.playlists import (
     build_m3u_playlist_content,
     read_config_all_playlists,
 )
-from backend.xc.cache import xc_cache
+from backend.xc.cache import XC_CATALOGUE_LIVE, XC_CATALOGUE_VOD, xc_catalogue_cache
 from backend.stream_activity import stop_stream_activity, touch_stream_activity, upsert_stream_activity
 from backend.stream_profiles import content_type_for_media_path, is_hls_stream_profile
 from backend.url_resolver import get_request_base_url, get_request_host_info
-from backend.users import get_user_by_username, user_timeshift_enabled
+from backend.users import user_timeshift_enabled
 from backend.utils import convert_to_int
 from backend.vod import (
     VOD_KIND_MOVIE,
@@ -94,7 +96,7 @@ async def _xc_auth_user(username: str | None = None, password: str | None = None
             limiter_result.retry_after,
         )
 
-    user = await get_user_by_username(username)
+    user = await lookup_user_by_xc_credentials(username, password)
     user_is_active = cast(bool, user.is_active) if user is not None else False
     if user is None or not user_is_active:
         failure_result = await record_failed_stream_auth(failure_key=failure_key, attempted_username=username)
@@ -104,14 +106,6 @@ async def _xc_auth_user(username: str | None = None, password: str | None = None
                 failure_result.retry_after,
             )
         return None, (jsonify({"error": "Unauthorized"}), 401)
-    if str(user.streaming_key) != password:
-        failure_result = await record_failed_stream_auth(failure_key=failure_key, attempted_username=username)
-        if not failure_result.allowed:
-            return None, _xc_rate_limited_response(
-                "Too many invalid stream key attempts. Please try again later.",
-                failure_result.retry_after,
-            )
-        return None, (jsonify({"error": "Unauthorized"}), 401)
     await mark_stream_key_usage(user)
     return user, None
 
@@ -127,10 +121,9 @@ def _xc_channel_profile(channel: Dict[str, Any]) -> str:
     return "default"
 
 
-async def _get_enabled_channels() -> List[Dict[str, Any]]:
+async def _get_enabled_channels(base_url: str) -> List[Dict[str, Any]]:
     config = current_app.config["APP_CONFIG"]
     channels = await read_config_all_channels()
-    base_url = get_request_base_url(request)
     enabled = []
     for channel in channels:
         if not channel.get("enabled"):
@@ -145,13 +138,40 @@ async def _get_enabled_channels() -> List[Dict[str, Any]]:
     return enabled
 
 
+async def _get_live_catalogue() -> Dict[str, Any]:
+    """Enabled channels and their derived category map for the request's base URL (logo URLs depend on it)."""
+    base_url = get_request_base_url(request)
+
+    async def build():
+        channels = await _get_enabled_channels(base_url)
+        categories, name_to_id = _build_category_map(channels)
+        return {
+            "channels": channels,
+            "channel_map": {str(ch["id"]): ch for ch in channels},
+            "categories": categories,
+            "name_to_id": name_to_id,
+        }
+
+    return await xc_catalogue_cache.get_or_build(XC_CATALOGUE_LIVE, ("channels", base_url), build)
+
+
 async def _get_channel_map() -> Dict[str, Dict[str, Any]]:
-    cached = xc_cache.get("xc_channel_map")
-    if cached:
-        return cached
-    channel_map = {str(ch["id"]): ch for ch in await _get_enabled_channels()}
-    xc_cache.set("xc_channel_map", channel_map, ttl_seconds=30)
-    return channel_map
+    return (await _get_live_catalogue())["channel_map"]
+
+
+async def _xc_json_snapshot_response(scope: str, key: tuple, builder) -> Response:
+    snapshot = await xc_catalogue_cache.get_json_snapshot(scope, key, builder)
+    headers = {
+        "ETag": snapshot.etag,
+        "Cache-Control": "no-cache",
+    }
+    if etag_matches(request.headers.get("If-None-Match"), snapshot.etag):
+        response = Response("", status=304)
+        response.headers.update(headers)
+        return response
+    response = Response(snapshot.body, mimetype="application/json")
+    response.headers.update(headers)
+    return response
 
 
 def _xc_timeshift_enabled(user) -> bool:
@@ -342,10 +362,10 @@ async def _get_channel_epg_rows(
             EpgChannelProgrammes.epg_channel_id == int(epg_channel_row["epg_channel_row_id"])
         )
         if include_archive and min_start_ts is not None:
-            programme_query = programme_query.where(EpgChannelProgrammes.stop_timestamp >= str(min_start_ts))
+            programme_query = programme_query.where(EpgChannelProgrammes.stop_ts >= min_start_ts)
         else:
-            programme_query = programme_query.where(EpgChannelProgrammes.stop_timestamp >= str(now_ts))
-        programme_query = programme_query.order_by(EpgChannelProgrammes.start_timestamp.asc())
+            programme_query = programme_query.where(EpgChannelProgrammes.stop_ts >= now_ts)
+        programme_query = programme_query.order_by(EpgChannelProgrammes.start_ts.asc())
         if limit is not None and limit > 0:
             programme_query = programme_query.limit(limit)
 
@@ -366,8 +386,8 @@ def _build_xc_epg_payload(
 
     listings = []
     for programme in programme_rows:
-        start_ts = convert_to_int(programme.start_timestamp, None)
-        stop_ts = convert_to_int(programme.stop_timestamp, None)
+        start_ts = convert_to_int(programme.start_ts, None)
+        stop_ts = convert_to_int(programme.stop_ts, None)
         if start_ts is None or stop_ts is None:
             continue
 
@@ -421,22 +441,22 @@ def _build_category_map(channels: List[Dict[str, Any]]) -> Tuple[List[Dict[str,
 
 
 async def _get_max_connections() -> str:
-    cached = xc_cache.get("xc_max_connections")
-    if cached:
-        return cached
-    playlists = await read_config_all_playlists(current_app.config["APP_CONFIG"])
-    max_connections = 1
-    for playlist in playlists:
-        try:
-            max_connections = max(max_connections, int(playlist.get("connections", 1)))
-        except (TypeError, ValueError):
-            continue
-    value = str(max_connections)
-    xc_cache.set("xc_max_connections", value, ttl_seconds=60)
-    return value
+    config = current_app.config["APP_CONFIG"]
 
+    async def build():
+        playlists = await read_config_all_playlists(config)
+        max_connections = 1
+        for playlist in playlists:
+            try:
+                max_connections = max(max_connections, int(playlist.get("connections", 1)))
+            except (TypeError, ValueError):
+                continue
+        return str(max_connections)
 
-def _build_xc_server_info(user, include_categories=False):
+    return await xc_catalogue_cache.get_or_build(XC_CATALOGUE_LIVE, ("max_connections",), build)
+
+
+def _build_xc_server_info(user, max_connections: str, live_categories=None):
     hostname, port, scheme = get_request_host_info(request)
     info = {
         "user_info": {
@@ -446,7 +466,7 @@ def _build_xc_server_info(user, include_categories=False):
             "auth": 1,
             "status": "Active",
             "exp_date": str(int(time.time()) + (90 * 24 * 60 * 60)),
-            "max_connections": xc_cache.get("xc_max_connections") or "1",
+            "max_connections": max_connections or "1",
             "allowed_output_formats": ["ts"],
         },
         "server_info": {
@@ -459,8 +479,8 @@ def _build_xc_server_info(user, include_categories=False):
             "process": True,
         },
     }
-    if include_categories:
-        info["categories"] = {"live": xc_cache.get("xc_categories") or []}
+    if live_categories is not None:
+        info["categories"] = {"live": live_categories}
     return info
 
 
@@ -600,15 +620,6 @@ async def xc_get():
         return error
     await audit_stream_event(user, "xc_get", request.path)
 
-    cache_key = f"xc_m3u:{user.id}:ts_only"
-    cached = xc_cache.get(cache_key)
-    if cached:
-        return Response(cached, mimetype="text/plain")
-
-    channels = await _get_enabled_channels()
-    categories, _ = _build_category_map(channels)
-    xc_cache.set("xc_categories", categories, ttl_seconds=60)
-
     base_url = get_request_base_url(request)
     epg_url = f"{base_url}/xmltv.php?username={user.username}&password={user.streaming_key}"
 
@@ -624,13 +635,18 @@ async def xc_get():
         )
         return stream_url
 
-    content = await build_m3u_playlist_content(
-        channels=channels,
-        epg_url=epg_url,
-        stream_url_resolver=_resolve_stream_url,
-        include_xtvg=True,
+    async def build():
+        return await build_m3u_playlist_content(
+            channels=(await _get_live_catalogue())["channels"],
+            epg_url=epg_url,
+            stream_url_resolver=_resolve_stream_url,
+            include_xtvg=True,
+        )
+
+    # Stream URLs embed the user's credentials, so the playlist is snapshotted per user.
+    content = await xc_catalogue_cache.get_or_build(
+        XC_CATALOGUE_LIVE, ("m3u", int(user.id), user.username, user.streaming_key, base_url), build
     )
-    xc_cache.set(cache_key, content, ttl_seconds=30)
     return Response(content, mimetype="text/plain")
 
 
@@ -643,6 +659,36 @@ async def xc_xmltv():
     return await build_xmltv_response(sanitise_unicode=True)
 
 
+async def _build_xc_live_categories() -> List[Dict[str, Any]]:
+    return (await _get_live_catalogue())["categories"]
+
+
+async def _build_xc_live_streams(timeshift_enabled: bool) -> List[Dict[str, Any]]:
+    catalogue = await _get_live_catalogue()
+    channels = catalogue["channels"]
+    name_to_id = catalogue["name_to_id"]
+    archive_sources = await _resolve_xc_archive_sources(channels) if timeshift_enabled else {}
+    stream_list = []
+    for channel in channels:
+        group_title = (channel.get("tags") or ["Uncategorized"])[0]
+        category_id = name_to_id.get(group_title, "1")
+        archive_source = archive_sources.get(str(channel.get("id")))
+        stream_list.append(
+            {
+                "num": channel.get("number") or 0,
+                "name": channel.get("name") or "",
+                "stream_id": str(channel["id"]),
+                "stream_type": "live",
+                "stream_icon": channel.get("logo_url") or "",
+                "category_id": category_id,
+                "epg_channel_id": str((channel.get("guide") or {}).get("channel_id") or "") or None,
+                "tv_archive": 1 if archive_source else 0,
+                "tv_archive_duration": int(archive_source.get("tv_archive_duration") or 0) if archive_source else 0,
+            }
+        )
+    return stream_list
+
+
 @blueprint.route("/player_api.php", methods=["GET"])
 async def xc_player_api():
     user, error = await _xc_auth_user()
@@ -651,43 +697,18 @@ async def xc_player_api():
     await audit_stream_event(user, "xc_player_api", request.path)
 
     action = request.args.get("action")
-    channels = await _get_enabled_channels()
-    categories = xc_cache.get("xc_categories")
-    name_to_id = xc_cache.get("xc_category_map")
-    if not categories or not name_to_id:
-        categories, name_to_id = _build_category_map(channels)
-        xc_cache.set("xc_categories", categories, ttl_seconds=60)
-        xc_cache.set("xc_category_map", name_to_id, ttl_seconds=60)
-    xc_cache.set("xc_max_connections", await _get_max_connections(), ttl_seconds=60)
 
+    # Catalogue actions are served from versioned, pre-serialised snapshots keyed by everything the
+    # payload depends on: base URL (logo URLs), the user's timeshift access, and the requested category.
     if action == "get_live_categories":
-        return jsonify(categories)
+        return await _xc_json_snapshot_response(XC_CATALOGUE_LIVE, (action,), _build_xc_live_categories)
     if action == "get_live_streams":
-        cache_key = f"xc_live_streams:{int(_xc_timeshift_enabled(user))}"
-        cached_streams = xc_cache.get(cache_key)
-        if cached_streams:
-            return jsonify(cached_streams)
-        archive_sources = await _resolve_xc_archive_sources(channels) if _xc_timeshift_enabled(user) else {}
-        stream_list = []
-        for channel in channels:
-            group_title = (channel.get("tags") or ["Uncategorized"])[0]
-            category_id = name_to_id.get(group_title, "1")
-            archive_source = archive_sources.get(str(channel.get("id")))
-            stream_list.append(
-                {
-                    "num": channel.get("number") or 0,
-                    "name": channel.get("name") or "",
-                    "stream_id": str(channel["id"]),
-                    "stream_type": "live",
-                    "stream_icon": channel.get("logo_url") or "",
-                    "category_id": category_id,
-                    "epg_channel_id": str((channel.get("guide") or {}).get("channel_id") or "") or None,
-                    "tv_archive": 1 if archive_source else 0,
-                    "tv_archive_duration": int(archive_source.get("tv_archive_duration") or 0) if archive_source else 0,
-                }
-            )
-        xc_cache.set(cache_key, stream_list, ttl_seconds=30)
-        return jsonify(stream_list)
+        timeshift_enabled = _xc_timeshift_enabled(user)
+        return await _xc_json_snapshot_response(
+            XC_CATALOGUE_LIVE,
+            (action, get_request_base_url(request), timeshift_enabled),
+            lambda: _build_xc_live_streams(timeshift_enabled),
+        )
     if action in ("get_short_epg", "get_simple_data_table"):
         stream_id = str(request.args.get("stream_id") or request.args.get("channel_id") or "").strip()
         if not stream_id:
@@ -720,11 +741,18 @@ async def xc_player_api():
     if action == "get_vod_categories":
         if not _xc_vod_allowed(user, VOD_KIND_MOVIE):
             return jsonify([])
-        return jsonify(await build_curated_category_payloads(VOD_KIND_MOVIE))
+        return await _xc_json_snapshot_response(
+            XC_CATALOGUE_VOD, (action,), lambda: build_curated_category_payloads(VOD_KIND_MOVIE)
+        )
     if action == "get_vod_streams":
         if not _xc_vod_allowed(user, VOD_KIND_MOVIE):
             return jsonify([])
-        return jsonify(await build_curated_item_payloads(VOD_KIND_MOVIE, category_id=request.args.get("category_id")))
+        category_id = str(request.args.get("category_id") or "").strip()
+        return await _xc_json_snapshot_response(
+            XC_CATALOGUE_VOD,
+            (action, category_id),
+            lambda: build_curated_item_payloads(VOD_KIND_MOVIE, category_id=category_id),
+        )
     if action == "get_vod_info":
         if not _xc_vod_allowed(user, VOD_KIND_MOVIE):
             return jsonify({})
@@ -736,11 +764,18 @@ async def xc_player_api():
     if action == "get_series_categories":
         if not _xc_vod_allowed(user, VOD_KIND_SERIES):
             return jsonify([])
-        return jsonify(await build_curated_category_payloads(VOD_KIND_SERIES))
+        return await _xc_json_snapshot_response(
+            XC_CATALOGUE_VOD, (action,), lambda: build_curated_category_payloads(VOD_KIND_SERIES)
+        )
     if action == "get_series":
         if not _xc_vod_allowed(user, VOD_KIND_SERIES):
             return jsonify([])
-        return jsonify(await build_curated_item_payloads(VOD_KIND_SERIES, category_id=request.args.get("category_id")))
+        category_id = str(request.args.get("category_id") or "").strip()
+        return await _xc_json_snapshot_response(
+            XC_CATALOGUE_VOD,
+            (action, category_id),
+            lambda: build_curated_item_payloads(VOD_KIND_SERIES, category_id=category_id),
+        )
     if action == "get_series_info":
         if not _xc_vod_allowed(user, VOD_KIND_SERIES):
             return jsonify({})
@@ -750,7 +785,7 @@ async def xc_player_api():
         payload = await fetch_series_info_payload(int(series_id))
         return jsonify(payload or {})
 
-    info = _build_xc_server_info(user)
+    info = _build_xc_server_info(user, await _get_max_connections())
     return jsonify(info)
 
 
@@ -761,8 +796,11 @@ async def xc_panel_api():
         return error
     await audit_stream_event(user, "xc_panel_api", request.path)
 
-    xc_cache.set("xc_max_connections", await _get_max_connections(), ttl_seconds=60)
-    info = _build_xc_server_info(user, include_categories=True)
+    info = _build_xc_server_info(
+        user,
+        await _get_max_connections(),
+        live_categories=(await _get_live_catalogue())["categories"],
+    )
     return jsonify(info)
 
 
@@ -19,9 +19,10 @@ from backend.api.routes_channels import (
     _fetch_channel_suggestion_counts,
     _fetch_cso_attention_map,
 )
+from backend.api.routes_hls_proxy import hls_segment_cache
 from backend.audit_view import build_device_label, serialize_audit_row
 from backend.auth import admin_auth_required
-from backend.cso import disconnect_active_stream_connection
+from backend.cso import disconnect_active_stream_connection, vod_cache_manager
 from backend.channels import (
     build_stream_source_index,
     read_config_all_channels,
@@ -380,5 +381,7 @@ async def api_dashboard_summary():
         "recent_audit": await _recent_audit(limit=10),
         "storage": storage_items,
         "channels": await _channel_issue_summary_cached(),
+        "hls_segment_cache": hls_segment_cache.stats(),
+        "vod_cache": vod_cache_manager.stats(),
     }
     return jsonify({"success": True, "data": summary})
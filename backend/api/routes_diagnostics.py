@@ -4,6 +4,12 @@ from quart import jsonify, request, current_app
 from backend.api import blueprint
 from backend.stream_diagnostics import start_probe, get_probe_status, delete_probe
 from backend.auth import admin_auth_required, get_request_user
+from backend.hls_multiplexer import (
+    playlist_fetches,
+    segment_fetches,
+    upstream_http_client,
+    upstream_stream_http_client,
+)
 from backend.http_headers import parse_headers_json, sanitise_headers
 from backend.models import ChannelSource, Session
 from backend.streaming import append_stream_key, is_tic_stream_url
@@ -98,3 +104,19 @@ async def get_test_status(task_id):
 async def delete_test(task_id):
     delete_probe(task_id)
     return jsonify({"success": True})
+
+
+@blueprint.route("/tic-api/diagnostics/hls-proxy/pool", methods=["GET"])
+@admin_auth_required
+async def get_hls_proxy_pool_stats():
+    return jsonify(
+        {
+            "success": True,
+            "data": {
+                "upstream_pool": upstream_http_client.pool_stats(),
+                "upstream_stream_pool": upstream_stream_http_client.pool_stats(),
+                "segment_fetches": segment_fetches.stats(),
+                "playlist_fetches": playlist_fetches.stats(),
+            },
+        }
+    )
@@ -94,7 +94,8 @@ async def api_update_epg(epg_id):
         {
             "name": f"Update EPG - Name: {epg_name or epg_id}",
             "function": import_epg_data,
-            "args": [config, epg_id],
+            # force=True: a manual update re-imports even if the source content is unchanged.
+            "args": [config, epg_id, True],
         },
         priority=20,
     )
@@ -5,7 +5,7 @@ from datetime import datetime, timezone
 from typing import Any
 
 from quart import current_app, request, jsonify
-from sqlalchemy import select, and_, cast, Integer
+from sqlalchemy import select, and_
 
 from backend.api import blueprint
 from backend.auth import streamer_or_admin_required
@@ -134,8 +134,8 @@ async def api_guide_grid():
                 select(EpgChannelProgrammes).where(
                     and_(
                         EpgChannelProgrammes.epg_channel_id.in_(epg_channel_ids),
-                        cast(EpgChannelProgrammes.start_timestamp, Integer) <= query_end_ts,
-                        cast(EpgChannelProgrammes.stop_timestamp, Integer) >= query_start_ts,
+                        EpgChannelProgrammes.start_ts <= query_end_ts,
+                        EpgChannelProgrammes.stop_ts >= query_start_ts,
                     )
                 )
             )
@@ -149,8 +149,8 @@ async def api_guide_grid():
                         "sub_title": programme.sub_title,
                         "desc": programme.desc,
                         "icon_url": programme.icon_url,
-                        "start_ts": int(programme.start_timestamp or 0),
-                        "stop_ts": int(programme.stop_timestamp or 0),
+                        "start_ts": int(programme.start_ts or 0),
+                        "stop_ts": int(programme.stop_ts or 0),
                     }
                 )
 
@@ -190,7 +190,7 @@ def _get_connection_id(default_new=False):
 async def _direct_passthrough_response(decoded_url):
     headers = _build_upstream_headers(configured_headers=_configured_upstream_headers_from_query())
     try:
-        session, upstream_response = await open_segment_passthrough(
+        upstream_response = await open_segment_passthrough(
             decoded_url,
             headers,
             method=request.method,
@@ -209,14 +209,12 @@ async def _direct_passthrough_response(decoded_url):
             getattr(upstream_response, "url", decoded_url),
         )
         upstream_response.release()
-        await session.close()
         return Response("Failed to fetch.", status=status)
 
     if request.method == "HEAD":
         response = Response(status=upstream_response.status)
         _apply_passthrough_headers(response, upstream_response.headers)
         upstream_response.release()
-        await session.close()
         return response
 
     @stream_with_context
@@ -226,7 +224,6 @@ async def _direct_passthrough_response(decoded_url):
                 yield chunk
         finally:
             upstream_response.release()
-            await session.close()
 
     response = Response(generate_direct(), status=upstream_response.status)
     _apply_passthrough_headers(response, upstream_response.headers)
@@ -193,7 +193,8 @@ async def api_update_playlist(playlist_id):
         {
             "name": f"Update source - Name: {playlist_name or playlist_id}",
             "function": import_playlist_data,
-            "args": [config, playlist_id],
+            # force=True: a manual update re-imports even if the source content is unchanged.
+            "args": [config, playlist_id, True],
         },
         priority=20,
     )
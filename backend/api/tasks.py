@@ -168,6 +168,11 @@ class TaskQueueBroker:
             snapshot = sorted(list(self.__task_queue._queue), key=lambda item: (item[0], item[1]))
         return [task_data["name"] for _, _, task_data in snapshot]
 
+    async def get_source_refresh_progress(self):
+        from backend.source_refresh import get_source_refresh_progress
+
+        return get_source_refresh_progress()
+
 
 async def configure_tvh_with_defaults(app):
     logger.info("Configuring TVH")
@@ -184,7 +189,7 @@ async def update_playlists(app):
 
     updated_playlist_ids = await import_playlist_data_for_all_playlists(config)
     if not updated_playlist_ids:
-        logger.info("Skipping channel auto-refresh because no playlists were due")
+        logger.info("Skipping channel auto-refresh because no playlists were due or changed")
         return
 
     from backend.channels import refresh_auto_update_sources_for_playlists, queue_background_channel_update_tasks
@@ -223,7 +228,7 @@ async def update_epgs(app):
         logger.info("Rebuilding custom EPG after %s source update(s)", updated_count)
         await build_custom_epg_subprocess(config)
     else:
-        logger.info("Skipping custom EPG rebuild because no EPG sources were due")
+        logger.info("Skipping custom EPG rebuild because no EPG sources were due or changed")
 
 
 async def run_periodic_channel_stream_health_checks(app):
@@ -4,7 +4,9 @@ import asyncio
 import base64
 import hashlib
 import ipaddress
+import logging
 import time
+from collections import OrderedDict, deque
 from dataclasses import dataclass
 from datetime import timedelta
 from functools import lru_cache, wraps
@@ -22,7 +24,7 @@ from quart import (
     request,
     websocket,
 )
-from sqlalchemy import delete, or_, select, update
+from sqlalchemy import delete, insert, or_, select, update
 from sqlalchemy.orm import selectinload
 
 from backend import config
@@ -31,6 +33,8 @@ from backend.utils import utc_now_naive
 from backend.models import Session, StreamAuditLog, User, UserSession
 from backend.security import hash_session_token
 
+logger = logging.getLogger("tic.auth")
+
 
 class TvhStreamUser:
     def __init__(self, username, stream_key):
@@ -51,29 +55,70 @@ def is_tvh_backend_stream_user(user) -> bool:
     return username.startswith("tic-tvh-") and not user_id
 
 
-class _StreamKeyCache:
-    def __init__(self, ttl_seconds=30):
-        self.ttl_seconds = ttl_seconds
-        self._cache = {}
-        self._lock = asyncio.Lock()
-
-    async def get(self, stream_key):
-        async with self._lock:
-            entry = self._cache.get(stream_key)
-            if not entry:
-                return None, False
-            user, expires_at = entry
-            if expires_at < time.time():
-                self._cache.pop(stream_key, None)
-                return None, False
-            return user, True
-
-    async def set(self, stream_key, user):
-        async with self._lock:
-            self._cache[stream_key] = (user, time.time() + self.ttl_seconds)
+class _CredentialCache:
+    """
+    Bounded LRU cache of stream credential lookups keyed on (username, sha256(secret)); stream-key-only
+    lookups use an empty username. Failed lookups are cached briefly so repeated bad credentials do not
+    each cost a query. Reads and writes never await, so no lock is needed on the event loop.
+    """
 
-
-_stream_key_cache = _StreamKeyCache(ttl_seconds=30)
+    def __init__(self, max_entries=4096, ttl_seconds=30, negative_ttl_seconds=5):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self._entries: OrderedDict[tuple[str, str], tuple[User | None, float]] = OrderedDict()
+        self._keys_by_user_id: dict[int, set[tuple[str, str]]] = {}
+
+    @staticmethod
+    def key(username: str | None, secret: str) -> tuple[str, str]:
+        return str(username or ""), hashlib.sha256(str(secret).encode("utf-8")).hexdigest()
+
+    def get(self, key: tuple[str, str]) -> tuple[User | None, bool]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None, False
+        user, expires_at = entry
+        if expires_at < time.time():
+            self._discard(key)
+            return None, False
+        self._entries.move_to_end(key)
+        return user, True
+
+    def set(self, key: tuple[str, str], user: User | None):
+        self._discard(key)
+        ttl_seconds = self.ttl_seconds if user is not None else self.negative_ttl_seconds
+        self._entries[key] = (user, time.time() + ttl_seconds)
+        if user is not None and getattr(user, "id", None) is not None:
+            self._keys_by_user_id.setdefault(int(user.id), set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._discard(next(iter(self._entries)))
+
+    def _discard(self, key: tuple[str, str]):
+        entry = self._entries.pop(key, None)
+        if entry is None or entry[0] is None:
+            return
+        user_id = getattr(entry[0], "id", None)
+        keys = self._keys_by_user_id.get(int(user_id)) if user_id is not None else None
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                self._keys_by_user_id.pop(int(user_id), None)
+
+    def invalidate_user(self, user_id: int):
+        for key in list(self._keys_by_user_id.pop(int(user_id), ())):
+            self._entries.pop(key, None)
+        # A rotated key or re-enabled account must not keep failing on a cached miss.
+        for key in [key for key, (user, _expires_at) in self._entries.items() if user is None]:
+            self._entries.pop(key, None)
+
+
+_credential_cache = _CredentialCache()
+
+
+def invalidate_user_credentials(user_id: int | None):
+    """Forget cached credential lookups for a user after their account or stream key changes."""
+    if user_id is not None:
+        _credential_cache.invalidate_user(user_id)
 
 
 @dataclass
@@ -593,16 +638,31 @@ async def _lookup_stream_auth_user(stream_key: str):
             pass
 
     # Finally do a lookup for a user stream key (cached for a short TTL)
-    cached_user, has_cache = await _stream_key_cache.get(stream_key)
+    cache_key = _credential_cache.key(None, stream_key)
+    cached_user, has_cache = _credential_cache.get(cache_key)
     if has_cache:
-        if cached_user is None:
-            return None
         return cached_user
 
     from backend.users import get_user_by_stream_key
 
     user = await get_user_by_stream_key(stream_key)
-    await _stream_key_cache.set(stream_key, user)
+    _credential_cache.set(cache_key, user)
+    return user
+
+
+async def lookup_user_by_xc_credentials(username: str, password: str) -> User | None:
+    """Resolve an XC username/password pair (the password is the user's stream key) through the credential cache."""
+    cache_key = _credential_cache.key(username, password)
+    cached_user, has_cache = _credential_cache.get(cache_key)
+    if has_cache:
+        return cached_user
+
+    from backend.users import get_user_by_username
+
+    user = await get_user_by_username(username)
+    if user is not None and str(user.streaming_key) != password:
+        user = None
+    _credential_cache.set(cache_key, user)
     return user
 
 
@@ -746,30 +806,131 @@ async def audit_stream_event(
 ):
     if is_tvh_backend_stream_user(user):
         return
-    async with Session() as session:
-        async with session.begin():
-            if has_request_context():
-                ip_value = ip_address or get_request_client_ip()
-                user_agent_value = user_agent
-                if user_agent_value is None:
-                    try:
-                        user_agent_value = request.headers.get("User-Agent")
-                    except Exception:
-                        user_agent_value = None
-            else:
-                ip_value = ip_address
-                user_agent_value = user_agent
-            log = StreamAuditLog(
-                user_id=user.id if user else None,
-                event_type=event_type,
-                severity=str(severity or "info").strip().lower() or "info",
-                endpoint=endpoint,
-                ip_address=ip_value,
-                user_agent=user_agent_value,
-                details=details,
-                created_at=utc_now_naive(),
+    if has_request_context():
+        ip_value = ip_address or get_request_client_ip()
+        user_agent_value = user_agent
+        if user_agent_value is None:
+            try:
+                user_agent_value = request.headers.get("User-Agent")
+            except Exception:
+                user_agent_value = None
+    else:
+        ip_value = ip_address
+        user_agent_value = user_agent
+    stream_audit_writer.enqueue(
+        {
+            "user_id": user.id if user else None,
+            "event_type": event_type,
+            "severity": str(severity or "info").strip().lower() or "info",
+            "endpoint": endpoint,
+            "ip_address": ip_value,
+            "user_agent": user_agent_value,
+            "details": details,
+            "created_at": utc_now_naive(),
+        }
+    )
+
+
+class _StreamAuditWriter:
+    """
+    Buffers stream audit rows and inserts them in batches from a single background task, so request
+    handlers never wait on an audit write. Rows are inserted in the order they were queued. When the
+    buffer is full the new event is dropped and counted instead of applying backpressure to the caller.
+    """
+
+    def __init__(self, max_queue: int, batch_size: int, flush_interval_seconds: float):
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self._rows: deque[dict[str, Any]] = deque()
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._closing = False
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.high_water = 0
+        self._dropped_unreported = 0
+
+    def enqueue(self, row: dict[str, Any]) -> bool:
+        if len(self._rows) >= self.max_queue:
+            self.dropped += 1
+            self._dropped_unreported += 1
+            return False
+        self._rows.append(row)
+        self.high_water = max(self.high_water, len(self._rows))
+        self._ensure_task()
+        if len(self._rows) >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+        return True
+
+    def _ensure_task(self):
+        if self._closing:
+            return
+        loop = asyncio.get_running_loop()
+        if self._task is not None and not self._task.done() and self._task.get_loop() is loop:
+            return
+        self._wakeup = asyncio.Event()
+        self._task = loop.create_task(self._run())
+
+    async def _run(self):
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self):
+        while self._rows:
+            batch = [self._rows.popleft() for _ in range(min(self.batch_size, len(self._rows)))]
+            try:
+                async with Session() as session:
+                    async with session.begin():
+                        await session.execute(insert(StreamAuditLog), batch)
+            except Exception:
+                # Drop the failed batch but keep the rest queued for the next tick rather than hammering the DB.
+                self.failed += len(batch)
+                logger.exception("Failed to write %s stream audit events", len(batch))
+                break
+            self.written += len(batch)
+        if self._dropped_unreported:
+            logger.warning(
+                "Dropped %s stream audit events because the write buffer was full (limit=%s, dropped_total=%s)",
+                self._dropped_unreported,
+                self.max_queue,
+                self.dropped,
             )
-            session.add(log)
+            self._dropped_unreported = 0
+
+    async def close(self):
+        """Stop the background writer and write everything still buffered."""
+        self._closing = True
+        task = self._task
+        if task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop():
+            self._wakeup.set()
+            await task
+        await self.flush()
+        logger.info(
+            "Stream audit writer stopped (written=%s dropped=%s failed=%s high_water=%s)",
+            self.written,
+            self.dropped,
+            self.failed,
+            self.high_water,
+        )
+
+
+stream_audit_writer = _StreamAuditWriter(
+    max_queue=config.audit_log_queue_size,
+    batch_size=config.audit_log_batch_size,
+    flush_interval_seconds=config.audit_log_flush_interval_ms / 1000.0,
+)
+
+
+async def flush_stream_audit_events():
+    """Write all buffered stream audit events and stop the background writer. Called on shutdown."""
+    await stream_audit_writer.close()
 
 
 async def cleanup_stream_audit_logs(retention_days: int | None = None) -> int:
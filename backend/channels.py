@@ -10,6 +10,7 @@ import os
 import re
 import time
 from collections import OrderedDict
+from dataclasses import dataclass
 from mimetypes import guess_type
 from typing import Any
 from urllib.parse import urlparse, urlunparse, urlencode
@@ -17,7 +18,7 @@ from urllib.parse import urlparse, urlunparse, urlencode
 import aiofiles
 import aiohttp
 import requests
-from sqlalchemy import BigInteger, and_, cast, delete, func, or_, select, update
+from sqlalchemy import and_, delete, func, or_, select, update
 from sqlalchemy.orm import joinedload, selectinload
 
 from backend import config as app_config
@@ -30,6 +31,7 @@ from backend.dummy_epg import (
     sanitise_dummy_epg_interval,
 )
 from backend.epgs import (
+    _logo_cache_token,
     build_channel_logo_output_url,
     cache_channel_logos_enabled,
     load_preferred_epg_channel_rows,
@@ -61,6 +63,7 @@ from backend.playlists import (
     _build_xc_live_stream_url,
     _get_enabled_xc_accounts_async,
 )
+from backend.xc.cache import XC_CATALOGUE_LIVE, invalidate_xc_catalogue
 from backend.xc_hosts import first_xc_host
 from backend.stream_profiles import profile_from_cso_policy
 from backend.streaming import (
@@ -304,9 +307,17 @@ class LRUCache:
         if len(self.store) > self.max_size:
             self.store.popitem(last=False)
 
+    def pop(self, key):
+        self.store.pop(key, None)
+
 
 _list_cache = LRUCache(max_size=8)
 
+# Decoded channel logos keyed by channel id. Entries do not expire; they are dropped whenever the
+# channel's cached logo changes (see invalidate_channel_logo_cache).
+_channel_logo_cache = LRUCache(max_size=1024)
+CHANNEL_LOGO_IMMUTABLE_MAX_AGE_SECONDS = 365 * 24 * 3600
+
 
 def _channel_sync_state_path(config):
     return os.path.join(config.config_path, "cache", "channel_sync_state.json")
@@ -894,8 +905,8 @@ async def build_bulk_epg_match_preview(
 
 async def read_epg_match_candidate_preview(*, epg_channel_row_id, now_ts=None):
     now_ts = convert_to_int(now_ts, int(time.time()))
-    start_ts_expr = cast(func.nullif(EpgChannelProgrammes.start_timestamp, ""), BigInteger)
-    stop_ts_expr = cast(func.nullif(EpgChannelProgrammes.stop_timestamp, ""), BigInteger)
+    start_ts_expr = EpgChannelProgrammes.start_ts
+    stop_ts_expr = EpgChannelProgrammes.stop_ts
 
     async with Session() as session:
         channel_result = await session.execute(
@@ -1017,6 +1028,7 @@ async def apply_bulk_epg_matches(*, updates):
     channel_ids = sorted({row["channel_id"] for row in normalized_updates})
     epg_keys = sorted({(row["epg_id"], row["epg_channel_id"]) for row in normalized_updates if row["epg_channel_id"]})
 
+    logo_reset_ids = []
     async with Session() as session:
         results = []
         updated = 0
@@ -1076,6 +1088,7 @@ async def apply_bulk_epg_matches(*, updates):
                     if should_update_logo and not logo_unchanged:
                         channel.logo_url = mapping.get("icon_url")
                         channel.logo_base64 = None
+                        logo_reset_ids.append(int(channel.id))
                         updated += 1
                         results.append(
                             {
@@ -1101,6 +1114,7 @@ async def apply_bulk_epg_matches(*, updates):
                 if should_update_logo:
                     channel.logo_url = mapping.get("icon_url")
                     channel.logo_base64 = None
+                    logo_reset_ids.append(int(channel.id))
                 updated += 1
                 results.append(
                     {
@@ -1109,6 +1123,8 @@ async def apply_bulk_epg_matches(*, updates):
                     }
                 )
 
+    if logo_reset_ids:
+        invalidate_channel_logo_cache(*logo_reset_ids)
     return {
         "results": results,
         "summary": {"updated": updated, "skipped": skipped, "failed": failed},
@@ -1405,20 +1421,145 @@ async def read_base46_image_string(base64_string):
     return image_data, mime_type
 
 
-async def read_channel_logo(channel_id):
+@dataclass(frozen=True)
+class ChannelLogo:
+    data: bytes
+    mime_type: str
+    etag: str
+    # Logo bytes were fetched from the source URL that the request's cache token names, so the
+    # versioned logo URL can be cached by clients indefinitely.
+    immutable: bool
+
+
+def _channel_logo_cache_dir():
+    return os.path.join(app_config.config_path, "cache", "channel_logos")
+
+
+def _channel_logo_index_path(channel_id):
+    return os.path.join(_channel_logo_cache_dir(), "index", f"{int(channel_id)}.json")
+
+
+def _channel_logo_file_path(digest):
+    return os.path.join(_channel_logo_cache_dir(), digest)
+
+
+def _build_channel_logo(data, mime_type, immutable):
+    digest = hashlib.sha256(data).hexdigest()
+    return ChannelLogo(data=data, mime_type=mime_type, etag=f'"{digest}"', immutable=immutable), digest
+
+
+def _read_materialised_channel_logo(channel_id, source_token):
+    index = _read_json_file(_channel_logo_index_path(channel_id), {})
+    if not isinstance(index, dict) or index.get("source_token") != source_token:
+        return None
+    digest = str(index.get("digest") or "")
+    try:
+        with open(_channel_logo_file_path(digest), "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    logo, data_digest = _build_channel_logo(data, index.get("mime_type") or "image/png", True)
+    return logo if data_digest == digest else None
+
+
+def _materialise_channel_logo(channel_id, source_token, logo, digest):
+    file_path = _channel_logo_file_path(digest)
+    if not os.path.exists(file_path):
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        tmp_path = f"{file_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(logo.data)
+        os.replace(tmp_path, file_path)
+    index_path = _channel_logo_index_path(channel_id)
+    tmp_path = f"{index_path}.tmp"
+    _write_json_file(tmp_path, {"source_token": source_token, "digest": digest, "mime_type": logo.mime_type})
+    os.replace(tmp_path, index_path)
+
+
+def _remove_channel_logo_indexes(channel_ids):
+    for channel_id in channel_ids:
+        try:
+            os.remove(_channel_logo_index_path(channel_id))
+        except FileNotFoundError:
+            pass
+
+
+def _prune_channel_logo_files():
+    """Delete content-addressed logo files that no channel index references any more."""
+    cache_dir = _channel_logo_cache_dir()
+    index_dir = os.path.join(cache_dir, "index")
+    if not os.path.isdir(cache_dir):
+        return 0
+    referenced = set()
+    if os.path.isdir(index_dir):
+        for name in os.listdir(index_dir):
+            index = _read_json_file(os.path.join(index_dir, name), {})
+            if isinstance(index, dict) and index.get("digest"):
+                referenced.add(str(index["digest"]))
+    removed = 0
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        if name in referenced or not os.path.isfile(path):
+            continue
+        os.remove(path)
+        removed += 1
+    return removed
+
+
+def invalidate_channel_logo_cache(*channel_ids):
+    """Forget decoded/materialised logos for channels whose cached logo data has changed."""
+    for channel_id in channel_ids:
+        _channel_logo_cache.pop(int(channel_id))
+    _remove_channel_logo_indexes(channel_ids)
+
+
+async def read_channel_logo(channel_id, source_token=None):
+    """
+    Return the channel's cached logo as a ChannelLogo, or None when the channel does not exist.
+    ``source_token`` is the version token from the logo URL (see ``build_channel_logo_proxy_url``).
+    Real logos are materialised once to content-addressed files and kept in an in-memory LRU, so
+    repeat requests neither load the row nor decode base64.
+    """
+    channel_id = int(channel_id)
+    cached = _channel_logo_cache.get(channel_id)
+    if cached is not None and cached[0] == source_token:
+        return cached[1]
+    if source_token:
+        logo = await asyncio.to_thread(_read_materialised_channel_logo, channel_id, source_token)
+        if logo is not None:
+            _channel_logo_cache.set(channel_id, (source_token, logo), ttl=None)
+            return logo
+
     async with Session() as session:
-        query = await session.execute(select(Channel).where(Channel.id == channel_id))
-        channel = query.scalar_one()
-    base64_string = channel.logo_base64
+        query = await session.execute(select(Channel.logo_url, Channel.logo_base64).where(Channel.id == channel_id))
+        row = query.first()
+    if row is None:
+        return None
+    current_token = _logo_cache_token(row.logo_url or "")
+    base64_string = row.logo_base64
+    is_placeholder = not base64_string or base64_string.endswith(image_placeholder_base64)
     if not base64_string:
         # Never force clients to fetch internet logos at request time.
         # If cache is missing, return placeholder and let background sync refresh cache.
         base64_string = f"data:image/png;base64,{image_placeholder_base64}"
-    image_base64_string, mime_type = await read_base46_image_string(base64_string)
-    if image_base64_string is None:
-        image_base64_string = base64.b64decode(image_placeholder_base64)
+    image_data, mime_type = await read_base46_image_string(base64_string)
+    if image_data is None:
+        image_data = base64.b64decode(image_placeholder_base64)
         mime_type = "image/png"
-    return image_base64_string, mime_type
+        is_placeholder = True
+
+    # Placeholders are replaced by the next background logo fetch, so they are never marked immutable
+    # or written to disk. A stale token still gets the current logo, just without long-lived caching.
+    logo, digest = _build_channel_logo(image_data, mime_type, not is_placeholder)
+    if not is_placeholder:
+        try:
+            await asyncio.to_thread(_materialise_channel_logo, channel_id, current_token, logo, digest)
+        except OSError as exc:
+            logger.warning("Unable to write logo cache file for channel %s: %s", channel_id, exc)
+    _channel_logo_cache.set(channel_id, (current_token, logo), ttl=None)
+    if source_token != current_token:
+        return ChannelLogo(data=logo.data, mime_type=logo.mime_type, etag=logo.etag, immutable=False)
+    return logo
 
 
 async def add_new_channel(config, data, commit=True):
@@ -1640,6 +1781,11 @@ async def update_channel(config, channel_id, data):
             logo_url = data.get("source_logo_url")
             if logo_url is None:
                 logo_url = data.get("logo_url")
+            if (channel.logo_url or "") != (logo_url or ""):
+                # The cached image belongs to the old URL; drop it so the new versioned logo URL never
+                # serves it. The background publish re-fetches the logo for the new URL.
+                channel.logo_base64 = None
+                invalidate_channel_logo_cache(channel.id)
             channel.logo_url = logo_url
             vod_channel_payload = data.get("vod_channel") if isinstance(data.get("vod_channel"), dict) else {}
             vod_channel_settings = read_vod_channel_settings(vod_channel_payload.get("settings"))
@@ -2244,6 +2390,7 @@ async def delete_channel(channel_id):
             await session.delete(channel)
             await session.commit()
             _set_channel_dummy_epg_settings(channel_id, None)
+            invalidate_channel_logo_cache(channel_id)
             try:
                 vod_channel_schedule_path(app_config, channel_id).unlink(missing_ok=True)
             except Exception:
@@ -2444,6 +2591,7 @@ async def publish_bulk_channels_to_tvh_and_m3u(config, force=False, trigger="unk
     phase_seconds = {}
     api_calls = {}
     logo_refresh_count = 0
+    refreshed_logo_ids = []
     cache_channel_logos = cache_channel_logos_enabled(config)
 
     def _count(name):
@@ -2546,6 +2694,7 @@ async def publish_bulk_channels_to_tvh_and_m3u(config, force=False, trigger="unk
             if cache_channel_logos and ((not result.logo_base64) or (last_logo_url != logo_url)):
                 parsed_base64, parse_status, parse_error = await parse_image_as_base64_with_status(result.logo_url)
                 result.logo_base64 = parsed_base64
+                refreshed_logo_ids.append(int(result.id))
                 logo_source_state[str(result.id)] = logo_url
                 logo_status = {
                     "status": parse_status,
@@ -2597,6 +2746,9 @@ async def publish_bulk_channels_to_tvh_and_m3u(config, force=False, trigger="unk
                             continue
                         channel_row.tvh_uuid = result.tvh_uuid
                         channel_row.logo_base64 = result.logo_base64
+            if refreshed_logo_ids:
+                invalidate_channel_logo_cache(*refreshed_logo_ids)
+                await asyncio.to_thread(_prune_channel_logo_files)
         phase_seconds["db_commit"] = time.perf_counter() - t_commit
 
         # Write playlist file
@@ -3149,6 +3301,8 @@ async def cleanup_old_channels(config):
 
 async def queue_background_channel_update_tasks(config):
     settings = config.read_settings()
+    # Channel lineup changed, so XC live catalogue snapshots must be rebuilt on next request
+    invalidate_xc_catalogue(XC_CATALOGUE_LIVE)
     # Update TVH
     from backend.api.tasks import TaskQueueBroker
 
@@ -552,6 +552,36 @@ sqlalchemy_database_async_uri = (
 )
 sqlalchemy_track_modifications = False
 
+# Number of worker processes used to parse and load XMLTV sources in parallel.
+# Set to 0 to import sources one at a time on an in-process worker thread.
+epg_import_process_workers = max(0, _env_int("TIC_EPG_IMPORT_PROCESS_WORKERS", 2))
+
+# Scheduled playlist/EPG refreshes run concurrently. Each source is bounded by an overall limit, and the
+# download, parse and DB-write stages of every refresh are bounded separately. Downloads are additionally
+# limited per upstream host so sources sharing a provider stay within its connection cap.
+source_refresh_concurrency = max(1, _env_int("TIC_SOURCE_REFRESH_CONCURRENCY", 4))
+source_refresh_download_concurrency = max(1, _env_int("TIC_SOURCE_REFRESH_DOWNLOAD_CONCURRENCY", 4))
+source_refresh_parse_concurrency = max(
+    1, _env_int("TIC_SOURCE_REFRESH_PARSE_CONCURRENCY", max(1, epg_import_process_workers))
+)
+source_refresh_write_concurrency = max(1, _env_int("TIC_SOURCE_REFRESH_WRITE_CONCURRENCY", 2))
+source_refresh_per_host_concurrency = max(1, _env_int("TIC_SOURCE_REFRESH_PER_HOST_CONCURRENCY", 1))
+
+# Stream audit events are buffered in memory and written in batches by a background task. When the
+# buffer is full, new events are dropped (and counted) rather than delaying the request that raised them.
+audit_log_queue_size = max(1, _env_int("TIC_AUDIT_LOG_QUEUE_SIZE", 10000))
+audit_log_batch_size = max(1, _env_int("TIC_AUDIT_LOG_BATCH_SIZE", 200))
+audit_log_flush_interval_ms = max(10, _env_int("TIC_AUDIT_LOG_FLUSH_INTERVAL_MS", 500))
+
+# Byte quota for the CSO VOD cache root, in MiB. When set, the least recently served cached files are
+# evicted to make room for new fills instead of refusing them. 0 disables the quota.
+vod_cache_quota_mb = max(0, _env_int("TIC_VOD_CACHE_QUOTA_MB", 0))
+
+# Channels carrying this tag keep a warm-standby connection to their next-priority source while a CSO
+# ingest is running, so failover promotes an already connected upstream instead of cold-starting one.
+# The standby holds a real provider connection and counts against its connection limit. Empty disables.
+cso_warm_standby_tag = _env_str("TIC_CSO_WARM_STANDBY_TAG", "").strip()
+
 # Configure scheduler
 scheduler_api_enabled = True
 
@@ -19,9 +19,16 @@ class CsoCapacityRegistry:
     def __init__(self):
         self._allocations = {}
         self._external_counts = {}
+        # (key, owner_key, slot_id) -> reclaim callback, for slots reserved by warm standbys
+        self._standby_slots = {}
         self._lock = asyncio.Lock()
 
-    async def try_reserve(self, key, owner_key, limit, slot_id=None):
+    async def try_reserve(self, key, owner_key, limit, slot_id=None, on_reclaim=None):
+        """
+        Reserve a connection slot. Passing ``on_reclaim`` makes it a standby reservation: it counts
+        against the limit like any other, but is given up (and ``on_reclaim()`` called) when a regular
+        reservation for the same key would otherwise be refused.
+        """
         async with self._lock:
             # key -> {owner_key: {slot_id: 1}}
             current = self._allocations.setdefault(key, {})
@@ -34,28 +41,66 @@ class CsoCapacityRegistry:
             total_active = sum(len(slots) for slots in current.values())
             external = int(self._external_counts.get(key) or 0)
             if (total_active + external) >= max(0, int(limit or 0)):
-                return False
+                if on_reclaim is not None or not self._reclaim_standby_slot_unlocked(key):
+                    return False
 
             owner_slots[slot_id] = 1
+            if on_reclaim is not None:
+                self._standby_slots[(key, owner_key, slot_id)] = on_reclaim
             return True
 
+    def _reclaim_standby_slot_unlocked(self, key):
+        for standby_key in list(self._standby_slots):
+            if standby_key[0] != key:
+                continue
+            on_reclaim = self._standby_slots.pop(standby_key)
+            self._drop_slot_unlocked(*standby_key)
+            try:
+                on_reclaim()
+            except Exception as exc:
+                logger.warning("CSO standby capacity reclaim callback failed key=%s error=%s", key, exc)
+            logger.info(
+                "CSO capacity reclaimed warm standby slot key=%s owner=%s slot_id=%s",
+                key,
+                standby_key[1],
+                standby_key[2],
+            )
+            return True
+        return False
+
+    def _drop_slot_unlocked(self, key, owner_key, slot_id):
+        current = self._allocations.get(key)
+        if not current:
+            return
+        owner_slots = current.get(owner_key)
+        if not owner_slots:
+            return
+        owner_slots.pop(slot_id, None)
+        if not owner_slots:
+            current.pop(owner_key, None)
+        if not current:
+            self._allocations.pop(key, None)
+
+    async def promote_standby(self, key, owner_key, slot_id=None):
+        """Turn a standby reservation into a regular one. Returns False if the slot was reclaimed meanwhile."""
+        async with self._lock:
+            self._standby_slots.pop((key, owner_key, slot_id), None)
+            return slot_id in self._allocations.get(key, {}).get(owner_key, {})
+
+    async def holds(self, key, owner_key, slot_id=None):
+        async with self._lock:
+            return slot_id in self._allocations.get(key, {}).get(owner_key, {})
+
     async def release(self, key, owner_key, slot_id=None):
         async with self._lock:
-            current = self._allocations.get(key)
-            if not current:
-                return
-            owner_slots = current.get(owner_key)
-            if not owner_slots:
-                return
-            owner_slots.pop(slot_id, None)
-            if not owner_slots:
-                current.pop(owner_key, None)
-            if not current:
-                self._allocations.pop(key, None)
+            self._standby_slots.pop((key, owner_key, slot_id), None)
+            self._drop_slot_unlocked(key, owner_key, slot_id)
 
     async def release_all(self, owner_key):
         """Release all slots held by a specific owner across all keys."""
         async with self._lock:
+            for standby_key in [standby_key for standby_key in self._standby_slots if standby_key[1] == owner_key]:
+                self._standby_slots.pop(standby_key, None)
             for key in list(self._allocations.keys()):
                 current = self._allocations[key]
                 current.pop(owner_key, None)
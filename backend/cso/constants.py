@@ -24,6 +24,12 @@ CSO_INGEST_RECOVERY_RETRY_WINDOW_SECONDS = 12
 # Delay between output-side ingest recovery retry attempts.
 CSO_INGEST_RECOVERY_RETRY_INTERVAL_SECONDS = 1
 
+# How long a live ingest must run before a warm-standby connection is opened to the next source.
+CSO_WARM_STANDBY_START_DELAY_SECONDS = 5
+
+# Delay between attempts to (re)open a warm-standby connection that failed or was not possible.
+CSO_WARM_STANDBY_RETRY_INTERVAL_SECONDS = 15
+
 # Default no-data timeout before ingest is treated as stalled.
 CSO_STALL_SECONDS_DEFAULT = 20
 
@@ -140,6 +146,13 @@ VOD_CACHE_TTL_SECONDS = 10 * 60
 # Chunk size used while downloading or serving cached VOD files.
 VOD_CACHE_CHUNK_BYTES = 64 * 1024
 
+# Downloaded VOD cache bytes are buffered up to this size before each write+flush to the .part file.
+VOD_CACHE_WRITE_BUFFER_BYTES = 1024 * 1024
+
+# Connect and per-read timeouts for VOD cache downloads.
+VOD_CACHE_DOWNLOAD_CONNECT_TIMEOUT_SECONDS = 15
+VOD_CACHE_DOWNLOAD_READ_TIMEOUT_SECONDS = 30
+
 # Timeout for VOD cache metadata HEAD/Range inspection.
 VOD_CACHE_METADATA_TIMEOUT_SECONDS = 10
 
@@ -0,0 +1,314 @@
+import asyncio
+import ctypes
+import ctypes.util
+import logging
+import os
+import re
+import sys
+from collections import OrderedDict
+from pathlib import Path
+
+
+logger = logging.getLogger("cso")
+
+# Numbered media segments are rotated out of memory; anything else (the fMP4 init segment) stays pinned.
+_SEQUENCE_SEGMENT_RE = re.compile(r"\d+\.(ts|m4s)$")
+
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_DELETE = 0x00000200
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+
+_libc = None
+
+
+def _load_libc():
+    global _libc
+    if _libc is None:
+        _libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    return _libc
+
+
+class _DirectoryWatch:
+    """inotify watch that sets ``wakeup`` whenever a file is written or renamed into ``path`` (Linux only)."""
+
+    def __init__(self, path: Path, wakeup: asyncio.Event):
+        self.path = path
+        self.wakeup = wakeup
+        self.fd = None
+
+    def open(self) -> bool:
+        if not sys.platform.startswith("linux"):
+            return False
+        try:
+            libc = _load_libc()
+            fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+            if fd < 0:
+                return False
+            mask = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_DELETE
+            if libc.inotify_add_watch(fd, os.fsencode(str(self.path)), mask) < 0:
+                os.close(fd)
+                return False
+            asyncio.get_running_loop().add_reader(fd, self._on_readable)
+        except Exception as exc:
+            logger.debug("inotify unavailable for %s, falling back to polling: %s", self.path, exc)
+            return False
+        self.fd = fd
+        return True
+
+    def _on_readable(self):
+        # Events only signal "rescan"; their payload is not needed.
+        try:
+            while os.read(self.fd, 65536):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+        self.wakeup.set()
+
+    def close(self):
+        if self.fd is None:
+            return
+        try:
+            asyncio.get_running_loop().remove_reader(self.fd)
+        except Exception:
+            pass
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+        self.fd = None
+
+
+class HlsOutputStore:
+    """
+    In-memory view of one ffmpeg HLS output directory.
+
+    A single watcher task follows the directory (inotify where available, polling otherwise) and loads
+    each finished segment once, keeping the newest ``max_segments`` plus the rendered playlist in memory.
+    ffmpeg writes with ``temp_file``, so a segment is complete as soon as its final name appears.
+    Segment readers wait on a per-segment readiness event rather than polling the filesystem; segments
+    that have already rotated out of memory are read from disk.
+    """
+
+    def __init__(
+        self,
+        output_dir: Path,
+        playlist_name: str = "index.m3u8",
+        max_segments: int = 16,
+        poll_interval_seconds: float = 0.1,
+        inotify_rescan_seconds: float = 2.0,
+    ):
+        self.output_dir = Path(output_dir)
+        self.playlist_name = playlist_name
+        self.max_segments = max(1, int(max_segments))
+        self.poll_interval_seconds = poll_interval_seconds
+        self.inotify_rescan_seconds = inotify_rescan_seconds
+        self._segments: OrderedDict[str, bytes] = OrderedDict()
+        self._pinned: dict[str, bytes] = {}
+        self._known: set[str] = set()
+        self._waiters: dict[str, asyncio.Event] = {}
+        self._playlist_text = None
+        self._playlist_mtime_ns = None
+        self._refresh_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task = None
+        self.memory_hits = 0
+        self.disk_reads = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def playlist_text(self):
+        return self._playlist_text
+
+    def start(self):
+        if self.running:
+            return
+        self._task = asyncio.create_task(self._watch(), name=f"hls-output-store:{self.output_dir.name}")
+
+    async def stop(self):
+        task = self._task
+        self._task = None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self.reset()
+
+    def reset(self):
+        self._segments.clear()
+        self._pinned.clear()
+        self._known.clear()
+        self._playlist_text = None
+        self._playlist_mtime_ns = None
+        # Wake any readers so they fall back to disk instead of waiting out their timeout.
+        for event in self._waiters.values():
+            event.set()
+        self._waiters.clear()
+
+    async def _watch(self):
+        watch = _DirectoryWatch(self.output_dir, self._wakeup)
+        watching = watch.open()
+        try:
+            while True:
+                try:
+                    await self.refresh()
+                except Exception as exc:
+                    logger.debug("HLS output store refresh failed dir=%s error=%s", self.output_dir, exc)
+                timeout = self.inotify_rescan_seconds if watching else self.poll_interval_seconds
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+        finally:
+            watch.close()
+
+    async def refresh(self):
+        """Scan the output directory once and load any newly finished segments and playlist changes."""
+        async with self._refresh_lock:
+            present, loaded, playlist_text, playlist_mtime_ns = await asyncio.to_thread(
+                self._scan_sync, set(self._known), self._playlist_mtime_ns, not self._known
+            )
+            # Forget segments ffmpeg has deleted so the known set stays bounded on long-running outputs.
+            self._known.intersection_update(present)
+            for name, data in loaded:
+                self._known.add(name)
+                if _SEQUENCE_SEGMENT_RE.search(name):
+                    self._segments[name] = data
+                    while len(self._segments) > self.max_segments:
+                        self._segments.popitem(last=False)
+                else:
+                    self._pinned[name] = data
+                event = self._waiters.pop(name, None)
+                if event is not None:
+                    event.set()
+            if playlist_text is not None:
+                self._playlist_mtime_ns = playlist_mtime_ns
+                if self._playlist_is_complete(playlist_text):
+                    self._playlist_text = playlist_text
+                else:
+                    # Re-read on the next scan once its segments have landed.
+                    self._playlist_mtime_ns = None
+
+    def _scan_sync(self, known, playlist_mtime_ns, initial_scan):
+        try:
+            entries = list(os.scandir(self.output_dir))
+        except FileNotFoundError:
+            return set(), [], None, None
+        present = set()
+        new_names = []
+        playlist_entry = None
+        for entry in entries:
+            name = entry.name
+            if name == self.playlist_name:
+                playlist_entry = entry
+                continue
+            if name.endswith(".tmp"):
+                continue
+            if name in known:
+                present.add(name)
+                continue
+            try:
+                if not entry.is_file():
+                    continue
+            except OSError:
+                continue
+            new_names.append(name)
+        new_names.sort()
+        if initial_scan:
+            # Attaching to an output that is already running: only the newest segments are worth loading,
+            # older ones are still served from disk on request.
+            sequence_names = [name for name in new_names if _SEQUENCE_SEGMENT_RE.search(name)]
+            skipped = set(sequence_names[: -self.max_segments])
+            present.update(skipped)
+            new_names = [name for name in new_names if name not in skipped]
+        loaded = []
+        for name in new_names:
+            try:
+                with open(self.output_dir / name, "rb") as f:
+                    data = f.read()
+            except OSError:
+                continue
+            if data:
+                present.add(name)
+                loaded.append((name, data))
+        playlist_text = None
+        new_mtime_ns = playlist_mtime_ns
+        if playlist_entry is not None:
+            try:
+                new_mtime_ns = playlist_entry.stat().st_mtime_ns
+                if new_mtime_ns != playlist_mtime_ns:
+                    with open(playlist_entry.path, "r", encoding="utf-8") as f:
+                        playlist_text = f.read()
+            except OSError:
+                playlist_text = None
+        return present, loaded, playlist_text, new_mtime_ns
+
+    def _playlist_is_complete(self, playlist_text) -> bool:
+        names = [
+            line.strip().split("?", 1)[0]
+            for line in str(playlist_text or "").splitlines()
+            if line.strip() and not line.strip().startswith("#")
+        ]
+        return bool(names) and all(name in self._known for name in names)
+
+    def _cached_segment(self, name):
+        data = self._segments.get(name)
+        if data is None:
+            data = self._pinned.get(name)
+        return data
+
+    async def _read_from_disk(self, name):
+        path = self.output_dir / name
+        try:
+            data = await asyncio.to_thread(path.read_bytes)
+        except OSError:
+            return None
+        self.disk_reads += 1
+        return data or None
+
+    async def read_segment(self, name: str, timeout_seconds: float = 5.0):
+        data = self._cached_segment(name)
+        if data is not None:
+            self.memory_hits += 1
+            return data
+        if name in self._known:
+            # Finished earlier but already rotated out of memory (event playlists keep old segments).
+            return await self._read_from_disk(name)
+        if not self.running:
+            await self.refresh()
+            data = self._cached_segment(name)
+            if data is not None:
+                self.memory_hits += 1
+                return data
+            return await self._read_from_disk(name)
+        event = self._waiters.get(name)
+        if event is None:
+            event = asyncio.Event()
+            self._waiters[name] = event
+        try:
+            await asyncio.wait_for(event.wait(), timeout=timeout_seconds)
+        except asyncio.TimeoutError:
+            if self._waiters.get(name) is event:
+                self._waiters.pop(name, None)
+        data = self._cached_segment(name)
+        if data is not None:
+            self.memory_hits += 1
+            return data
+        return await self._read_from_disk(name)
+
+    def stats(self):
+        return {
+            "segments": len(self._segments) + len(self._pinned),
+            "segment_bytes": sum(len(data) for data in self._segments.values())
+            + sum(len(data) for data in self._pinned.values()),
+            "memory_hits": self.memory_hits,
+            "disk_reads": self.disk_reads,
+            "waiters": len(self._waiters),
+        }
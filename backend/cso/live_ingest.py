@@ -1,4 +1,5 @@
 import asyncio
+import functools
 import logging
 import re
 import time
@@ -8,14 +9,14 @@ from urllib.parse import urlparse
 from sqlalchemy import select
 from sqlalchemy.orm import joinedload
 
-from backend.config import enable_cso_ingest_command_debug_logging
-from backend.hls_multiplexer import get_header_value
+from backend.config import cso_warm_standby_tag, enable_cso_ingest_command_debug_logging
+from backend.hls_multiplexer import ChunkRingBuffer, get_header_value
 from backend.http_headers import parse_headers_json
 from backend.models import Channel, ChannelSource, Session
 from backend.source_media import load_source_media_shape, persist_source_media_shape
 from backend.utils import clean_key, clean_text, utc_now_naive
 
-from .common import ByteBudgetQueue, build_cso_stream_plan, wait_process_exit_with_timeout
+from .common import build_cso_stream_plan, wait_process_exit_with_timeout
 from .capacity import cso_capacity_registry, source_capacity_key, source_capacity_limit
 from .constants import (
     CSO_HTTP_ERROR_THRESHOLD_DEFAULT,
@@ -31,6 +32,8 @@ from .constants import (
     CSO_UNAVAILABLE_SHOW_SLATE,
     CSO_UNDERSPEED_RATIO_DEFAULT,
     CSO_UNDERSPEED_WINDOW_SECONDS_DEFAULT,
+    CSO_WARM_STANDBY_RETRY_INTERVAL_SECONDS,
+    CSO_WARM_STANDBY_START_DELAY_SECONDS,
     MPEGTS_CHUNK_BYTES,
 )
 from .events import emit_channel_stream_event, source_event_context
@@ -55,7 +58,7 @@ from .sources import (
     order_cso_channel_sources,
     resolve_source_url_candidates,
 )
-from .types import CsoSource, CsoStartResult
+from .types import CsoSource, CsoStartResult, CsoWarmStandby
 
 
 logger = logging.getLogger("cso")
@@ -85,12 +88,21 @@ async def resolve_channel_for_stream(channel_id):
             .options(
                 joinedload(Channel.sources).joinedload(ChannelSource.playlist),
                 joinedload(Channel.sources).joinedload(ChannelSource.xc_account),
+                joinedload(Channel.tags),
             )
             .where(Channel.id == channel_id)
         )
         return result.scalars().unique().one_or_none()
 
 
+def channel_uses_warm_standby(channel):
+    """Whether a channel carries the configured warm-standby tag (``TIC_CSO_WARM_STANDBY_TAG``)."""
+    tag_name = clean_key(cso_warm_standby_tag)
+    if not tag_name or channel is None:
+        return False
+    return any(clean_key(getattr(tag, "name", "")) == tag_name for tag in getattr(channel, "tags", None) or [])
+
+
 def resolve_cso_ingest_user_agent(config, source: CsoSource):
     playlist = source.playlist if source is not None else None
     playlist_user_agent = clean_text(getattr(playlist, "user_agent", ""))
@@ -137,6 +149,7 @@ class CsoIngestSession:
         ingest_user_agent=None,
         slate_session=None,
         vod_pipe_output_format_override="",
+        warm_standby=False,
     ):
         self.key = key
         self.channel_id = channel_id
@@ -147,6 +160,9 @@ class CsoIngestSession:
         self.stream_key = stream_key
         self.username = username
         self.allow_failover = bool(allow_failover)
+        self.warm_standby_enabled = bool(warm_standby and self.allow_failover)
+        self.warm_standby = None
+        self.warm_standby_task = None
         self.ingest_user_agent = clean_text(ingest_user_agent)
         self.slate_session = slate_session
         self.process = None
@@ -157,9 +173,12 @@ class CsoIngestSession:
         self.last_activity = time.time()
         self.subscribers = {}
         self.lifecycle_references = set()
-        self.history = deque()
-        self.history_bytes = 0
         self.max_history_bytes = int(CSO_INGEST_HISTORY_MAX_BYTES)
+        # Shared fan-out ring: history for priming plus each subscriber's unread backlog.
+        self.ring = ChunkRingBuffer(
+            max(int(CSO_INGEST_SUBSCRIBER_QUEUE_MAX_BYTES), self.max_history_bytes),
+            retain_bytes=self.max_history_bytes,
+        )
         self.current_source = None
         self.current_source_url = ""
         self.current_capacity_key = None
@@ -320,8 +339,7 @@ class CsoIngestSession:
             if self.running:
                 return
             self.failover_failed_sources.clear()
-            self.history.clear()
-            self.history_bytes = 0
+            self.ring.clear_history()
             logger.info(
                 "CSO ingest start requested channel=%s sources=%s",
                 self.channel_id,
@@ -339,7 +357,7 @@ class CsoIngestSession:
                 self.failover_exhausted = True
                 return
 
-    async def _spawn_ingest_process(self, source_url, program_index, source: CsoSource = None):
+    def _resolve_ingest_settings(self, source: CsoSource = None):
         playlist = getattr(source, "playlist", None) if source is not None else None
         source_user_agent = clean_text(getattr(playlist, "user_agent", "")) or self.ingest_user_agent
         source_headers = resolve_cso_ingest_headers(source)
@@ -375,11 +393,26 @@ class CsoIngestSession:
             ingest_policy["video_codec"] = video_codec
         if audio_codec:
             ingest_policy["audio_codec"] = audio_codec
-        self.ingest_policy = ingest_policy
+        return {
+            "user_agent": source_user_agent,
+            "headers": source_headers,
+            "source_probe": source_probe,
+            "pipe_format": pipe_format,
+            "ingest_policy": ingest_policy,
+            "segmented_handoff": use_segmented_handoff,
+        }
+
+    async def _spawn_ingest_process(self, source_url, program_index, source: CsoSource = None):
+        settings = self._resolve_ingest_settings(source)
+        source_user_agent = settings["user_agent"]
+        source_headers = settings["headers"]
+        source_probe = settings["source_probe"]
+        pipe_format = settings["pipe_format"]
+        self.ingest_policy = settings["ingest_policy"]
         self.current_source_probe = dict(source_probe or {})
         self._current_source_probe_persisted = False
         self._current_source_probe_input_section_closed = False
-        if use_segmented_handoff:
+        if settings["segmented_handoff"]:
             segment_type = segmented_hls_segment_type(source, source_probe=source_probe)
             segmented_policy = {
                 "output_mode": "force_remux",
@@ -571,8 +604,7 @@ class CsoIngestSession:
             self.read_task = None
             self.stderr_task = None
             self.health_task = None
-            self.history.clear()
-            self.history_bytes = 0
+            self.ring.clear_history()
             self.process_token += 1
             self.last_source_start_ts = time.time()
             self.current_attempt_start_ts = self.last_source_start_ts
@@ -592,8 +624,7 @@ class CsoIngestSession:
             return
         self.process = process
         self.running = True
-        self.history.clear()
-        self.history_bytes = 0
+        self.ring.clear_history()
         self.process_token += 1
         token = self.process_token
         self.last_source_start_ts = time.time()
@@ -625,6 +656,44 @@ class CsoIngestSession:
         self.stderr_task = asyncio.create_task(self._stderr_loop(token, process))
         self.health_task = asyncio.create_task(self._health_loop(token))
 
+    async def _select_ingest_target(self, source: CsoSource, candidate_url):
+        """Resolve the URL and program ffmpeg should ingest for one source URL, picking an HLS variant if any."""
+        variants = await discover_hls_variants(candidate_url)
+        variant_position = None
+        ingest_url = candidate_url
+        url_path = urlparse(candidate_url).path.lower()
+        if (url_path.endswith(".m3u8") or url_path.endswith(".m3u")) and variants:
+            remembered_variant_position = self.source_variant_position.get(source.id)
+            if remembered_variant_position is not None and 0 <= int(remembered_variant_position) < len(variants):
+                variant_position = int(remembered_variant_position)
+            if variant_position is None:
+                variant_position = len(variants) - 1
+            selected_variant = variants[variant_position]
+            program_index = int(selected_variant.get("ffmpeg_program_index") or 0)
+            ingest_url = (selected_variant.get("variant_url") or "").strip() or candidate_url
+            logger.info(
+                "CSO HLS ingest selected variant channel=%s source_id=%s "
+                "program_index=%s variant_position=%s variant_count=%s playlist_type=%s ingest_url=%s",
+                self.channel_id,
+                source.id,
+                program_index,
+                variant_position,
+                len(variants),
+                clean_text(selected_variant.get("playlist_type")) or "unknown",
+                ingest_url,
+            )
+        else:
+            program_index = int(self.source_program_index.get(source.id) or 0)
+            if source.id is not None and source.id in self.source_program_index:
+                logger.info(
+                    "CSO ingest variant discovery empty; reusing remembered program index "
+                    "channel=%s source_id=%s program_index=%s",
+                    self.channel_id,
+                    source.id,
+                    program_index,
+                )
+        return ingest_url, program_index, variants, variant_position
+
     def _eligible_source_ids_unlocked(self):
         eligible_ids = set()
         for source in self.sources:
@@ -699,44 +768,11 @@ class CsoIngestSession:
             resolved_url = ""
             variants = []
             variant_position = None
-            remembered_variant_position = self.source_variant_position.get(source.id)
             last_error = None
             for candidate_url in source_urls:
-                variants = await discover_hls_variants(candidate_url)
-                variant_position = None
-                ingest_url = candidate_url
-                url_path = urlparse(candidate_url).path.lower()
-                if (url_path.endswith(".m3u8") or url_path.endswith(".m3u")) and variants:
-                    if remembered_variant_position is not None and 0 <= int(remembered_variant_position) < len(
-                        variants
-                    ):
-                        variant_position = int(remembered_variant_position)
-                    if variant_position is None:
-                        variant_position = len(variants) - 1
-                    selected_variant = variants[variant_position]
-                    program_index = int(selected_variant.get("ffmpeg_program_index") or 0)
-                    ingest_url = (selected_variant.get("variant_url") or "").strip() or candidate_url
-                    logger.info(
-                        "CSO HLS ingest selected variant channel=%s source_id=%s "
-                        "program_index=%s variant_position=%s variant_count=%s playlist_type=%s ingest_url=%s",
-                        self.channel_id,
-                        source.id,
-                        program_index,
-                        variant_position,
-                        len(variants),
-                        clean_text(selected_variant.get("playlist_type")) or "unknown",
-                        ingest_url,
-                    )
-                else:
-                    program_index = int(self.source_program_index.get(source.id) or 0)
-                    if source.id is not None and source.id in self.source_program_index:
-                        logger.info(
-                            "CSO ingest variant discovery empty; reusing remembered program index "
-                            "channel=%s source_id=%s program_index=%s",
-                            self.channel_id,
-                            source.id,
-                            program_index,
-                        )
+                ingest_url, program_index, variants, variant_position = await self._select_ingest_target(
+                    source, candidate_url
+                )
                 try:
                     process = await self._spawn_ingest_process(ingest_url, program_index, source=source)
                     resolved_url = ingest_url
@@ -802,6 +838,7 @@ class CsoIngestSession:
             self._activate_process_unlocked(process)
             if old_capacity_key:
                 await cso_capacity_registry.release(old_capacity_key, self.capacity_owner_key, slot_id=old_source_id)
+            self._schedule_warm_standby_unlocked()
             return CsoStartResult(success=True)
 
         return CsoStartResult(
@@ -809,6 +846,273 @@ class CsoIngestSession:
             reason="capacity_blocked" if saw_capacity_block else start_failure_reason or "no_available_source",
         )
 
+    def _schedule_warm_standby_unlocked(self):
+        if not self.warm_standby_enabled or self.segmented_handoff_session is not None:
+            return
+        task = self.warm_standby_task
+        if task is not None and not task.done():
+            return
+        self.warm_standby_task = asyncio.create_task(self._warm_standby_loop())
+
+    async def _warm_standby_loop(self):
+        """Keep one connected ingest for the next-priority source while this session is running."""
+        next_attempt_ts = 0.0
+        try:
+            while True:
+                await asyncio.sleep(CSO_WARM_STANDBY_START_DELAY_SECONDS)
+                if not self.running:
+                    return
+                if self.failover_in_progress or self.current_source is None:
+                    continue
+                now = time.time()
+                if now - self.last_source_start_ts < CSO_WARM_STANDBY_START_DELAY_SECONDS:
+                    continue
+                standby = self.warm_standby
+                if standby is not None:
+                    if standby.process.returncode is None:
+                        continue
+                    await self._discard_warm_standby("standby_process_exited")
+                    next_attempt_ts = now + CSO_WARM_STANDBY_RETRY_INTERVAL_SECONDS
+                    continue
+                if now < next_attempt_ts:
+                    continue
+                if not await self._open_warm_standby():
+                    next_attempt_ts = now + CSO_WARM_STANDBY_RETRY_INTERVAL_SECONDS
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.warning("CSO ingest warm standby loop failed channel=%s error=%s", self.channel_id, exc)
+
+    async def _open_warm_standby(self):
+        async with self.lock:
+            if self.warm_standby is not None or not self.running or self.current_source is None:
+                return False
+            active_source_id = self.current_source.id
+            eligible_ids = self._eligible_source_ids_unlocked()
+            candidates = await order_cso_channel_sources(self.sources, channel_id=self.channel_id)
+        now = time.time()
+        for source in candidates:
+            if source.id is None or source.id == active_source_id or source.id not in eligible_ids:
+                continue
+            if self.failed_source_until.get(source.id, 0) > now:
+                continue
+            settings = self._resolve_ingest_settings(source)
+            if settings["segmented_handoff"]:
+                # Segmented hand-off ingests write HLS to disk for the output to read; there is no pipe to promote.
+                continue
+            capacity_key = source_capacity_key(source)
+            reserved = await cso_capacity_registry.try_reserve(
+                capacity_key,
+                self.capacity_owner_key,
+                source_capacity_limit(source),
+                slot_id=source.id,
+                on_reclaim=functools.partial(self._on_warm_standby_capacity_reclaimed, source.id),
+            )
+            if not reserved:
+                logger.debug(
+                    "CSO ingest warm standby skipped source at capacity channel=%s source_id=%s capacity_key=%s",
+                    self.channel_id,
+                    source.id,
+                    capacity_key,
+                )
+                continue
+            source_urls = resolve_source_url_candidates(
+                source,
+                base_url=self.request_base_url,
+                instance_id=self.instance_id,
+                stream_key=self.stream_key,
+                username=self.username,
+            )
+            for candidate_url in source_urls:
+                ingest_url, program_index, variants, variant_position = await self._select_ingest_target(
+                    source, candidate_url
+                )
+                command = CsoFfmpegCommandBuilder(pipe_output_format=settings["pipe_format"]).build_ingest_command(
+                    ingest_url,
+                    program_index=program_index,
+                    user_agent=settings["user_agent"],
+                    request_headers=settings["headers"],
+                )
+                try:
+                    process = await asyncio.create_subprocess_exec(
+                        *command,
+                        stdout=asyncio.subprocess.PIPE,
+                        stderr=asyncio.subprocess.PIPE,
+                    )
+                except Exception as exc:
+                    logger.warning(
+                        "CSO ingest warm standby failed to start channel=%s source_id=%s error=%s",
+                        self.channel_id,
+                        source.id,
+                        exc,
+                    )
+                    continue
+                standby = CsoWarmStandby(
+                    source=source,
+                    source_url=ingest_url,
+                    capacity_key=capacity_key,
+                    process=process,
+                    program_index=program_index,
+                    variants=variants,
+                    variant_position=variant_position,
+                    ingest_policy=settings["ingest_policy"],
+                    source_probe=dict(settings["source_probe"] or {}),
+                    started_at=time.time(),
+                )
+                async with self.lock:
+                    # The registry may have handed the slot to a regular stream while ffmpeg was starting.
+                    still_reserved = await cso_capacity_registry.holds(
+                        capacity_key, self.capacity_owner_key, slot_id=source.id
+                    )
+                    installed = bool(
+                        still_reserved
+                        and self.warm_standby is None
+                        and self.running
+                        and not self.failover_in_progress
+                        and getattr(self.current_source, "id", None) == active_source_id
+                    )
+                    if installed:
+                        standby.drain_task = asyncio.create_task(self._drain_warm_standby(standby))
+                        self.warm_standby = standby
+                if not installed:
+                    await self._close_warm_standby(standby)
+                    return False
+                logger.info(
+                    "CSO ingest warm standby connected channel=%s source_id=%s active_source_id=%s source_url=%s",
+                    self.channel_id,
+                    source.id,
+                    active_source_id,
+                    ingest_url,
+                )
+                return True
+            await cso_capacity_registry.release(capacity_key, self.capacity_owner_key, slot_id=source.id)
+            # Only the next-priority source is kept warm; later candidates are left to the normal failover path.
+            return False
+        return False
+
+    async def _drain_warm_standby(self, standby: CsoWarmStandby):
+        """Discard a standby's output until it is promoted, keeping its upstream connection and demuxer live."""
+        process = standby.process
+
+        async def _discard(stream):
+            while True:
+                chunk = await stream.read(MPEGTS_CHUNK_BYTES)
+                if not chunk:
+                    return
+
+        await asyncio.gather(_discard(process.stdout), _discard(process.stderr))
+        return_code = await process.wait()
+        logger.info(
+            "CSO ingest warm standby upstream ended channel=%s source_id=%s return_code=%s",
+            self.channel_id,
+            standby.source.id,
+            return_code,
+        )
+
+    async def _close_warm_standby(self, standby: CsoWarmStandby):
+        drain_task = standby.drain_task
+        standby.drain_task = None
+        if drain_task is not None and not drain_task.done():
+            drain_task.cancel()
+            try:
+                await drain_task
+            except asyncio.CancelledError:
+                pass
+            except Exception:
+                pass
+        process = standby.process
+        if process is not None and process.returncode is None:
+            try:
+                process.terminate()
+                await wait_process_exit_with_timeout(process, timeout_seconds=2.0)
+            except Exception:
+                try:
+                    process.kill()
+                    await wait_process_exit_with_timeout(process, timeout_seconds=2.0)
+                except Exception:
+                    pass
+        # The slot is keyed by source, so leave it alone if failover has since started that source for real.
+        active_slot = bool(
+            standby.capacity_key == self.current_capacity_key
+            and standby.source.id == getattr(self.current_source, "id", None)
+        )
+        if not active_slot:
+            await cso_capacity_registry.release(standby.capacity_key, self.capacity_owner_key, slot_id=standby.source.id)
+
+    def _on_warm_standby_capacity_reclaimed(self, source_id):
+        # Called under the registry lock once the slot has been given to another stream; close outside it.
+        asyncio.create_task(self._discard_warm_standby("capacity_reclaimed", source_id=source_id))
+
+    async def _discard_warm_standby(self, reason, source_id=None):
+        async with self.lock:
+            standby = self.warm_standby
+            if standby is None or (source_id is not None and standby.source.id != source_id):
+                return
+            self.warm_standby = None
+        logger.info(
+            "CSO ingest warm standby closed channel=%s source_id=%s reason=%s",
+            self.channel_id,
+            standby.source.id,
+            reason,
+        )
+        await self._close_warm_standby(standby)
+
+    async def _promote_warm_standby_unlocked(self, excluded_source_ids=None):
+        """Activate the warm standby as the ingest process. Unusable standbys are closed and False returned."""
+        standby = self.warm_standby
+        if standby is None:
+            return False
+        self.warm_standby = None
+        source = standby.source
+        usable = bool(
+            standby.process.returncode is None
+            and source.id not in set(excluded_source_ids or [])
+            and source.id in self._eligible_source_ids_unlocked()
+            and self.failed_source_until.get(source.id, 0) <= time.time()
+        )
+        if usable:
+            # From here on the slot backs the live ingest and must no longer be reclaimable.
+            usable = await cso_capacity_registry.promote_standby(
+                standby.capacity_key, self.capacity_owner_key, slot_id=source.id
+            )
+        if not usable:
+            await self._close_warm_standby(standby)
+            return False
+        drain_task = standby.drain_task
+        standby.drain_task = None
+        if drain_task is not None and not drain_task.done():
+            drain_task.cancel()
+            try:
+                await drain_task
+            except asyncio.CancelledError:
+                pass
+        self.ingest_policy = dict(standby.ingest_policy or self.ingest_policy)
+        self.current_source_probe = dict(standby.source_probe or {})
+        self._current_source_probe_persisted = False
+        # The drain already consumed ffmpeg's input banner, so there is nothing left to learn from stderr.
+        self._current_source_probe_input_section_closed = True
+        self.current_source = source
+        self.current_source_url = standby.source_url
+        self.current_capacity_key = standby.capacity_key
+        self.hls_variants = list(standby.variants or [])
+        self.current_variant_position = standby.variant_position
+        self.current_program_index = int(standby.program_index or 0)
+        if source.id is not None:
+            self.source_program_index[source.id] = self.current_program_index
+            if standby.variant_position is not None:
+                self.source_variant_position[source.id] = int(standby.variant_position)
+        self.startup_jump_done = True
+        self.pending_switch_success = None
+        logger.info(
+            "CSO ingest promoting warm standby channel=%s source_id=%s standby_age_ms=%s",
+            self.channel_id,
+            source.id,
+            int(max(0.0, time.time() - standby.started_at) * 1000),
+        )
+        self._activate_process_unlocked(standby.process)
+        self._schedule_warm_standby_unlocked()
+        return True
+
     async def _stderr_loop(self, token, process):
         if not process:
             return
@@ -1218,6 +1522,20 @@ class CsoIngestSession:
             self.running = False
             return False
 
+        self.failover_start_ts = time.time()
+        promoted_standby = False
+        if self.warm_standby is not None:
+            # Promote the already connected standby before any of the slower bookkeeping below.
+            async with self.lock:
+                promoted_standby = await self._promote_warm_standby_unlocked(
+                    excluded_source_ids=self.failover_failed_sources
+                )
+                if promoted_standby:
+                    self.running = True
+                    self.failover_exhausted = False
+                    promoted_source = self.current_source
+                    promoted_source_url = self.current_source_url
+
         await emit_channel_stream_event(
             channel_id=self.channel_id,
             source=failed_source,
@@ -1252,6 +1570,23 @@ class CsoIngestSession:
                     **(details or {}),
                 },
             )
+        if promoted_standby:
+            await emit_channel_stream_event(
+                channel_id=self.channel_id,
+                source=promoted_source,
+                session_id=self.key,
+                event_type="switch_success",
+                severity="info",
+                details={
+                    "reason": "failover",
+                    "pipeline": "ingest",
+                    "warm_standby": True,
+                    "program_index": self.current_program_index,
+                    "variant_count": len(self.hls_variants),
+                    **source_event_context(promoted_source, source_url=promoted_source_url),
+                },
+            )
+            return True
         self.failover_start_ts = time.time()
         self.failover_in_progress = True
 
@@ -1340,32 +1675,20 @@ class CsoIngestSession:
         if not chunk:
             return
         self.last_activity = time.time()
-        subscriber_queues = []
-        async with self.lock:
-            self.history.append(chunk)
-            self.history_bytes += len(chunk)
-            while self.history_bytes > self.max_history_bytes and self.history:
-                old = self.history.popleft()
-                self.history_bytes -= len(old)
-            subscriber_queues = list(self.subscribers.values())
-        for q in subscriber_queues:
-            await q.put_drop_oldest(chunk)
+        # One append regardless of subscriber count; each subscriber reads from its own cursor.
+        self.ring.append(chunk)
 
     async def add_subscriber(self, subscriber_id, prebuffer_bytes=0):
         if self.segmented_handoff_session is not None:
             raise RuntimeError("segmented_handoff_has_no_subscriber_queue")
         async with self.lock:
-            q = ByteBudgetQueue(max_bytes=CSO_INGEST_SUBSCRIBER_QUEUE_MAX_BYTES)
-            if prebuffer_bytes > 0 and self.history:
-                total = 0
-                items = []
-                for chunk in reversed(self.history):
-                    items.append(chunk)
-                    total += len(chunk)
-                    if total >= prebuffer_bytes:
-                        break
-                for chunk in reversed(items):
-                    await q.put_drop_oldest(chunk)
+            q = self.ring.reader(
+                prebuffer_bytes=prebuffer_bytes,
+                max_lag_bytes=CSO_INGEST_SUBSCRIBER_QUEUE_MAX_BYTES,
+            )
+            previous = self.subscribers.get(subscriber_id)
+            if previous is not None:
+                await previous.put_eof()
             self.subscribers[subscriber_id] = q
             subscriber_count = len(self.subscribers)
             source_id = getattr(self.current_source, "id", None)
@@ -1383,7 +1706,9 @@ class CsoIngestSession:
 
     async def remove_subscriber(self, subscriber_id):
         async with self.lock:
-            self.subscribers.pop(subscriber_id, None)
+            removed_queue = self.subscribers.pop(subscriber_id, None)
+            if removed_queue is not None:
+                await removed_queue.put_eof()
             remaining = len(self.subscribers)
             lifecycle_references = len(self.lifecycle_references)
             source_id = getattr(self.current_source, "id", None)
@@ -1467,7 +1792,13 @@ class CsoIngestSession:
             self.pending_switch_success = None
             segmented_handoff_session = self.segmented_handoff_session
             self.segmented_handoff_session = None
+            warm_standby = self.warm_standby
+            self.warm_standby = None
+            warm_standby_task = self.warm_standby_task
+            self.warm_standby_task = None
             subscriber_count = len(self.subscribers)
+        if warm_standby_task is not None and warm_standby_task is not asyncio.current_task():
+            warm_standby_task.cancel()
         # Release capacity immediately so other channels are not blocked while
         # this ingest session drains/tears down.
         if capacity_key:
@@ -1477,6 +1808,8 @@ class CsoIngestSession:
                 slot_id=source_id,
             )
         await cso_capacity_registry.release_all(self.capacity_owner_key)
+        if warm_standby is not None:
+            await self._close_warm_standby(warm_standby)
 
         logger.info(
             "Stopping CSO ingest channel=%s ingest_key=%s source_id=%s source_url=%s subscribers=%s force=%s",
@@ -1523,7 +1856,5 @@ class CsoIngestSession:
             return_code,
         )
         async with self.lock:
-            self.history.clear()
-            self.history_bytes = 0
-            for q in self.subscribers.values():
-                await q.put_eof()
+            self.ring.clear_history()
+            self.ring.close_readers()
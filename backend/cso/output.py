@@ -6,11 +6,11 @@ from collections import deque
 from pathlib import Path
 
 from backend.config import enable_cso_output_command_debug_logging
+from backend.hls_multiplexer import ChunkRingBuffer
 from backend.http_headers import sanitise_headers
 from backend.utils import clean_key, clean_text
 
 from .common import (
-    ByteBudgetQueue,
     prepare_cso_cache_dir,
     process_is_running,
     remove_cso_cache_dir,
@@ -18,6 +18,7 @@ from .common import (
 )
 from .constants import (
     CSO_HLS_CLIENT_IDLE_SECONDS,
+    CSO_HLS_LIST_SIZE,
     CSO_INGEST_RECOVERY_RETRY_INTERVAL_SECONDS,
     CSO_INGEST_SUBSCRIBER_PREBUFFER_BYTES,
     CSO_OUTPUT_CLIENT_QUEUE_MAX_BYTES,
@@ -33,6 +34,7 @@ from .ffmpeg import (
     start_ffmpeg_with_hw_decode_fallback,
     terminate_ffmpeg_process,
 )
+from .hls_output_store import HlsOutputStore
 from .policy import (
     effective_vod_hls_runtime_policy,
     policy_ffmpeg_format,
@@ -77,15 +79,18 @@ class CsoOutputSession:
         self.lock = asyncio.Lock()
         self.last_activity = time.time()
         self.clients = {}
-        self.history = deque()
-        self.history_bytes = 0
         self.max_history_bytes = 16 * 1024 * 1024
+        # Shared fan-out ring: history for priming plus each client's unread backlog.
+        self.ring = ChunkRingBuffer(
+            max(int(CSO_OUTPUT_CLIENT_QUEUE_MAX_BYTES), self.max_history_bytes),
+            retain_bytes=self.max_history_bytes,
+        )
+        self._last_stale_scan_ts = 0.0
         self.last_error = None
         self.ingest_queue = None
         self.ingest_lifecycle_reference = False
         self.slate_queue = None
         self._recent_ffmpeg_stderr = deque(maxlen=30)
-        self.client_drop_state = {}
         self.client_last_touch = {}
         self._input_mode = "slate" if self.use_slate_as_input else "ingest"
         self.start_ts = 0.0
@@ -710,45 +715,22 @@ class CsoOutputSession:
     async def _broadcast(self, chunk):
         if not chunk:
             return
-        self.last_activity = time.time()
         now = time.time()
+        self.last_activity = now
+        # One append regardless of client count; each client reads from its own cursor.
+        self.ring.append(chunk)
+        if (now - self._last_stale_scan_ts) < 1.0:
+            return
+        self._last_stale_scan_ts = now
+        if self._suspend_client_stale_checks():
+            return
         stale_clients = []
-        active_clients = []
-        drop_results = {}
-        suspend_stale_checks = self._suspend_client_stale_checks()
         async with self.lock:
-            self.history.append(chunk)
-            self.history_bytes += len(chunk)
-            while self.history_bytes > self.max_history_bytes and self.history:
-                old = self.history.popleft()
-                self.history_bytes -= len(old)
-            for connection_id, q in list(self.clients.items()):
+            for connection_id in list(self.clients.keys()):
                 last_touch = float(self.client_last_touch.get(connection_id, now) or now)
                 stale_seconds = self._stale_seconds_for_connection(connection_id)
-                if not suspend_stale_checks and (now - last_touch) >= stale_seconds:
+                if (now - last_touch) >= stale_seconds:
                     stale_clients.append((connection_id, stale_seconds))
-                    continue
-                active_clients.append((connection_id, q))
-        for connection_id, q in active_clients:
-            drop_results[connection_id] = await q.put_drop_oldest(chunk)
-        async with self.lock:
-            for connection_id, queue_result in drop_results.items():
-                if connection_id not in self.clients:
-                    continue
-                if int(queue_result.get("dropped_items") or 0) > 0:
-                    state = self.client_drop_state.get(connection_id)
-                    if not state:
-                        state = {
-                            "first_ts": now,
-                            "last_ts": now,
-                            "count": int(queue_result.get("dropped_items") or 0),
-                        }
-                        self.client_drop_state[connection_id] = state
-                    else:
-                        state["last_ts"] = now
-                        state["count"] = int(state.get("count") or 0) + int(queue_result.get("dropped_items") or 0)
-                else:
-                    self.client_drop_state.pop(connection_id, None)
         for connection_id, stale_seconds in stale_clients:
             logger.warning(
                 "CSO output dropping stale client channel=%s output_key=%s connection_id=%s reason=no_consumer_progress stale_seconds=%s",
@@ -761,19 +743,11 @@ class CsoOutputSession:
 
     async def add_client(self, connection_id, prebuffer_bytes=0):
         async with self.lock:
-            q = ByteBudgetQueue(max_bytes=CSO_OUTPUT_CLIENT_QUEUE_MAX_BYTES)
-            if prebuffer_bytes > 0 and self.history:
-                total = 0
-                items = []
-                for chunk in reversed(self.history):
-                    items.append(chunk)
-                    total += len(chunk)
-                    if total >= prebuffer_bytes:
-                        break
-                for chunk in reversed(items):
-                    await q.put_drop_oldest(chunk)
+            q = self.ring.reader(prebuffer_bytes=prebuffer_bytes, max_lag_bytes=CSO_OUTPUT_CLIENT_QUEUE_MAX_BYTES)
+            previous = self.clients.get(connection_id)
+            if previous is not None:
+                await previous.put_eof()
             self.clients[connection_id] = q
-            self.client_drop_state.pop(connection_id, None)
             self.client_last_touch[connection_id] = time.time()
             client_count = len(self.clients)
         logger.info(
@@ -826,7 +800,6 @@ class CsoOutputSession:
         removed_queue = None
         async with self.lock:
             removed_queue = self.clients.pop(connection_id, None)
-            self.client_drop_state.pop(connection_id, None)
             self.client_last_touch.pop(connection_id, None)
             remaining = len(self.clients)
         if removed_queue is not None:
@@ -847,11 +820,18 @@ class CsoOutputSession:
         now = time.time()
         candidates = []
         async with self.lock:
-            for connection_id, state in list(self.client_drop_state.items()):
-                if str(connection_id) not in self.clients:
+            for connection_id, q in list(self.clients.items()):
+                first_ts = q.drop_first_ts
+                count = int(q.drop_run_count or 0)
+                # Stalled readers only record skips when they next read, so count what they are about to skip
+                # from the time they went over their lag budget.
+                lag_since = q.lag_budget_exceeded_since()
+                if lag_since is not None:
+                    first_ts = lag_since if first_ts is None else min(float(first_ts), float(lag_since))
+                    count += int(q.pending_skip_items())
+                if first_ts is None:
                     continue
-                elapsed = float(now - float(state.get("first_ts") or now))
-                count = int(state.get("count") or 0)
+                elapsed = float(now - float(first_ts))
                 if elapsed >= float(min_elapsed_seconds) and count >= int(min_drop_count):
                     candidates.append(connection_id)
         removed = 0
@@ -963,7 +943,6 @@ class CsoOutputSession:
             async with self.lock:
                 for q in self.clients.values():
                     await q.put_eof()
-                self.client_drop_state.clear()
                 self.client_last_touch.clear()
 
 
@@ -994,6 +973,11 @@ class CsoHlsOutputSession:
         self.cache_root_dir = Path(cache_root_dir)
         self.output_dir = self.cache_root_dir / self.key
         self.playlist_path = self.output_dir / "index.m3u8"
+        self.segment_store = HlsOutputStore(
+            self.output_dir,
+            playlist_name=self.playlist_path.name,
+            max_segments=CSO_HLS_LIST_SIZE + 3,
+        )
         self.input_target = str(input_target or "").strip()
         self.input_is_url = bool(input_is_url)
         self.input_user_agent = str(input_user_agent or "").strip()
@@ -1082,16 +1066,6 @@ class CsoHlsOutputSession:
             and float(data.get("fps") or 0.0) > 0.0
         )
 
-    @staticmethod
-    def _playlist_segment_names(playlist_text):
-        names = []
-        for raw_line in str(playlist_text or "").splitlines():
-            line = raw_line.strip()
-            if not line or line.startswith("#"):
-                continue
-            names.append(line.split("?", 1)[0])
-        return names
-
     def _ffmpeg_error_summary(self):
         lines = [line for line in self._recent_ffmpeg_stderr if line]
         if not lines:
@@ -1135,9 +1109,11 @@ class CsoHlsOutputSession:
             )
 
     async def _prepare_output_dir(self):
+        await self.segment_store.stop()
         await prepare_cso_cache_dir(self.output_dir, logger, f"hls-output:{self.key}")
         self._last_good_playlist_text = None
         self._last_good_playlist_ts = 0.0
+        self.segment_store.start()
 
     async def start(self):
         async with self.lock:
@@ -1406,6 +1382,11 @@ class CsoHlsOutputSession:
             return_code = None
         if token != self.process_token:
             return
+        try:
+            # Pick up the final segments and playlist without waiting for the next watcher pass.
+            await self.segment_store.refresh()
+        except Exception:
+            pass
         if not self._last_good_playlist_text:
             try:
                 await self.read_playlist_text()
@@ -1553,49 +1534,26 @@ class CsoHlsOutputSession:
             await self.remove_client(connection_id)
 
     async def read_playlist_text(self):
-        if not self.playlist_path.exists():
-            return self._last_good_playlist_text
-        try:
-            playlist_text = await asyncio.to_thread(self.playlist_path.read_text, "utf-8")
-        except Exception:
-            return self._last_good_playlist_text
-        segment_names = self._playlist_segment_names(playlist_text)
-        if not segment_names:
-            return self._last_good_playlist_text
-        for segment_name in segment_names:
-            segment_path = (self.output_dir / segment_name).resolve()
-            if not str(segment_path).startswith(str(self.output_dir.resolve())):
-                return self._last_good_playlist_text
-            if not segment_path.exists() or not segment_path.is_file():
-                return self._last_good_playlist_text
+        # The segment store only publishes playlists whose segments have all landed, so no per-segment
+        # validation is needed here. Without a running watcher (e.g. after stop) scan once on demand.
+        if not self.segment_store.running:
             try:
-                if int(segment_path.stat().st_size or 0) <= 0:
-                    return self._last_good_playlist_text
+                await self.segment_store.refresh()
             except Exception:
                 return self._last_good_playlist_text
-        self._last_good_playlist_text = playlist_text
-        self._last_good_playlist_ts = time.time()
+        playlist_text = self.segment_store.playlist_text
+        if not playlist_text:
+            return self._last_good_playlist_text
+        if playlist_text != self._last_good_playlist_text:
+            self._last_good_playlist_text = playlist_text
+            self._last_good_playlist_ts = time.time()
         return playlist_text
 
     async def read_segment_bytes(self, segment_name):
         name = clean_text(segment_name)
-        if not name or not SAFE_HLS_SEGMENT_RE.match(name):
-            return None
-        segment_path = (self.output_dir / name).resolve()
-        if not str(segment_path).startswith(str(self.output_dir.resolve())):
-            return None
-        deadline = time.time() + 5.0
-        while time.time() < deadline:
-            if segment_path.exists() and segment_path.is_file():
-                try:
-                    if int(segment_path.stat().st_size or 0) > 0:
-                        break
-                except Exception:
-                    pass
-            await asyncio.sleep(0.05)
-        if not segment_path.exists() or not segment_path.is_file():
+        if not name or not SAFE_HLS_SEGMENT_RE.match(name) or name in {".", ".."}:
             return None
-        return await asyncio.to_thread(segment_path.read_bytes)
+        return await self.segment_store.read_segment(name, timeout_seconds=5.0)
 
     async def stop(self, force=False):
         async with self.lock:
@@ -1685,4 +1643,5 @@ class CsoHlsOutputSession:
                 self.process_token == stop_token and not self.running and not self.process and not self.clients
             )
         if should_cleanup_output_dir:
+            await self.segment_store.stop()
             await remove_cso_cache_dir(self.output_dir, logger, f"hls-output:{self.key}")
@@ -12,7 +12,7 @@ from .events import (
     source_event_context,
     summarize_cso_playback_issue,
 )
-from .live_ingest import CsoIngestSession, resolve_cso_ingest_user_agent
+from .live_ingest import CsoIngestSession, channel_uses_warm_standby, resolve_cso_ingest_user_agent
 from .output import CsoHlsOutputSession, CsoOutputSession
 from .policy import policy_content_type
 from .slate import CsoSlateSession, should_allow_unavailable_slate
@@ -62,6 +62,7 @@ async def subscribe_channel_hls(
             stream_key=stream_key,
             username=username,
             ingest_user_agent=ingest_user_agent,
+            warm_standby=channel_uses_warm_standby(channel),
         )
 
     ingest_session = await cso_session_manager.get_or_create_ingest(ingest_key, _ingest_factory)
@@ -320,6 +321,7 @@ async def subscribe_channel_stream(
             stream_key=stream_key,
             username=username,
             ingest_user_agent=ingest_user_agent,
+            warm_standby=channel_uses_warm_standby(channel),
             slate_session=slate_session,
         )
 
@@ -52,6 +52,23 @@ class CsoStartResult:
     reason: str | None = None
 
 
+@dataclass
+class CsoWarmStandby:
+    """A connected ingest process for the next-priority source, kept ready for failover promotion."""
+
+    source: CsoSource
+    source_url: str
+    capacity_key: str
+    process: object
+    program_index: int = 0
+    variants: list | None = None
+    variant_position: int | None = None
+    ingest_policy: dict | None = None
+    source_probe: dict | None = None
+    drain_task: asyncio.Task | None = None
+    started_at: float = 0.0
+
+
 @dataclass
 class CsoStreamPlan:
     generator: object | None
@@ -77,6 +94,8 @@ class VodCacheEntry:
     metadata_headers: dict | None = None
     content_type: str | None = None
     last_access_ts: float = 0.0
+    last_served_ts: float = 0.0
+    served_ts_persisted: float = 0.0
     active_sessions: int = 0
     active_readers: int = 0
     downloader_owner_key: str | None = None
@@ -101,6 +120,14 @@ class VodCacheEntry:
     def touch(self):
         self.last_access_ts = time.time()
 
+    def mark_served(self):
+        self.last_served_ts = time.time()
+        self.last_access_ts = self.last_served_ts
+
+    @property
+    def evictable(self):
+        return not self.downloader_running and self.active_readers <= 0 and self.active_sessions <= 0
+
     @property
     def downloader_running(self):
         return self.download_task is not None and not self.download_task.done()
@@ -10,9 +10,8 @@ from urllib.parse import urlparse
 
 import aiofiles
 import aiohttp
-import requests
-import urllib3
 
+from backend import config as app_config
 from backend.hls_multiplexer import get_header_value
 from backend.stream_profiles import content_type_for_media_path
 from backend.utils import clean_key, clean_text, convert_to_int
@@ -20,9 +19,12 @@ from backend.utils import clean_key, clean_text, convert_to_int
 from .capacity import cso_capacity_registry, source_capacity_key, source_capacity_limit
 from .constants import (
     VOD_CACHE_CHUNK_BYTES,
+    VOD_CACHE_DOWNLOAD_CONNECT_TIMEOUT_SECONDS,
+    VOD_CACHE_DOWNLOAD_READ_TIMEOUT_SECONDS,
     VOD_CACHE_METADATA_TIMEOUT_SECONDS,
     VOD_CACHE_ROOT,
     VOD_CACHE_TTL_SECONDS,
+    VOD_CACHE_WRITE_BUFFER_BYTES,
     VOD_HEAD_PROBE_STATE_TTL_SECONDS,
 )
 from .sources import cso_source_from_vod_source
@@ -151,7 +153,7 @@ async def ensure_vod_cache_ready(
                 "expected_size": None,
                 "reason": "size_unknown",
             }
-        has_space = await _vod_cache_has_space(expected_size * 2)
+        has_space = await vod_cache_manager.make_room(entry, expected_size)
         if not has_space:
             entry.failed_reason = "insufficient_space"
             return {
@@ -206,6 +208,13 @@ async def _run_vod_cache_download(entry: VodCacheEntry, owner_key: str, request_
     await asyncio.to_thread(entry.part_path.parent.mkdir, 0o755, True, True)
     max_attempts = 4
     attempt = 0
+    timeout = aiohttp.ClientTimeout(
+        total=None,
+        connect=VOD_CACHE_DOWNLOAD_CONNECT_TIMEOUT_SECONDS,
+        sock_connect=VOD_CACHE_DOWNLOAD_CONNECT_TIMEOUT_SECONDS,
+        sock_read=VOD_CACHE_DOWNLOAD_READ_TIMEOUT_SECONDS,
+    )
+    http_session = aiohttp.ClientSession(timeout=timeout, auto_decompress=False)
     try:
         while True:
             if entry.complete:
@@ -223,20 +232,8 @@ async def _run_vod_cache_download(entry: VodCacheEntry, owner_key: str, request_
             headers = dict(base_headers)
             headers["Range"] = f"bytes={range_start}-"
 
-            http_session = requests.Session()
-            response = None
-            iterator = None
-            try:
-                response = await asyncio.to_thread(
-                    lambda session=http_session, request_headers=headers: session.get(
-                        entry.upstream_url,
-                        headers=request_headers,
-                        allow_redirects=True,
-                        stream=True,
-                        timeout=(15, 30),
-                    )
-                )
-                status_code = int(response.status_code or 502)
+            async with http_session.get(entry.upstream_url, headers=headers, allow_redirects=True) as response:
+                status_code = int(response.status or 502)
                 if status_code >= 400:
                     entry.failed_reason = f"download_status_{status_code}"
                     entry.ready_event.set()
@@ -271,50 +268,50 @@ async def _run_vod_cache_download(entry: VodCacheEntry, owner_key: str, request_
 
                 entry.ready_event.set()
                 open_mode = "ab" if range_start > 0 else "wb"
-                iterator = response.iter_content(chunk_size=VOD_CACHE_CHUNK_BYTES)
                 async with aiofiles.open(entry.part_path, open_mode) as handle:
-                    while True:
-                        try:
-                            chunk = await asyncio.to_thread(next, iterator, None)
-                        except (
-                            requests.exceptions.ChunkedEncodingError,
-                            requests.exceptions.ConnectionError,
-                            requests.exceptions.ReadTimeout,
-                            urllib3.exceptions.ProtocolError,
-                            ConnectionResetError,
-                            OSError,
-                        ) as exc:
-                            attempt += 1
-                            entry.failed_reason = f"download_retry:{exc}"
-                            if attempt >= max_attempts:
-                                raise
-                            logger.warning(
-                                "VOD cache download interrupted; retrying asset=%s source_id=%s bytes_written=%s attempt=%s error=%s",
-                                entry.key,
-                                entry.source.id,
-                                int(entry.bytes_written or 0),
-                                attempt,
-                                exc,
-                            )
-                            break
-                        if not chunk:
-                            break
-                        await handle.write(chunk)
-                        entry.bytes_written += len(chunk)
+                    # Chunks are gathered into a bounded buffer so the file executor is hit once per buffer
+                    # rather than once per socket read. Readers only see bytes once they are flushed, so
+                    # bytes_written and the progress event advance per flush.
+                    buffer = bytearray()
+
+                    async def _flush_buffer():
+                        if not buffer:
+                            return
+                        await handle.write(bytes(buffer))
+                        await handle.flush()
+                        entry.bytes_written += len(buffer)
+                        buffer.clear()
                         entry.touch()
                         entry.progress_event.set()
                         entry.progress_event = asyncio.Event()
-                    await handle.flush()
-            finally:
-                try:
-                    if response is not None:
-                        await asyncio.to_thread(response.close)
-                except Exception:
-                    pass
-                try:
-                    await asyncio.to_thread(http_session.close)
-                except Exception:
-                    pass
+
+                    try:
+                        async for chunk in response.content.iter_chunked(VOD_CACHE_CHUNK_BYTES):
+                            buffer.extend(chunk)
+                            if len(buffer) >= VOD_CACHE_WRITE_BUFFER_BYTES:
+                                await _flush_buffer()
+                    except (
+                        aiohttp.ClientPayloadError,
+                        aiohttp.ClientConnectionError,
+                        asyncio.TimeoutError,
+                        ConnectionResetError,
+                        OSError,
+                    ) as exc:
+                        await _flush_buffer()
+                        attempt += 1
+                        entry.failed_reason = f"download_retry:{exc}"
+                        if attempt >= max_attempts:
+                            raise
+                        logger.warning(
+                            "VOD cache download interrupted; retrying asset=%s source_id=%s bytes_written=%s attempt=%s error=%s",
+                            entry.key,
+                            entry.source.id,
+                            int(entry.bytes_written or 0),
+                            attempt,
+                            exc,
+                        )
+                    else:
+                        await _flush_buffer()
 
             if entry.expected_size and int(entry.bytes_written or 0) >= int(entry.expected_size):
                 break
@@ -347,6 +344,7 @@ async def _run_vod_cache_download(entry: VodCacheEntry, owner_key: str, request_
         entry.failed_reason = f"download_failed:{exc}"
         logger.warning("VOD cache download failed asset=%s error=%s", entry.key, exc)
     finally:
+        await http_session.close()
         entry.ready_event.set()
         entry.progress_event.set()
         await cso_capacity_registry.release(source_capacity_key(entry.source), owner_key, slot_id=owner_key)
@@ -471,10 +469,126 @@ def _vod_content_type_for_source(source: CsoSource):
     return None
 
 
+def _vod_cache_entry_bytes(entry: VodCacheEntry) -> int:
+    """Bytes an entry occupies, counting in-flight downloads at their full expected size."""
+    if entry.complete or entry.downloader_running:
+        return int(entry.expected_size or entry.bytes_written or 0)
+    return int(entry.bytes_written or 0)
+
+
+def _persist_vod_cache_served_timestamps(entries):
+    # The final file's mtime records when it was last served, so the LRU order survives restarts.
+    for entry in entries:
+        served_ts = float(entry.last_served_ts or 0)
+        try:
+            os.utime(entry.final_path, (served_ts, served_ts))
+        except OSError:
+            continue
+        entry.served_ts_persisted = served_ts
+
+
 class VodCacheManager:
-    def __init__(self):
+    def __init__(self, quota_bytes=0):
         self.entries = {}
         self.lock = asyncio.Lock()
+        self.evict_lock = asyncio.Lock()
+        # 0 disables the quota; idle-time cleanup then remains the only eviction for completed files.
+        self.quota_bytes = max(0, int(quota_bytes or 0))
+        self.hit_bytes = 0
+        self.miss_bytes = 0
+        self.evicted_entries = 0
+        self.evicted_bytes = 0
+
+    def usage_bytes(self, exclude: VodCacheEntry | None = None) -> int:
+        return sum(_vod_cache_entry_bytes(entry) for entry in self.entries.values() if entry is not exclude)
+
+    def record_served(self, byte_count: int, from_cache: bool):
+        if from_cache:
+            self.hit_bytes += int(byte_count)
+        else:
+            self.miss_bytes += int(byte_count)
+
+    def stats(self):
+        served = self.hit_bytes + self.miss_bytes
+        return {
+            "entries": len(self.entries),
+            "usage_bytes": self.usage_bytes(),
+            "quota_bytes": self.quota_bytes,
+            "hit_bytes": self.hit_bytes,
+            "miss_bytes": self.miss_bytes,
+            "hit_ratio": round(self.hit_bytes / served, 4) if served else None,
+            "evicted_entries": self.evicted_entries,
+            "evicted_bytes": self.evicted_bytes,
+        }
+
+    def _eviction_candidates(self, exclude: VodCacheEntry | None = None):
+        candidates = [entry for entry in self.entries.values() if entry is not exclude and entry.evictable]
+        return sorted(
+            candidates,
+            key=lambda entry: (float(entry.last_served_ts or 0), float(entry.last_access_ts or 0)),
+        )
+
+    async def _evict(self, entry: VodCacheEntry, reason: str):
+        evicted_bytes = _vod_cache_entry_bytes(entry)
+        await self._remove_entry(entry)
+        self.evicted_entries += 1
+        self.evicted_bytes += evicted_bytes
+        logger.info(
+            "Evicted VOD cache entry asset=%s bytes=%s reason=%s last_served_ts=%s",
+            entry.key,
+            evicted_bytes,
+            reason,
+            int(entry.last_served_ts or 0),
+        )
+
+    async def make_room(self, entry: VodCacheEntry, required_bytes: int) -> bool:
+        """
+        Evict least recently served entries until ``required_bytes`` fit within the quota and the volume
+        keeps twice that free. Entries being downloaded or read are never evicted, and nothing is evicted
+        when that could not free enough space.
+        """
+        required_bytes = int(required_bytes or 0)
+        if required_bytes <= 0:
+            return False
+        if self.quota_bytes and required_bytes > self.quota_bytes:
+            return False
+        async with self.evict_lock:
+            candidates = self._eviction_candidates(exclude=entry)
+            reclaimable = sum(_vod_cache_entry_bytes(candidate) for candidate in candidates)
+            usage = await asyncio.to_thread(shutil.disk_usage, str(VOD_CACHE_ROOT.parent))
+            free_bytes = int(usage.free or 0)
+            quota_usage = self.usage_bytes(exclude=entry)
+            if free_bytes + reclaimable < required_bytes * 2:
+                return False
+            if self.quota_bytes and quota_usage - reclaimable + required_bytes > self.quota_bytes:
+                return False
+            for candidate in candidates:
+                over_quota = self.quota_bytes and quota_usage + required_bytes > self.quota_bytes
+                if not over_quota and free_bytes >= required_bytes * 2:
+                    break
+                if not candidate.evictable:
+                    continue
+                candidate_bytes = _vod_cache_entry_bytes(candidate)
+                await self._evict(candidate, "quota" if over_quota else "disk_space")
+                quota_usage -= candidate_bytes
+                free_bytes += candidate_bytes
+            return await _vod_cache_has_space(required_bytes * 2) and (
+                not self.quota_bytes or self.usage_bytes(exclude=entry) + required_bytes <= self.quota_bytes
+            )
+
+    async def _enforce_quota(self):
+        if not self.quota_bytes:
+            return 0
+        evicted = 0
+        async with self.evict_lock:
+            for candidate in self._eviction_candidates():
+                if self.usage_bytes() <= self.quota_bytes:
+                    break
+                if not candidate.evictable:
+                    continue
+                await self._evict(candidate, "quota")
+                evicted += 1
+        return evicted
 
     async def get(self, source: CsoSource):
         key = _vod_cache_asset_key(source)
@@ -535,11 +649,11 @@ class VodCacheManager:
                         continue
                     internal_id = int(file_name)
                     key = f"{asset_kind}:{internal_id}"
-                    expected_size = 0
                     try:
-                        expected_size = int(path.stat().st_size or 0)
+                        file_stat = path.stat()
                     except Exception:
-                        expected_size = 0
+                        continue
+                    expected_size = int(file_stat.st_size or 0)
                     if expected_size <= 0:
                         continue
                     source_type = "vod_movie" if asset_kind == "movie" else "vod_episode"
@@ -571,6 +685,10 @@ class VodCacheManager:
                     entry.metadata_headers = entry.metadata_headers or {}
                     entry.content_type = entry.content_type or _vod_content_type_for_source(source)
                     entry.last_access_ts = now_ts
+                    # Served timestamps are persisted as the file mtime, which restores the LRU order
+                    # without re-probing the upstream.
+                    entry.last_served_ts = float(file_stat.st_mtime or 0)
+                    entry.served_ts_persisted = entry.last_served_ts
                     imported += 1
         if imported or removed_parts:
             logger.info(
@@ -598,12 +716,23 @@ class VodCacheManager:
             entries = list(self.entries.values())
         removed = 0
         for entry in entries:
-            if entry.downloader_running or entry.active_readers > 0 or entry.active_sessions > 0:
+            if not entry.evictable:
+                continue
+            if self.quota_bytes and entry.complete:
+                # With a quota, completed files stay until least-recently-served eviction needs the room.
                 continue
             if (now_ts - float(entry.last_access_ts or 0)) < max(30, int(idle_seconds or 0)):
                 continue
             await self._remove_entry(entry)
             removed += 1
+        removed += await self._enforce_quota()
+        served = [
+            entry
+            for entry in entries
+            if entry.complete and float(entry.last_served_ts or 0) > float(entry.served_ts_persisted or 0)
+        ]
+        if served:
+            await asyncio.to_thread(_persist_vod_cache_served_timestamps, served)
         return removed
 
     async def _remove_entry(self, entry: VodCacheEntry):
@@ -626,4 +755,4 @@ class VodCacheManager:
                 self.entries.pop(entry.key, None)
 
 
-vod_cache_manager = VodCacheManager()
+vod_cache_manager = VodCacheManager(quota_bytes=app_config.vod_cache_quota_mb * 1024 * 1024)
@@ -529,6 +529,7 @@ class VodProxySession:
                         )
                         self.first_chunk_logged = True
                     self.direct_next_offset += len(chunk)
+                    vod_cache_manager.record_served(len(chunk), from_cache=False)
                     yield chunk
                 else:
                     break
@@ -593,7 +594,8 @@ class VodProxySession:
                             )
                             self.first_chunk_logged = True
                         offset += len(chunk)
-                        entry.touch()
+                        entry.mark_served()
+                        vod_cache_manager.record_served(len(chunk), from_cache=True)
                         yield chunk
                         if final_end is not None and offset > final_end:
                             return
@@ -272,8 +272,8 @@ async def apply_recurring_rules(config):
                 .where(
                     and_(
                         EpgChannelProgrammes.epg_channel_id == int(epg_channel["epg_channel_row_id"]),
-                        EpgChannelProgrammes.start_timestamp <= str(end_ts),
-                        EpgChannelProgrammes.stop_timestamp >= str(now_ts),
+                        EpgChannelProgrammes.start_ts <= end_ts,
+                        EpgChannelProgrammes.stop_ts >= now_ts,
                     )
                 )
             )
@@ -282,8 +282,8 @@ async def apply_recurring_rules(config):
                 if rule.title_match and programme.title:
                     if rule.title_match.lower() not in programme.title.lower():
                         continue
-                start_ts = int(programme.start_timestamp or 0)
-                stop_ts = int(programme.stop_timestamp or 0)
+                start_ts = int(programme.start_ts or 0)
+                stop_ts = int(programme.stop_ts or 0)
                 if start_ts <= 0 or stop_ts <= 0:
                     continue
                 existing = await session.execute(
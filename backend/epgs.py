@@ -8,6 +8,8 @@ import os
 import re
 import shutil
 import stat
+import tempfile
+import unicodedata
 from collections import defaultdict, deque
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
@@ -20,11 +22,13 @@ import sys
 import time
 import xml.etree.ElementTree as ET
 from collections.abc import Sequence
+from functools import lru_cache
 
 from bs4 import BeautifulSoup
 from quart.utils import run_sync
-from sqlalchemy.orm import joinedload
-from sqlalchemy import and_, or_, delete, insert, select, text, func, cast, BigInteger, exists, update
+from sqlalchemy.orm import Session as SyncSession, joinedload
+from sqlalchemy.pool import NullPool
+from sqlalchemy import and_, or_, delete, insert, select, text, func, exists, update, create_engine
 from backend import config as app_config
 from backend.dummy_epg import (
     DUMMY_EPG_DEFAULT_INTERVAL_MINUTES,
@@ -38,6 +42,20 @@ from backend.dummy_epg import (
     xmltv_datetime_from_timestamp,
 )
 from backend.models import db, Session, Epg, Channel, EpgChannels, EpgChannelProgrammes, EpgProgrammeMetadataCache
+from backend.source_fetch import (
+    conditional_request_headers,
+    mark_source_imported,
+    response_validators,
+    source_unchanged_since_import,
+    write_fetch_state,
+)
+from backend.source_refresh import (
+    current_source_refresh_timings,
+    describe_source_refresh,
+    source_refresh_concurrency_limiter,
+    source_refresh_stage,
+    track_source_refresh,
+)
 from backend.tvheadend.tvh_requests import get_tvh
 from backend.utils import as_naive_utc, parse_entity_id
 from backend.vod_channels import build_xmltv_programmes, build_vod_channel_schedule, is_vod_channel_type
@@ -132,7 +150,7 @@ EPG_UPDATE_SCHEDULE_SECONDS = {
 
 
 def _programme_stop_ts_expr():
-    return cast(func.nullif(EpgChannelProgrammes.stop_timestamp, ""), BigInteger)
+    return EpgChannelProgrammes.stop_ts
 
 
 def _preferred_epg_row_sort_key(row):
@@ -351,6 +369,40 @@ def _clear_epg_health(config, epg_id):
     _write_epg_health_map(config, epg_map)
 
 
+# Generation key bumped whenever online metadata enrichment rewrites programme rows.
+EPG_GENERATION_ONLINE_METADATA_KEY = "online_metadata"
+
+
+def _epg_generation_state_path(config):
+    return os.path.join(config.config_path, "cache", "epg_generations.json")
+
+
+def read_epg_generations(config):
+    try:
+        path = _epg_generation_state_path(config)
+        if not os.path.exists(path):
+            return {}
+        with open(path, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+        if isinstance(payload, dict) and isinstance(payload.get("generations"), dict):
+            return payload["generations"]
+    except Exception:
+        pass
+    return {}
+
+
+def bump_epg_generation(config, key):
+    """Record that the stored programme data behind ``key`` (an EPG id or metadata key) has changed."""
+    generations = read_epg_generations(config)
+    generations[str(key)] = f"{time.time_ns():x}"
+    path = _epg_generation_state_path(config)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"generations": generations}, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
 async def read_config_all_epgs(output_for_export=False, config=None):
     return_list = []
     epg_health_map = _read_epg_health_map(config) if config else {}
@@ -510,7 +562,15 @@ async def delete_epg(config, epg_id):
             )
             # Get all channel IDs for the given EPG
             # noinspection DuplicatedCode
-            result = await session.execute(select(EpgChannels.id).where(EpgChannels.epg_id == epg_id))
+            result = await session.execute(
+                select(EpgChannels.id).where(
+                    or_(
+                        EpgChannels.epg_id == epg_id,
+                        EpgChannels.staging_epg_id == epg_id,
+                        EpgChannels.retired_epg_id == epg_id,
+                    )
+                )
+            )
             channel_ids = [row[0] for row in result.fetchall()]
             if channel_ids:
                 # Delete all EpgChannelProgrammes where epg_channel_id is in the list of channel IDs
@@ -531,6 +591,7 @@ async def delete_epg(config, epg_id):
         if os.path.isfile(f):
             os.remove(f)
     _clear_epg_health(config, epg_id)
+    bump_epg_generation(config, epg_id)
 
 
 def _resolve_user_agent(settings, user_agent):
@@ -612,6 +673,10 @@ async def _run_file_epg_source(url, output):
 
 
 async def download_xmltv_epg(settings, url, output, user_agent=None):
+    """
+    Fetch an XMLTV source into ``output``. HTTP sources are requested conditionally against
+    the cached copy; returns False when the upstream reported it unchanged, otherwise True.
+    """
     if not os.path.exists(os.path.dirname(output)):
         os.makedirs(os.path.dirname(output))
 
@@ -620,13 +685,24 @@ async def download_xmltv_epg(settings, url, output, user_agent=None):
     else:
         logger.info("Downloading EPG from url - '%s'", url)
         headers = {"User-Agent": _resolve_user_agent(settings, user_agent)}
+        headers.update(conditional_request_headers(output, url))
+        part_file = f"{output}.part"
         async with aiohttp.ClientSession() as session:
             async with session.get(url, headers=headers) as response:
+                if response.status == 304:
+                    logger.info("EPG at url '%s' is unchanged since the last download.", url)
+                    return False
                 response.raise_for_status()
-                async with aiofiles.open(output, "wb") as f:
+                async with aiofiles.open(part_file, "wb") as f:
                     async for chunk in response.content.iter_chunked(8192):
                         await f.write(chunk)
+                validators = response_validators(url, response.headers)
+        await try_unzip(part_file)
+        os.replace(part_file, output)
+        await asyncio.to_thread(write_fetch_state, output, validators)
+        return True
     await try_unzip(output)
+    return True
 
 
 async def try_unzip(output: str) -> None:
@@ -718,30 +794,59 @@ def _shift_xmltv_window(start_value, stop_value, start_ts, stop_ts, offset_minut
     return shifted_start_value, shifted_stop_value, shifted_start_ts, shifted_stop_ts
 
 
-def _clear_epg_channel_data_sync(epg_id):
+# Owner columns an EPG's channel rows can be attached to (see EpgChannels.epg_id).
+_EPG_CHANNEL_OWNER_COLUMNS = ("epg_id", "staging_epg_id", "retired_epg_id")
+
+
+def _clear_epg_channel_data_sync(epg_id, session=None, owner_column="epg_id"):
+    if owner_column not in _EPG_CHANNEL_OWNER_COLUMNS:
+        raise ValueError(f"Unknown EPG channel owner column '{owner_column}'")
+    session = session or db.session
+    owner = getattr(EpgChannels, owner_column)
     try:
-        db.session.execute(
+        session.execute(
             text(
-                """
+                f"""
                 DELETE FROM epg_channel_programmes AS p
                 USING epg_channels AS c
                 WHERE p.epg_channel_id = c.id
-                  AND c.epg_id = :epg_id
+                  AND c.{owner_column} = :epg_id
                 """
             ),
             {"epg_id": epg_id},
         )
-        db.session.execute(delete(EpgChannels).where(EpgChannels.epg_id == epg_id))
-        db.session.commit()
+        session.execute(delete(EpgChannels).where(owner == epg_id))
+        session.commit()
     except Exception:
         # Fallback for non-Postgres engines used in local tooling/tests.
-        db.session.rollback()
-        channel_ids_subquery = select(EpgChannels.id).where(EpgChannels.epg_id == epg_id)
-        db.session.execute(
+        session.rollback()
+        channel_ids_subquery = select(EpgChannels.id).where(owner == epg_id)
+        session.execute(
             delete(EpgChannelProgrammes).where(EpgChannelProgrammes.epg_channel_id.in_(channel_ids_subquery))
         )
-        db.session.execute(delete(EpgChannels).where(EpgChannels.epg_id == epg_id))
-        db.session.commit()
+        session.execute(delete(EpgChannels).where(owner == epg_id))
+        session.commit()
+
+
+def _activate_staged_epg_channel_data_sync(epg_id, session=None):
+    """
+    Swap a fully imported staging generation in as the live guide data in one transaction.
+    Readers only ever follow EpgChannels.epg_id, so they see either the old or the new rows.
+    """
+    session = session or db.session
+    try:
+        session.execute(
+            update(EpgChannels).where(EpgChannels.epg_id == epg_id).values(epg_id=None, retired_epg_id=epg_id)
+        )
+        session.execute(
+            update(EpgChannels)
+            .where(EpgChannels.staging_epg_id == epg_id)
+            .values(epg_id=epg_id, staging_epg_id=None)
+        )
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
 
 
 def _clean_xmltv_text(value):
@@ -1096,7 +1201,27 @@ def _parse_xmltv_rating(elem):
     return None, None
 
 
-def _import_epg_xml_sync(epg_id, xmltv_file, programme_batch_size=5000):
+def _import_epg_xml_sync(epg_id, xmltv_file, programme_batch_size=5000, session=None):
+    session = session or db.session
+    try:
+        stats = _stage_epg_xml_sync(epg_id, xmltv_file, programme_batch_size, session)
+    except Exception:
+        session.rollback()
+        _clear_epg_channel_data_sync(epg_id, session=session, owner_column="staging_epg_id")
+        raise
+    phase_seconds = stats["phase_seconds"]
+
+    t0 = time.perf_counter()
+    _activate_staged_epg_channel_data_sync(epg_id, session=session)
+    phase_seconds["activate_generation"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    _clear_epg_channel_data_sync(epg_id, session=session, owner_column="retired_epg_id")
+    phase_seconds["gc_retired_generation"] = time.perf_counter() - t0
+    return stats
+
+
+def _stage_epg_xml_sync(epg_id, xmltv_file, programme_batch_size, session):
     phase_seconds = {}
     channel_count = 0
     programme_count = 0
@@ -1106,9 +1231,11 @@ def _import_epg_xml_sync(epg_id, xmltv_file, programme_batch_size=5000):
         raise FileNotFoundError(f"No such file '{xmltv_file}'")
 
     logger.info("Importing channels for EPG #%s from path - '%s'", epg_id, xmltv_file)
+    # New rows are loaded into a staging generation that readers cannot see, then swapped in at the end.
     t0 = time.perf_counter()
-    _clear_epg_channel_data_sync(epg_id)
-    phase_seconds["clear_existing"] = time.perf_counter() - t0
+    _clear_epg_channel_data_sync(epg_id, session=session, owner_column="staging_epg_id")
+    _clear_epg_channel_data_sync(epg_id, session=session, owner_column="retired_epg_id")
+    phase_seconds["clear_stale_generations"] = time.perf_counter() - t0
 
     t_parse = time.perf_counter()
     channel_rows = []
@@ -1118,19 +1245,19 @@ def _import_epg_xml_sync(epg_id, xmltv_file, programme_batch_size=5000):
     def flush_channels():
         nonlocal channel_rows, channel_map
         if channel_rows:
-            db.session.execute(insert(EpgChannels), channel_rows)
-            db.session.commit()
+            session.execute(insert(EpgChannels), channel_rows)
+            session.commit()
             channel_rows = []
-        channel_rows_result = db.session.execute(
-            select(EpgChannels.channel_id, EpgChannels.id).where(EpgChannels.epg_id == epg_id)
+        channel_rows_result = session.execute(
+            select(EpgChannels.channel_id, EpgChannels.id).where(EpgChannels.staging_epg_id == epg_id)
         ).all()
         channel_map = dict(channel_rows_result)
 
     def flush_programmes():
         nonlocal programme_rows
         if programme_rows:
-            db.session.execute(insert(EpgChannelProgrammes), programme_rows)
-            db.session.commit()
+            session.execute(insert(EpgChannelProgrammes), programme_rows)
+            session.commit()
             programme_rows = []
 
     t_map = 0.0
@@ -1143,7 +1270,8 @@ def _import_epg_xml_sync(epg_id, xmltv_file, programme_batch_size=5000):
                 icon_node = elem.find("icon")
                 channel_rows.append(
                     {
-                        "epg_id": epg_id,
+                        "epg_id": None,
+                        "staging_epg_id": epg_id,
                         "channel_id": channel_id,
                         "name": (elem.findtext("display-name", default="") or "").strip(),
                         "icon_url": (icon_node.attrib.get("src", "") if icon_node is not None else ""),
@@ -1206,6 +1334,8 @@ def _import_epg_xml_sync(epg_id, xmltv_file, programme_batch_size=5000):
                 "stop": stop,
                 "start_timestamp": start_timestamp,
                 "stop_timestamp": stop_timestamp,
+                "start_ts": int(start_timestamp) if start_timestamp else None,
+                "stop_ts": int(stop_timestamp) if stop_timestamp else None,
                 "categories": json.dumps(categories),
                 "summary": _clean_xmltv_text(elem.findtext("summary", default=None)),
                 "keywords": keywords,
@@ -1262,8 +1392,76 @@ def _import_epg_xml_sync(epg_id, xmltv_file, programme_batch_size=5000):
     }
 
 
-async def import_epg_data(config, epg_id):
+def _import_epg_xml_in_worker_process(epg_id, xmltv_file):
+    """
+    Worker entry point for an XMLTV import (see ``backend.scripts.import_epg_xml``). There is no app
+    context in the worker, so rows are loaded through a dedicated connection of its own.
+    """
+    engine = create_engine(app_config.sqlalchemy_database_uri, poolclass=NullPool)
+    try:
+        with SyncSession(engine) as session:
+            return _import_epg_xml_sync(epg_id, xmltv_file, session=session)
+    finally:
+        engine.dispose()
+
+
+_epg_import_worker_semaphore = None
+
+
+def _epg_import_worker_limiter():
+    global _epg_import_worker_semaphore
+    if _epg_import_worker_semaphore is None:
+        _epg_import_worker_semaphore = asyncio.Semaphore(app_config.epg_import_process_workers)
+    return _epg_import_worker_semaphore
+
+
+async def _run_epg_xml_import_subprocess(epg_id, xmltv_file):
+    project_root = Path(__file__).resolve().parents[1]
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-m",
+        "backend.scripts.import_epg_xml",
+        str(epg_id),
+        str(xmltv_file),
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        cwd=str(project_root),
+    )
+
+    async def _pipe_logs(stream):
+        while True:
+            line = await stream.readline()
+            if not line:
+                break
+            logger.info("[epg-import #%s] %s", epg_id, line.decode(errors="replace").rstrip())
+
+    stdout, _ = await asyncio.gather(proc.stdout.read(), _pipe_logs(proc.stderr))
+    rc = await proc.wait()
+    if rc != 0:
+        raise RuntimeError(f"EPG import subprocess for EPG #{epg_id} failed with code {rc}")
+    # The worker prints its stats as the last stdout line.
+    lines = stdout.decode(errors="replace").strip().splitlines()
+    if not lines:
+        raise RuntimeError(f"EPG import subprocess for EPG #{epg_id} returned no stats")
+    return json.loads(lines[-1])
+
+
+async def _run_epg_xml_import(epg_id, xmltv_file):
+    if app_config.epg_import_process_workers <= 0:
+        return "thread", await run_sync(_import_epg_xml_sync)(epg_id, xmltv_file)
+    async with _epg_import_worker_limiter():
+        return "process", await _run_epg_xml_import_subprocess(epg_id, xmltv_file)
+
+
+async def import_epg_data(config, epg_id, force=False):
+    """Download and import an EPG. ``force`` re-imports even when the downloaded content is unchanged."""
+    async with track_source_refresh("epg", epg_id):
+        return await _import_epg_data(config, epg_id, force=force)
+
+
+async def _import_epg_data(config, epg_id, force=False):
     epg = await read_config_one_epg(epg_id, config=config)
+    describe_source_refresh(f"EPG: {epg['name']}" if epg.get("name") else None)
     settings = config.read_settings()
     # Fetch a new local cached copy of the EPG from either HTTP(S) or a local executable.
     logger.info("Fetching updated XMLTV file for EPG #%s from source - '%s'", epg_id, epg["url"])
@@ -1271,23 +1469,56 @@ async def import_epg_data(config, epg_id):
     try:
         start_time = time.time()
         xmltv_file = os.path.join(config.config_path, "cache", "epgs", f"{epg_id}.xml")
-        await download_xmltv_epg(settings, epg["url"], xmltv_file, epg.get("user_agent"))
+        async with source_refresh_stage("download", url=epg["url"]):
+            downloaded = await download_xmltv_epg(settings, epg["url"], xmltv_file, epg.get("user_agent"))
         execution_time = time.time() - start_time
+        download_seconds = execution_time
         logger.info("Updated XMLTV file for EPG #%s was cached in '%s' seconds", epg_id, int(execution_time))
+        async with source_refresh_stage("parse"):
+            unchanged, content_sha256 = await asyncio.to_thread(source_unchanged_since_import, xmltv_file)
+        # Only scheduled refreshes skip unchanged content; a manual update always re-imports.
+        if unchanged and not force:
+            logger.info(
+                "XMLTV content for EPG #%s is unchanged since the last import (not_modified=%s). Skipping import.",
+                epg_id,
+                not downloaded,
+            )
+            _set_epg_health(
+                config,
+                epg_id,
+                {
+                    "status": "ok",
+                    "error": None,
+                    "http_status": None,
+                    "last_attempt_at": attempt_ts,
+                    "last_success_at": int(time.time()),
+                    "source_url": epg.get("url"),
+                    "content_unchanged": True,
+                },
+            )
+            return False
         # Read and save EPG data to DB (offloaded to worker thread)
         logger.info("Importing updated data for EPG #%s", epg_id)
         start_time = time.perf_counter()
-        stats = await run_sync(_import_epg_xml_sync)(epg_id, xmltv_file)
+        # Parsing and the staging load run together in the import worker, so the worker process limit
+        # is what the parse stage limit protects.
+        async with source_refresh_stage("parse"):
+            import_mode, stats = await _run_epg_xml_import(epg_id, xmltv_file)
         execution_time = time.perf_counter() - start_time
+        import_phase_seconds = {"download": round(download_seconds, 2)}
+        import_phase_seconds.update({k: round(v, 2) for k, v in stats["phase_seconds"].items()})
         logger.info(
-            "EPG #%s import stats channels=%s programmes=%s skipped=%s phases=%s",
+            "EPG #%s import stats mode=%s channels=%s programmes=%s skipped=%s phases=%s",
             epg_id,
+            import_mode,
             stats["channels"],
             stats["programmes"],
             stats["programmes_skipped"],
-            {k: round(v, 2) for k, v in stats["phase_seconds"].items()},
+            import_phase_seconds,
         )
         logger.info("Updated data for EPG #%s was imported in '%s' seconds", epg_id, int(execution_time))
+        bump_epg_generation(config, epg_id)
+        await asyncio.to_thread(mark_source_imported, xmltv_file, content_sha256)
         _set_epg_health(
             config,
             epg_id,
@@ -1298,8 +1529,18 @@ async def import_epg_data(config, epg_id):
                 "last_attempt_at": attempt_ts,
                 "last_success_at": int(time.time()),
                 "source_url": epg.get("url"),
+                "last_import": {
+                    "mode": import_mode,
+                    "channels": stats["channels"],
+                    "programmes": stats["programmes"],
+                    "programmes_skipped": stats["programmes_skipped"],
+                    "phase_seconds": import_phase_seconds,
+                },
+                "content_unchanged": False,
+                "refresh_stage_seconds": current_source_refresh_timings(),
             },
         )
+        return True
     except Exception as exc:
         _set_epg_health(
             config,
@@ -1319,7 +1560,7 @@ async def import_epg_data(config, epg_id):
 async def import_epg_data_for_all_epgs(config):
     epg_health_map = _read_epg_health_map(config)
     now_ts = int(time.time())
-    updated_count = 0
+    due_epg_ids = []
     skipped_not_due = 0
     skipped_disabled = 0
 
@@ -1355,16 +1596,28 @@ async def import_epg_data_for_all_epgs(config):
             )
             continue
 
-        try:
-            await import_epg_data(config, epg_id)
-            updated_count += 1
-        except Exception as e:
-            logger.error(f"Failed to import EPG data for EPG ID {epg_id}, continuing to next. Error: {e}")
+        due_epg_ids.append(epg_id)
+
+    # Refresh due sources concurrently. Each refresh is further bounded per stage and per upstream host.
+    semaphore = source_refresh_concurrency_limiter()
+
+    async def import_one(epg_id):
+        async with semaphore:
+            try:
+                return await import_epg_data(config, epg_id)
+            except Exception as e:
+                logger.error(f"Failed to import EPG data for EPG ID {epg_id}, continuing to next. Error: {e}")
+                return None
+
+    results = await asyncio.gather(*(import_one(epg_id) for epg_id in due_epg_ids))
+    updated_count = sum(1 for imported in results if imported)
+    skipped_unchanged = sum(1 for imported in results if imported is False)
 
     logger.info(
-        "EPG update check complete updated=%s skipped_not_due=%s skipped_off=%s",
+        "EPG update check complete updated=%s skipped_not_due=%s skipped_unchanged=%s skipped_off=%s",
         updated_count,
         skipped_not_due,
+        skipped_unchanged,
         skipped_disabled,
     )
     return updated_count
@@ -1399,8 +1652,8 @@ async def read_epg_review_channels(epg_id, search_query="", has_data="any", limi
 
     search_query = (search_query or "").strip()
     search_like = f"%{search_query.lower()}%"
-    start_ts_expr = cast(func.nullif(EpgChannelProgrammes.start_timestamp, ""), BigInteger)
-    stop_ts_expr = cast(func.nullif(EpgChannelProgrammes.stop_timestamp, ""), BigInteger)
+    start_ts_expr = EpgChannelProgrammes.start_ts
+    stop_ts_expr = EpgChannelProgrammes.stop_ts
 
     future_programme_exists = (
         select(EpgChannelProgrammes.id)
@@ -1650,7 +1903,150 @@ async def read_epg_online_metadata_no_matches(search_query="", limit=100, offset
 XMLTV_HOST_PLACEHOLDER = "__TIC_HOST__"
 
 
-def _append_dummy_programmes_to_xml(output_root, channel_info, now_ts):
+# Rows fetched per round-trip while streaming a channel's programmes into the custom EPG.
+CUSTOM_EPG_PROGRAMME_FETCH_SIZE = 2000
+
+_CUSTOM_EPG_PROGRAMME_COLUMNS = (
+    EpgChannelProgrammes.start,
+    EpgChannelProgrammes.stop,
+    EpgChannelProgrammes.start_timestamp,
+    EpgChannelProgrammes.stop_timestamp,
+    EpgChannelProgrammes.title,
+    EpgChannelProgrammes.sub_title,
+    EpgChannelProgrammes.desc,
+    EpgChannelProgrammes.series_desc,
+    EpgChannelProgrammes.country,
+    EpgChannelProgrammes.icon_url,
+    EpgChannelProgrammes.categories,
+    EpgChannelProgrammes.summary,
+    EpgChannelProgrammes.keywords,
+    EpgChannelProgrammes.credits_json,
+    EpgChannelProgrammes.video_colour,
+    EpgChannelProgrammes.video_aspect,
+    EpgChannelProgrammes.video_quality,
+    EpgChannelProgrammes.subtitles_type,
+    EpgChannelProgrammes.audio_described,
+    EpgChannelProgrammes.previously_shown_date,
+    EpgChannelProgrammes.premiere,
+    EpgChannelProgrammes.is_new,
+    EpgChannelProgrammes.epnum_onscreen,
+    EpgChannelProgrammes.epnum_xmltv_ns,
+    EpgChannelProgrammes.epnum_dd_progid,
+    EpgChannelProgrammes.star_rating,
+    EpgChannelProgrammes.production_year,
+    EpgChannelProgrammes.rating_system,
+    EpgChannelProgrammes.rating_value,
+)
+
+
+# Bump when the programme XML produced by build_custom_epg changes so cached fragments are re-rendered.
+CUSTOM_EPG_FRAGMENT_VERSION = 1
+
+
+def _custom_epg_fragment_dir(config):
+    return os.path.join(config.config_path, "cache", "epg_fragments")
+
+
+def _custom_epg_fragment_key(channel_info, epg_channel_row_ids, generations):
+    guide_id, guide_channel_id = channel_info["source_key"]
+    payload = [
+        CUSTOM_EPG_FRAGMENT_VERSION,
+        channel_info["channel_id"],
+        list(channel_info["tags"]),
+        int(channel_info.get("guide_offset_minutes") or 0),
+        guide_id,
+        guide_channel_id,
+        sorted(epg_channel_row_ids),
+        generations.get(str(guide_id)),
+        generations.get(EPG_GENERATION_ONLINE_METADATA_KEY),
+    ]
+    return hashlib.sha256(json.dumps(payload, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+
+def _store_custom_epg_fragment(path, text):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def _prune_custom_epg_fragments(fragment_dir, keep_paths):
+    removed = 0
+    if not os.path.isdir(fragment_dir):
+        return removed
+    for name in os.listdir(fragment_dir):
+        path = os.path.join(fragment_dir, name)
+        if path in keep_paths:
+            continue
+        try:
+            os.remove(path)
+            removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+def serialise_xml_elements(elements):
+    return "".join(ET.tostring(element, encoding="unicode") for element in elements)
+
+
+class XmltvStreamWriter:
+    """
+    Incrementally writes an XMLTV document to a temp file next to the target and
+    atomically swaps it into place on commit, so readers never see a partial guide.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.tmp_path = f"{path}.tmp"
+        self._file = None
+
+    def open(self):
+        self._file = open(self.tmp_path, "w", encoding="utf-8")
+        self._file.write(
+            "<?xml version='1.0' encoding='UTF-8'?>\n"
+            '<tv generator-info-name="Headendarr" source-info-name="Headendarr - v0.1">'
+        )
+
+    def write_text(self, text):
+        self._file.write(text)
+
+    def write_elements(self, elements):
+        self.write_text(serialise_xml_elements(elements))
+
+    def append_file(self, path):
+        with open(path, "r", encoding="utf-8") as source_file:
+            shutil.copyfileobj(source_file, self._file, XMLTV_RENDER_CHUNK_CHARS)
+
+    def commit(self):
+        self._file.write("</tv>")
+        self._file.close()
+        self._file = None
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+
+def _build_xmltv_channel_element(channel_info):
+    channel = ET.Element("channel")
+    channel.set("id", str(channel_info["channel_id"]))
+    display_name = ET.SubElement(channel, "display-name")
+    display_name.text = channel_info["display_name"].strip()
+    icon = ET.SubElement(channel, "icon")
+    icon.set("src", channel_info["logo_url"])
+    live = ET.SubElement(channel, "live")
+    live.text = "true"
+    active = ET.SubElement(channel, "active")
+    active.text = "true"
+    return channel
+
+
+def _build_dummy_programme_elements(channel_info, now_ts):
     interval_minutes = sanitise_dummy_epg_interval(
         channel_info.get("dummy_interval_minutes"),
     )
@@ -1664,8 +2060,9 @@ def _append_dummy_programmes_to_xml(output_root, channel_info, now_ts):
         interval_minutes=interval_minutes,
         offset_minutes=channel_info.get("guide_offset_minutes") or 0,
     )
+    elements = []
     for dummy_programme in dummy_programmes:
-        output_programme = ET.SubElement(output_root, "programme")
+        output_programme = ET.Element("programme")
         output_programme.set("start", xmltv_datetime_from_timestamp(dummy_programme["start_ts"]) or "")
         output_programme.set("stop", xmltv_datetime_from_timestamp(dummy_programme["stop_ts"]) or "")
         output_programme.set("start_timestamp", str(dummy_programme["start_ts"]))
@@ -1679,15 +2076,421 @@ def _append_dummy_programmes_to_xml(output_root, channel_info, now_ts):
         desc_el = ET.SubElement(output_programme, "desc")
         desc_el.text = dummy_programme["desc"]
         desc_el.set("lang", "en")
+        elements.append(output_programme)
+    return elements
+
+
+def _build_vod_programme_element(channel_id, programme):
+    output_programme = ET.Element("programme")
+    output_programme.set("start", xmltv_datetime_from_timestamp(int(programme["start_ts"])) or "")
+    output_programme.set("stop", xmltv_datetime_from_timestamp(int(programme["stop_ts"])) or "")
+    output_programme.set("start_timestamp", str(int(programme["start_ts"])))
+    output_programme.set("stop_timestamp", str(int(programme["stop_ts"])))
+    output_programme.set("channel", str(channel_id))
+    title_el = ET.SubElement(output_programme, "title")
+    title_el.text = programme["title"]
+    title_el.set("lang", "en")
+    if programme.get("sub_title"):
+        sub_title_el = ET.SubElement(output_programme, "sub-title")
+        sub_title_el.text = programme["sub_title"]
+        sub_title_el.set("lang", "en")
+    if programme.get("desc"):
+        desc_el = ET.SubElement(output_programme, "desc")
+        desc_el.text = programme["desc"]
+        desc_el.set("lang", "en")
+    if programme.get("icon_url"):
+        icon_el = ET.SubElement(output_programme, "icon")
+        icon_el.set("src", programme["icon_url"])
+    if programme.get("epnum_onscreen"):
+        epnum_el = ET.SubElement(output_programme, "episode-num")
+        epnum_el.set("system", "onscreen")
+        epnum_el.text = programme["epnum_onscreen"]
+    for category in programme.get("categories") or []:
+        category_el = ET.SubElement(output_programme, "category")
+        category_el.text = category
+        category_el.set("lang", "en")
+    return output_programme
+
+
+def _custom_epg_programme_data(row):
+    return {
+        "start": row["start"],
+        "stop": row["stop"],
+        "start_timestamp": row["start_timestamp"],
+        "stop_timestamp": row["stop_timestamp"],
+        "title": row["title"],
+        "sub-title": row["sub_title"],
+        "desc": row["desc"],
+        "series-desc": row["series_desc"],
+        "country": row["country"],
+        "icon_url": row["icon_url"],
+        "categories": json.loads(row["categories"] or "[]"),
+        "summary": row["summary"],
+        "keywords": row["keywords"],
+        "credits_json": row["credits_json"],
+        "video_colour": row["video_colour"],
+        "video_aspect": row["video_aspect"],
+        "video_quality": row["video_quality"],
+        "subtitles_type": row["subtitles_type"],
+        "audio_described": row["audio_described"],
+        "previously_shown_date": row["previously_shown_date"],
+        "premiere": row["premiere"],
+        "is_new": row["is_new"],
+        "epnum_onscreen": row["epnum_onscreen"],
+        "epnum_xmltv_ns": row["epnum_xmltv_ns"],
+        "epnum_dd_progid": row["epnum_dd_progid"],
+        "star_rating": row["star_rating"],
+        "production_year": row["production_year"],
+        "rating_system": row["rating_system"],
+        "rating_value": row["rating_value"],
+    }
 
 
-def render_xmltv_payload(config, base_url: str) -> str:
-    file_path = os.path.join(config.config_path, "epg.xml")
-    with open(file_path, "r", encoding="utf-8") as epg_file:
-        payload = epg_file.read()
-    if base_url and XMLTV_HOST_PLACEHOLDER in payload:
-        payload = payload.replace(XMLTV_HOST_PLACEHOLDER, base_url.rstrip("/"))
-    return payload
+def _build_guide_programme_element(channel_id, epg_channel_programme, channel_tags, guide_offset_minutes):
+    # Create a <programme> element for the output file and copy the attributes from the input programme
+    output_programme = ET.Element("programme")
+    # Build programmes from DB data (manually create attributes etc.
+    start_value, start_ts = _parse_xmltv_time(
+        epg_channel_programme.get("start"),
+        epg_channel_programme.get("start_timestamp"),
+    )
+    stop_value, stop_ts = _parse_xmltv_time(
+        epg_channel_programme.get("stop"),
+        epg_channel_programme.get("stop_timestamp"),
+    )
+    start_value, stop_value, start_ts, stop_ts = _shift_xmltv_window(
+        start_value,
+        stop_value,
+        start_ts,
+        stop_ts,
+        guide_offset_minutes,
+    )
+    if start_value:
+        output_programme.set("start", start_value)
+    if stop_value:
+        output_programme.set("stop", stop_value)
+    if start_ts:
+        output_programme.set("start_timestamp", start_ts)
+    if stop_ts:
+        output_programme.set("stop_timestamp", stop_ts)
+    # Set the "channel" ident here
+    output_programme.set("channel", str(channel_id))
+    # Loop through all child elements of the input programme and copy them to the output programme
+    for child in ["title", "sub-title", "desc", "series-desc", "country"]:
+        # Copy all other child elements to the output programme if they exist
+        if child in epg_channel_programme and epg_channel_programme[child] is not None:
+            output_child = ET.SubElement(output_programme, child)
+            output_child.text = epg_channel_programme[child]
+            output_child.set("lang", "en")
+    # Optional summary
+    if epg_channel_programme.get("summary"):
+        c = ET.SubElement(output_programme, "summary")
+        c.text = epg_channel_programme["summary"]
+        c.set("lang", "en")
+    # If we have a programme icon, add it
+    if epg_channel_programme["icon_url"]:
+        output_child = ET.SubElement(output_programme, "icon")
+        output_child.set("src", epg_channel_programme["icon_url"])
+        output_child.set("height", "")
+        output_child.set("width", "")
+    # Keywords
+    if epg_channel_programme.get("keywords"):
+        try:
+            for kw in json.loads(epg_channel_programme["keywords"]):
+                if kw:
+                    kc = ET.SubElement(output_programme, "keyword")
+                    kc.text = kw
+                    kc.set("lang", "en")
+        except Exception:
+            pass
+    # Credits
+    if epg_channel_programme.get("credits_json"):
+        try:
+            credits_data = json.loads(epg_channel_programme["credits_json"])
+            if isinstance(credits_data, dict) and credits_data:
+                credits_el = ET.SubElement(output_programme, "credits")
+                for role, people in credits_data.items():
+                    if not people:
+                        continue
+                    for person in people:
+                        pe = ET.SubElement(credits_el, role)
+                        pe.text = person
+        except Exception:
+            pass
+    # Video
+    if any(epg_channel_programme.get(k) for k in ["video_colour", "video_aspect", "video_quality"]):
+        video_el = ET.SubElement(output_programme, "video")
+        if epg_channel_programme.get("video_colour"):
+            c = ET.SubElement(video_el, "colour")
+            c.text = epg_channel_programme["video_colour"]
+        if epg_channel_programme.get("video_aspect"):
+            a = ET.SubElement(video_el, "aspect")
+            a.text = epg_channel_programme["video_aspect"]
+        if epg_channel_programme.get("video_quality"):
+            q = ET.SubElement(video_el, "quality")
+            q.text = epg_channel_programme["video_quality"]
+    # Subtitles
+    if epg_channel_programme.get("subtitles_type"):
+        subs = ET.SubElement(output_programme, "subtitles")
+        subs.set("type", epg_channel_programme["subtitles_type"])
+    # Audio described
+    if epg_channel_programme.get("audio_described"):
+        ET.SubElement(output_programme, "audio-described")
+    # Previously shown
+    if epg_channel_programme.get("previously_shown_date"):
+        ps = ET.SubElement(output_programme, "previously-shown")
+        ps.set("start", epg_channel_programme["previously_shown_date"])
+    # Premiere / New
+    if epg_channel_programme.get("premiere"):
+        ET.SubElement(output_programme, "premiere")
+    if epg_channel_programme.get("is_new"):
+        ET.SubElement(output_programme, "new")
+    # Episode numbers
+    if epg_channel_programme.get("epnum_onscreen"):
+        e1 = ET.SubElement(output_programme, "episode-num")
+        e1.set("system", "onscreen")
+        e1.text = epg_channel_programme["epnum_onscreen"]
+    if epg_channel_programme.get("epnum_xmltv_ns"):
+        e2 = ET.SubElement(output_programme, "episode-num")
+        e2.set("system", "xmltv_ns")
+        e2.text = epg_channel_programme["epnum_xmltv_ns"]
+    if epg_channel_programme.get("epnum_dd_progid"):
+        e3 = ET.SubElement(output_programme, "episode-num")
+        e3.set("system", "dd_progid")
+        e3.text = epg_channel_programme["epnum_dd_progid"]
+    # Star rating
+    if epg_channel_programme.get("star_rating"):
+        sr = ET.SubElement(output_programme, "star-rating")
+        val = ET.SubElement(sr, "value")
+        val.text = epg_channel_programme["star_rating"]
+    # Production year
+    if epg_channel_programme.get("production_year"):
+        d = ET.SubElement(output_programme, "date")
+        d.text = epg_channel_programme["production_year"]
+    # Rating system
+    if epg_channel_programme.get("rating_value"):
+        rating_el = ET.SubElement(output_programme, "rating")
+        if epg_channel_programme.get("rating_system"):
+            rating_el.set("system", epg_channel_programme["rating_system"])
+        rv = ET.SubElement(rating_el, "value")
+        rv.text = epg_channel_programme["rating_value"]
+    # Loop through all categories for this programme and add them as "category" child elements
+    if epg_channel_programme["categories"]:
+        for category in epg_channel_programme["categories"]:
+            output_child = ET.SubElement(output_programme, "category")
+            output_child.text = category
+            output_child.set("lang", "en")
+    # Loop through all tags for this channel and add them as "category" child elements
+    for tag in channel_tags:
+        output_child = ET.SubElement(output_programme, "category")
+        output_child.text = tag
+        output_child.set("lang", "en")
+    return output_programme
+
+
+XMLTV_RENDER_CHUNK_CHARS = 1024 * 1024
+XMLTV_RENDER_MAX_VARIANTS = 16
+_xmltv_render_tasks = {}
+
+
+def _custom_epg_path(config):
+    return os.path.join(config.config_path, "epg.xml")
+
+
+def _xmltv_render_dir(config):
+    return os.path.join(config.config_path, "cache", "epg_rendered")
+
+
+def _xmltv_render_variants_path(config):
+    return os.path.join(_xmltv_render_dir(config), "variants.json")
+
+
+@lru_cache(maxsize=1)
+def _unicode_format_char_table():
+    return {
+        codepoint: None
+        for codepoint in range(sys.maxunicode + 1)
+        if unicodedata.category(chr(codepoint)) == "Cf"
+    }
+
+
+def strip_unicode_format_chars(value: str) -> str:
+    return str(value or "").translate(_unicode_format_char_table())
+
+
+def _xmltv_source_signature(source_path):
+    source_stat = os.stat(source_path)
+    return f"{source_stat.st_mtime_ns:x}-{source_stat.st_size:x}", source_stat.st_mtime
+
+
+def _xmltv_variant_key(base_url, sanitise_unicode):
+    raw = f"{str(base_url or '').rstrip('/')}|{'sanitised' if sanitise_unicode else 'raw'}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def _xmltv_partial_placeholder_suffix(text):
+    for size in range(min(len(text), len(XMLTV_HOST_PLACEHOLDER) - 1), 0, -1):
+        if text.endswith(XMLTV_HOST_PLACEHOLDER[:size]):
+            return size
+    return 0
+
+
+def _render_xmltv_variant_sync(source_path, xml_path, gz_path, base_url, sanitise_unicode):
+    """Stream epg.xml into a host-substituted variant plus a gzip copy without loading it whole."""
+    replacement = str(base_url or "").rstrip("/")
+    render_dir = os.path.dirname(xml_path)
+    tmp_paths = []
+    try:
+        # Unique temp names, so a render can never write into another render's partial output.
+        for target_path in (xml_path, gz_path):
+            fd, tmp_path = tempfile.mkstemp(dir=render_dir, prefix=f"{os.path.basename(target_path)}.", suffix=".tmp")
+            os.close(fd)
+            os.chmod(tmp_path, 0o644)
+            tmp_paths.append(tmp_path)
+        xml_tmp, gz_tmp = tmp_paths
+        with (
+            open(source_path, "r", encoding="utf-8") as source_file,
+            open(xml_tmp, "w", encoding="utf-8") as xml_file,
+            gzip.open(gz_tmp, "wt", encoding="utf-8", compresslevel=6) as gz_file,
+        ):
+            carry = ""
+            while True:
+                chunk = source_file.read(XMLTV_RENDER_CHUNK_CHARS)
+                if not chunk:
+                    break
+                text = carry + chunk
+                if replacement:
+                    text = text.replace(XMLTV_HOST_PLACEHOLDER, replacement)
+                # Hold back a possible placeholder split across chunk boundaries.
+                hold = _xmltv_partial_placeholder_suffix(text) if replacement else 0
+                carry = text[len(text) - hold :] if hold else ""
+                text = text[: len(text) - hold] if hold else text
+                if sanitise_unicode:
+                    text = strip_unicode_format_chars(text)
+                xml_file.write(text)
+                gz_file.write(text)
+            if carry:
+                if sanitise_unicode:
+                    carry = strip_unicode_format_chars(carry)
+                xml_file.write(carry)
+                gz_file.write(carry)
+        os.replace(xml_tmp, xml_path)
+        os.replace(gz_tmp, gz_path)
+    finally:
+        for tmp_path in tmp_paths:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+def _read_xmltv_render_variants(config):
+    try:
+        with open(_xmltv_render_variants_path(config), "r", encoding="utf-8") as f:
+            payload = json.load(f)
+        if isinstance(payload, dict) and isinstance(payload.get("variants"), dict):
+            return payload["variants"]
+    except Exception:
+        pass
+    return {}
+
+
+def _remember_xmltv_render_variant(config, variant_key, base_url, sanitise_unicode):
+    variants = _read_xmltv_render_variants(config)
+    variants[variant_key] = {
+        "base_url": str(base_url or ""),
+        "sanitise_unicode": bool(sanitise_unicode),
+        "last_used": int(time.time()),
+    }
+    if len(variants) > XMLTV_RENDER_MAX_VARIANTS:
+        ordered = sorted(variants.items(), key=lambda item: int(item[1].get("last_used") or 0), reverse=True)
+        variants = dict(ordered[:XMLTV_RENDER_MAX_VARIANTS])
+    path = _xmltv_render_variants_path(config)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"variants": variants}, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _prune_xmltv_render_dir(config, signature):
+    render_dir = _xmltv_render_dir(config)
+    if not os.path.isdir(render_dir):
+        return
+    keep_keys = set(_read_xmltv_render_variants(config).keys())
+    for name in os.listdir(render_dir):
+        if not (name.endswith(".xml") or name.endswith(".xml.gz")):
+            continue
+        file_signature, _, rest = name.partition("_")
+        variant_key = rest.split(".", 1)[0]
+        if file_signature == signature and variant_key in keep_keys:
+            continue
+        try:
+            os.remove(os.path.join(render_dir, name))
+        except OSError:
+            pass
+
+
+async def _render_xmltv_variant(config, source_path, xml_path, gz_path, variant_key, base_url, sanitise_unicode):
+    try:
+        if not (os.path.exists(xml_path) and os.path.exists(gz_path)):
+            os.makedirs(os.path.dirname(xml_path), exist_ok=True)
+            await asyncio.to_thread(
+                _render_xmltv_variant_sync,
+                source_path,
+                xml_path,
+                gz_path,
+                base_url,
+                sanitise_unicode,
+            )
+            await asyncio.to_thread(_remember_xmltv_render_variant, config, variant_key, base_url, sanitise_unicode)
+    finally:
+        _xmltv_render_tasks.pop(xml_path, None)
+
+
+async def ensure_xmltv_variant(config, base_url: str, sanitise_unicode: bool = False) -> dict:
+    """
+    Return the pre-rendered XMLTV files for a base URL and unicode mode, rendering
+    them from epg.xml first if this variant has not been produced for the current build.
+    """
+    source_path = _custom_epg_path(config)
+    signature, source_mtime = _xmltv_source_signature(source_path)
+    variant_key = _xmltv_variant_key(base_url, sanitise_unicode)
+    render_dir = _xmltv_render_dir(config)
+    xml_path = os.path.join(render_dir, f"{signature}_{variant_key}.xml")
+    gz_path = f"{xml_path}.gz"
+    if not (os.path.exists(xml_path) and os.path.exists(gz_path)):
+        # One render per variant; concurrent requests join it. The shield keeps a disconnecting client
+        # from abandoning the render, which only unregisters itself once the files are in place.
+        task = _xmltv_render_tasks.get(xml_path)
+        if task is None:
+            task = asyncio.create_task(
+                _render_xmltv_variant(config, source_path, xml_path, gz_path, variant_key, base_url, sanitise_unicode)
+            )
+            _xmltv_render_tasks[xml_path] = task
+        await asyncio.shield(task)
+    return {
+        "xml_path": xml_path,
+        "gz_path": gz_path,
+        "etag": f'"{signature}-{variant_key}"',
+        "last_modified": datetime.fromtimestamp(source_mtime, tz=timezone.utc),
+    }
+
+
+async def prerender_xmltv_variants(config):
+    """Render every recently requested XMLTV variant for the freshly built epg.xml."""
+    source_path = _custom_epg_path(config)
+    if not os.path.exists(source_path):
+        return
+    signature, _ = _xmltv_source_signature(source_path)
+    for variant in list(_read_xmltv_render_variants(config).values()):
+        try:
+            await ensure_xmltv_variant(
+                config,
+                variant.get("base_url") or "",
+                sanitise_unicode=bool(variant.get("sanitise_unicode")),
+            )
+        except Exception as exc:
+            logger.warning("Failed to pre-render XMLTV variant for base_url=%s: %s", variant.get("base_url"), exc)
+    await asyncio.to_thread(_prune_xmltv_render_dir, config, signature)
 
 
 async def build_custom_epg_subprocess(config):
@@ -1721,20 +2524,16 @@ async def build_custom_epg(config, throttle=False):
     loop = asyncio.get_running_loop()
     logger.info("Generating custom EPG for TVH based on configured channels.")
     total_start = time.perf_counter()
-    phase_seconds = {}
+    phase_seconds = defaultdict(float)
     now_ts = int(datetime.now(tz=timezone.utc).timestamp())
 
     async def maybe_yield():
         if throttle:
             await asyncio.sleep(0.001)
 
-    output_root = ET.Element("tv")
-    output_root.set("generator-info-name", "Headendarr")
-    output_root.set("source-info-name", "Headendarr - v0.1")
-
     t0 = time.perf_counter()
     configured_channels = []
-    source_key_to_output_channels = defaultdict(list)
+    source_keys = set()
     logger.info("   - Loading configured channels and guide mappings.")
     async with Session() as session:
         query = await session.execute(select(Channel).options(joinedload(Channel.tags)).order_by(Channel.number.asc()))
@@ -1765,275 +2564,130 @@ async def build_custom_epg(config, throttle=False):
             }
         )
         if result.guide_id and result.guide_channel_id:
-            source_key_to_output_channels[(result.guide_id, result.guide_channel_id)].append(channel_id)
+            source_keys.add((result.guide_id, result.guide_channel_id))
         await maybe_yield()
+    del channel_rows
     phase_seconds["load_configured_channels"] = time.perf_counter() - t0
 
     t0 = time.perf_counter()
-    programmes_by_output_channel = defaultdict(list)
-    if source_key_to_output_channels:
-        guide_ids = {key[0] for key in source_key_to_output_channels}
-        guide_channel_ids = {key[1] for key in source_key_to_output_channels}
-        logger.info("   - Loading programme rows for mapped guide channels.")
+    epg_channel_ids_by_source_key = defaultdict(list)
+    if source_keys:
+        logger.info("   - Resolving mapped guide channels.")
         async with Session() as session:
             query = await session.execute(
-                select(EpgChannelProgrammes, EpgChannels.epg_id, EpgChannels.channel_id)
-                .join(EpgChannels, EpgChannelProgrammes.epg_channel_id == EpgChannels.id)
-                .where(
-                    EpgChannels.epg_id.in_(guide_ids),
-                    EpgChannels.channel_id.in_(guide_channel_ids),
-                )
-                .order_by(
-                    EpgChannels.epg_id.asc(),
-                    EpgChannels.channel_id.asc(),
-                    EpgChannelProgrammes.start.asc(),
+                select(EpgChannels.id, EpgChannels.epg_id, EpgChannels.channel_id).where(
+                    EpgChannels.epg_id.in_({key[0] for key in source_keys}),
+                    EpgChannels.channel_id.in_({key[1] for key in source_keys}),
                 )
             )
-            rows = query.all()
-        for programme, guide_id, guide_channel_id in rows:
-            output_channels = source_key_to_output_channels.get((guide_id, guide_channel_id))
-            if not output_channels:
-                continue
-            programme_data = {
-                "start": programme.start,
-                "stop": programme.stop,
-                "start_timestamp": programme.start_timestamp,
-                "stop_timestamp": programme.stop_timestamp,
-                "title": programme.title,
-                "sub-title": programme.sub_title,
-                "desc": programme.desc,
-                "series-desc": programme.series_desc,
-                "country": programme.country,
-                "icon_url": programme.icon_url,
-                "categories": json.loads(programme.categories or "[]"),
-                "summary": programme.summary,
-                "keywords": programme.keywords,
-                "credits_json": programme.credits_json,
-                "video_colour": programme.video_colour,
-                "video_aspect": programme.video_aspect,
-                "video_quality": programme.video_quality,
-                "subtitles_type": programme.subtitles_type,
-                "audio_described": programme.audio_described,
-                "previously_shown_date": programme.previously_shown_date,
-                "premiere": programme.premiere,
-                "is_new": programme.is_new,
-                "epnum_onscreen": programme.epnum_onscreen,
-                "epnum_xmltv_ns": programme.epnum_xmltv_ns,
-                "epnum_dd_progid": programme.epnum_dd_progid,
-                "star_rating": programme.star_rating,
-                "production_year": programme.production_year,
-                "rating_system": programme.rating_system,
-                "rating_value": programme.rating_value,
-            }
-            for output_channel_id in output_channels:
-                programmes_by_output_channel[output_channel_id].append(programme_data.copy())
-    phase_seconds["load_programmes"] = time.perf_counter() - t0
-
-    t0 = time.perf_counter()
-    logger.info("   - Generating XML channel info.")
-    for channel_info in configured_channels:
-        channel = ET.SubElement(output_root, "channel")
-        channel.set("id", str(channel_info["channel_id"]))
-        display_name = ET.SubElement(channel, "display-name")
-        display_name.text = channel_info["display_name"].strip()
-        icon = ET.SubElement(channel, "icon")
-        icon.set("src", channel_info["logo_url"])
-        live = ET.SubElement(channel, "live")
-        live.text = "true"
-        active = ET.SubElement(channel, "active")
-        active.text = "true"
-        await maybe_yield()
+            for epg_channel_row_id, guide_id, guide_channel_id in query.all():
+                if (guide_id, guide_channel_id) in source_keys:
+                    epg_channel_ids_by_source_key[(guide_id, guide_channel_id)].append(epg_channel_row_id)
+    phase_seconds["resolve_guide_channels"] = time.perf_counter() - t0
+
+    custom_epg_file = _custom_epg_path(config)
+    writer = XmltvStreamWriter(custom_epg_file)
+    await loop.run_in_executor(None, writer.open)
+    try:
+        t0 = time.perf_counter()
+        logger.info("   - Writing XML channel info.")
+        channel_elements = [_build_xmltv_channel_element(channel_info) for channel_info in configured_channels]
+        await loop.run_in_executor(None, writer.write_elements, channel_elements)
+        del channel_elements
+        phase_seconds["write_channels"] = time.perf_counter() - t0
+
+        # Programmes are streamed one channel at a time so memory stays bounded by the
+        # largest single channel rather than the whole guide. Guide-mapped channels are
+        # cached as per-channel fragments and only re-rendered when their inputs change.
+        logger.info("   - Writing XML channel programme data.")
+        programme_count = 0
+        fragments_reused = 0
+        fragments_rendered = 0
+        used_fragments = set()
+        generations = read_epg_generations(config)
+        fragment_dir = _custom_epg_fragment_dir(config)
+        os.makedirs(fragment_dir, exist_ok=True)
+        async with Session() as session:
+            for channel_info in configured_channels:
+                channel_id = channel_info["channel_id"]
+                channel_tags = channel_info["tags"]
+                guide_offset_minutes = int(channel_info.get("guide_offset_minutes") or 0)
+                programme_elements = []
+                fragment_path = None
+                t0 = time.perf_counter()
+                if channel_info.get("dummy_interval_minutes"):
+                    programme_elements = _build_dummy_programme_elements(channel_info, now_ts)
+                elif is_vod_channel_type(channel_info.get("channel_type")):
+                    schedule = await build_vod_channel_schedule(config, int(channel_info["channel_row_id"]))
+                    programme_elements = [
+                        _build_vod_programme_element(channel_id, programme)
+                        for programme in build_xmltv_programmes(schedule, channel_tags)
+                    ]
+                else:
+                    epg_channel_row_ids = epg_channel_ids_by_source_key.get(channel_info["source_key"])
+                    if not epg_channel_row_ids:
+                        await maybe_yield()
+                        continue
+                    fragment_path = os.path.join(
+                        fragment_dir,
+                        f"{_custom_epg_fragment_key(channel_info, epg_channel_row_ids, generations)}.xml",
+                    )
+                    used_fragments.add(fragment_path)
+                    if os.path.exists(fragment_path):
+                        # Nothing this channel's guide output depends on has changed since the last build.
+                        fragments_reused += 1
+                        await loop.run_in_executor(None, writer.append_file, fragment_path)
+                        phase_seconds["reuse_fragments"] += time.perf_counter() - t0
+                        await maybe_yield()
+                        continue
+                    result = await session.stream(
+                        select(*_CUSTOM_EPG_PROGRAMME_COLUMNS)
+                        .where(EpgChannelProgrammes.epg_channel_id.in_(epg_channel_row_ids))
+                        .order_by(EpgChannelProgrammes.start_ts.asc(), EpgChannelProgrammes.start.asc())
+                        .execution_options(yield_per=CUSTOM_EPG_PROGRAMME_FETCH_SIZE)
+                    )
+                    async for partition in result.mappings().partitions():
+                        for row in partition:
+                            programme_elements.append(
+                                _build_guide_programme_element(
+                                    channel_id,
+                                    _custom_epg_programme_data(row),
+                                    channel_tags,
+                                    guide_offset_minutes,
+                                )
+                            )
+                phase_seconds["render_programmes"] += time.perf_counter() - t0
+                t0 = time.perf_counter()
+                programme_count += len(programme_elements)
+                programme_text = serialise_xml_elements(programme_elements)
+                del programme_elements
+                if fragment_path:
+                    fragments_rendered += 1
+                    await loop.run_in_executor(None, _store_custom_epg_fragment, fragment_path, programme_text)
+                if programme_text:
+                    await loop.run_in_executor(None, writer.write_text, programme_text)
+                phase_seconds["write_programmes"] += time.perf_counter() - t0
+                del programme_text
+                await maybe_yield()
 
-    logger.info("   - Generating XML channel programme data.")
-    for channel_info in configured_channels:
-        channel_id = channel_info["channel_id"]
-        channel_tags = channel_info["tags"]
-        guide_offset_minutes = int(channel_info.get("guide_offset_minutes") or 0)
-        if channel_info.get("dummy_interval_minutes"):
-            _append_dummy_programmes_to_xml(output_root, channel_info, now_ts)
-            await maybe_yield()
-            continue
-        if is_vod_channel_type(channel_info.get("channel_type")):
-            schedule = await build_vod_channel_schedule(config, int(channel_info["channel_row_id"]))
-            for programme in build_xmltv_programmes(schedule, channel_tags):
-                output_programme = ET.SubElement(output_root, "programme")
-                output_programme.set("start", xmltv_datetime_from_timestamp(int(programme["start_ts"])) or "")
-                output_programme.set("stop", xmltv_datetime_from_timestamp(int(programme["stop_ts"])) or "")
-                output_programme.set("start_timestamp", str(int(programme["start_ts"])))
-                output_programme.set("stop_timestamp", str(int(programme["stop_ts"])))
-                output_programme.set("channel", str(channel_id))
-                title_el = ET.SubElement(output_programme, "title")
-                title_el.text = programme["title"]
-                title_el.set("lang", "en")
-                if programme.get("sub_title"):
-                    sub_title_el = ET.SubElement(output_programme, "sub-title")
-                    sub_title_el.text = programme["sub_title"]
-                    sub_title_el.set("lang", "en")
-                if programme.get("desc"):
-                    desc_el = ET.SubElement(output_programme, "desc")
-                    desc_el.text = programme["desc"]
-                    desc_el.set("lang", "en")
-                if programme.get("icon_url"):
-                    icon_el = ET.SubElement(output_programme, "icon")
-                    icon_el.set("src", programme["icon_url"])
-                if programme.get("epnum_onscreen"):
-                    epnum_el = ET.SubElement(output_programme, "episode-num")
-                    epnum_el.set("system", "onscreen")
-                    epnum_el.text = programme["epnum_onscreen"]
-                for category in programme.get("categories") or []:
-                    category_el = ET.SubElement(output_programme, "category")
-                    category_el.text = category
-                    category_el.set("lang", "en")
-            await maybe_yield()
-            continue
-        for epg_channel_programme in programmes_by_output_channel.get(channel_id, []):
-            # Create a <programme> element for the output file and copy the attributes from the input programme
-            output_programme = ET.SubElement(output_root, "programme")
-            # Build programmes from DB data (manually create attributes etc.
-            start_value, start_ts = _parse_xmltv_time(
-                epg_channel_programme.get("start"),
-                epg_channel_programme.get("start_timestamp"),
-            )
-            stop_value, stop_ts = _parse_xmltv_time(
-                epg_channel_programme.get("stop"),
-                epg_channel_programme.get("stop_timestamp"),
-            )
-            start_value, stop_value, start_ts, stop_ts = _shift_xmltv_window(
-                start_value,
-                stop_value,
-                start_ts,
-                stop_ts,
-                guide_offset_minutes,
-            )
-            if start_value:
-                output_programme.set("start", start_value)
-            if stop_value:
-                output_programme.set("stop", stop_value)
-            if start_ts:
-                output_programme.set("start_timestamp", start_ts)
-            if stop_ts:
-                output_programme.set("stop_timestamp", stop_ts)
-            # Set the "channel" ident here
-            output_programme.set("channel", str(channel_id))
-            # Loop through all child elements of the input programme and copy them to the output programme
-            for child in ["title", "sub-title", "desc", "series-desc", "country"]:
-                # Copy all other child elements to the output programme if they exist
-                if child in epg_channel_programme and epg_channel_programme[child] is not None:
-                    output_child = ET.SubElement(output_programme, child)
-                    output_child.text = epg_channel_programme[child]
-                    output_child.set("lang", "en")
-            # Optional summary
-            if epg_channel_programme.get("summary"):
-                c = ET.SubElement(output_programme, "summary")
-                c.text = epg_channel_programme["summary"]
-                c.set("lang", "en")
-            # If we have a programme icon, add it
-            if epg_channel_programme["icon_url"]:
-                output_child = ET.SubElement(output_programme, "icon")
-                output_child.set("src", epg_channel_programme["icon_url"])
-                output_child.set("height", "")
-                output_child.set("width", "")
-            # Keywords
-            if epg_channel_programme.get("keywords"):
-                try:
-                    for kw in json.loads(epg_channel_programme["keywords"]):
-                        if kw:
-                            kc = ET.SubElement(output_programme, "keyword")
-                            kc.text = kw
-                            kc.set("lang", "en")
-                except Exception:
-                    pass
-            # Credits
-            if epg_channel_programme.get("credits_json"):
-                try:
-                    credits_data = json.loads(epg_channel_programme["credits_json"])
-                    if isinstance(credits_data, dict) and credits_data:
-                        credits_el = ET.SubElement(output_programme, "credits")
-                        for role, people in credits_data.items():
-                            if not people:
-                                continue
-                            for person in people:
-                                pe = ET.SubElement(credits_el, role)
-                                pe.text = person
-                except Exception:
-                    pass
-            # Video
-            if any(epg_channel_programme.get(k) for k in ["video_colour", "video_aspect", "video_quality"]):
-                video_el = ET.SubElement(output_programme, "video")
-                if epg_channel_programme.get("video_colour"):
-                    c = ET.SubElement(video_el, "colour")
-                    c.text = epg_channel_programme["video_colour"]
-                if epg_channel_programme.get("video_aspect"):
-                    a = ET.SubElement(video_el, "aspect")
-                    a.text = epg_channel_programme["video_aspect"]
-                if epg_channel_programme.get("video_quality"):
-                    q = ET.SubElement(video_el, "quality")
-                    q.text = epg_channel_programme["video_quality"]
-            # Subtitles
-            if epg_channel_programme.get("subtitles_type"):
-                subs = ET.SubElement(output_programme, "subtitles")
-                subs.set("type", epg_channel_programme["subtitles_type"])
-            # Audio described
-            if epg_channel_programme.get("audio_described"):
-                ET.SubElement(output_programme, "audio-described")
-            # Previously shown
-            if epg_channel_programme.get("previously_shown_date"):
-                ps = ET.SubElement(output_programme, "previously-shown")
-                ps.set("start", epg_channel_programme["previously_shown_date"])
-            # Premiere / New
-            if epg_channel_programme.get("premiere"):
-                ET.SubElement(output_programme, "premiere")
-            if epg_channel_programme.get("is_new"):
-                ET.SubElement(output_programme, "new")
-            # Episode numbers
-            if epg_channel_programme.get("epnum_onscreen"):
-                e1 = ET.SubElement(output_programme, "episode-num")
-                e1.set("system", "onscreen")
-                e1.text = epg_channel_programme["epnum_onscreen"]
-            if epg_channel_programme.get("epnum_xmltv_ns"):
-                e2 = ET.SubElement(output_programme, "episode-num")
-                e2.set("system", "xmltv_ns")
-                e2.text = epg_channel_programme["epnum_xmltv_ns"]
-            if epg_channel_programme.get("epnum_dd_progid"):
-                e3 = ET.SubElement(output_programme, "episode-num")
-                e3.set("system", "dd_progid")
-                e3.text = epg_channel_programme["epnum_dd_progid"]
-            # Star rating
-            if epg_channel_programme.get("star_rating"):
-                sr = ET.SubElement(output_programme, "star-rating")
-                val = ET.SubElement(sr, "value")
-                val.text = epg_channel_programme["star_rating"]
-            # Production year
-            if epg_channel_programme.get("production_year"):
-                d = ET.SubElement(output_programme, "date")
-                d.text = epg_channel_programme["production_year"]
-            # Rating system
-            if epg_channel_programme.get("rating_value"):
-                rating_el = ET.SubElement(output_programme, "rating")
-                if epg_channel_programme.get("rating_system"):
-                    rating_el.set("system", epg_channel_programme["rating_system"])
-                rv = ET.SubElement(rating_el, "value")
-                rv.text = epg_channel_programme["rating_value"]
-            # Loop through all categories for this programme and add them as "category" child elements
-            if epg_channel_programme["categories"]:
-                for category in epg_channel_programme["categories"]:
-                    output_child = ET.SubElement(output_programme, "category")
-                    output_child.text = category
-                    output_child.set("lang", "en")
-            # Loop through all tags for this channel and add them as "category" child elements
-            for tag in channel_tags:
-                output_child = ET.SubElement(output_programme, "category")
-                output_child.text = tag
-                output_child.set("lang", "en")
-        await maybe_yield()
-    phase_seconds["generate_xml_tree"] = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        logger.info(
+            "   - Finalising XMLTV file (rendered_programmes=%s fragments_reused=%s fragments_rendered=%s).",
+            programme_count,
+            fragments_reused,
+            fragments_rendered,
+        )
+        await loop.run_in_executor(None, writer.commit)
+        phase_seconds["finalise_xml_file"] = time.perf_counter() - t0
+    except BaseException:
+        await loop.run_in_executor(None, writer.abort)
+        raise
+    await loop.run_in_executor(None, _prune_custom_epg_fragments, fragment_dir, used_fragments)
 
     t0 = time.perf_counter()
-    logger.info("   - Writing out XMLTV file.")
-    output_tree = ET.ElementTree(output_root)
-    custom_epg_file = os.path.join(config.config_path, "epg.xml")
-    await loop.run_in_executor(None, lambda: output_tree.write(custom_epg_file, encoding="UTF-8", xml_declaration=True))
-    phase_seconds["write_xml_file"] = time.perf_counter() - t0
+    logger.info("   - Pre-rendering XMLTV delivery variants.")
+    await prerender_xmltv_variants(config)
+    phase_seconds["prerender_variants"] = time.perf_counter() - t0
     execution_time = time.perf_counter() - total_start
     logger.info(
         "The custom XMLTV EPG file for TVH was generated in '%s' seconds (phases=%s)",
@@ -2990,6 +3644,8 @@ async def update_channel_epg_with_online_data(config):
         saved_update_count = await _bulk_update_programme_rows(session, new_programme_updates)
         await session.commit()
         phase_seconds["save_cache_and_updates"] = time.perf_counter() - t0
+    if initial_updated_count or saved_update_count:
+        bump_epg_generation(config, EPG_GENERATION_ONLINE_METADATA_KEY)
 
     execution_time = time.perf_counter() - start_time
     logger.info(
@@ -2,12 +2,13 @@
 # -*- coding: utf-8 -*-
 import asyncio
 import base64
+import functools
 import logging
 import os
 import re
 import time
 import uuid
-from collections import deque
+from collections import OrderedDict
 from urllib.parse import quote, urlencode, urljoin, urlparse, urlunparse
 
 import aiohttp
@@ -18,6 +19,15 @@ ffmpeg_logger = logging.getLogger("ffmpeg")
 
 _DIRECT_STREAM_CONNECT_TIMEOUT = float(os.environ.get("HLS_PROXY_DIRECT_CONNECT_TIMEOUT_SECONDS", "15"))
 _DIRECT_STREAM_READ_TIMEOUT = float(os.environ.get("HLS_PROXY_DIRECT_READ_TIMEOUT_SECONDS", "120"))
+_UPSTREAM_POOL_LIMIT = int(os.environ.get("HLS_PROXY_POOL_LIMIT", "256"))
+_UPSTREAM_POOL_LIMIT_PER_HOST = int(os.environ.get("HLS_PROXY_POOL_LIMIT_PER_HOST", "32"))
+_UPSTREAM_KEEPALIVE_TIMEOUT = float(os.environ.get("HLS_PROXY_KEEPALIVE_TIMEOUT_SECONDS", "30"))
+_UPSTREAM_DNS_CACHE_TTL = int(os.environ.get("HLS_PROXY_DNS_CACHE_TTL_SECONDS", "300"))
+_UPSTREAM_REQUEST_TIMEOUT = float(os.environ.get("HLS_PROXY_REQUEST_TIMEOUT_SECONDS", "60"))
+_PLAYLIST_COALESCE_TTL = float(os.environ.get("HLS_PROXY_PLAYLIST_COALESCE_TTL_SECONDS", "1.0"))
+_SEGMENT_CACHE_MAX_BYTES = int(os.environ.get("HLS_PROXY_SEGMENT_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+_SEGMENT_CACHE_MAX_ENTRIES = int(os.environ.get("HLS_PROXY_SEGMENT_CACHE_MAX_ENTRIES", "20000"))
+_SEGMENT_CACHE_SHARDS = int(os.environ.get("HLS_PROXY_SEGMENT_CACHE_SHARDS", "16"))
 
 """
 HLS Proxy Core Engine - Integration Guide
@@ -57,65 +67,508 @@ REQUIRED ROUTES FOR INTEGRATION:
 """
 
 
+class SharedHttpClient:
+    """
+    Long-lived pooled aiohttp client for upstream HLS traffic.
+
+    Playlist refreshes, segment fetches and the prefetcher share one connector
+    so provider connections are kept alive and reused instead of paying a
+    TCP/TLS handshake per request. Direct streams and segment passthroughs hold
+    their connection for the whole playback, so they use a separate uncapped
+    client and can never exhaust the per-host cap the short requests rely on.
+    The session is created lazily on the running loop and rebuilt if that loop
+    changes (e.g. between app restarts in the same process); the previous
+    session is closed rather than left holding its pooled sockets.
+    """
+
+    def __init__(
+        self,
+        limit=_UPSTREAM_POOL_LIMIT,
+        limit_per_host=_UPSTREAM_POOL_LIMIT_PER_HOST,
+        keepalive_timeout=_UPSTREAM_KEEPALIVE_TIMEOUT,
+        dns_cache_ttl=_UPSTREAM_DNS_CACHE_TTL,
+        request_timeout=_UPSTREAM_REQUEST_TIMEOUT,
+    ):
+        self.limit = max(0, int(limit))
+        self.limit_per_host = max(0, int(limit_per_host))
+        self.keepalive_timeout = float(keepalive_timeout)
+        self.dns_cache_ttl = int(dns_cache_ttl)
+        self.request_timeout = float(request_timeout)
+        self._session = None
+        self._loop = None
+
+    def default_timeout(self):
+        return aiohttp.ClientTimeout(
+            total=self.request_timeout,
+            connect=_DIRECT_STREAM_CONNECT_TIMEOUT,
+            sock_connect=_DIRECT_STREAM_CONNECT_TIMEOUT,
+            sock_read=_DIRECT_STREAM_READ_TIMEOUT,
+        )
+
+    @staticmethod
+    def streaming_timeout():
+        # Live-stream-safe timeouts: no total wall-clock cap, explicit socket timeouts.
+        return aiohttp.ClientTimeout(
+            total=None,
+            connect=_DIRECT_STREAM_CONNECT_TIMEOUT,
+            sock_connect=_DIRECT_STREAM_CONNECT_TIMEOUT,
+            sock_read=_DIRECT_STREAM_READ_TIMEOUT,
+        )
+
+    def session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            self._retire_session(self._session, self._loop)
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                use_dns_cache=True,
+                ttl_dns_cache=self.dns_cache_ttl,
+            )
+            # Upstreams belong to many different providers and users, so never
+            # let cookies from one request leak into another.
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=self.default_timeout(),
+                cookie_jar=aiohttp.DummyCookieJar(),
+            )
+            self._loop = loop
+        return self._session
+
+    async def close(self):
+        session = self._session
+        self._session = None
+        self._loop = None
+        if session is not None and not session.closed:
+            await session.close()
+
+    @staticmethod
+    def _retire_session(session, loop):
+        if session is None or session.closed:
+            return
+        if loop is not None and not loop.is_closed():
+            # The pooled transports belong to the old loop, so close the session there.
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+            return
+        # The old loop cannot run the close any more. Detach so the session counts
+        # as closed, then drop its pool; sockets the closed loop cannot shut down
+        # are released when their transports are collected.
+        connector = session.connector
+        session.detach()
+        if connector is not None:
+            try:
+                connector.close()
+            except Exception as exc:
+                proxy_logger.debug("Failed to close connector from a previous event loop: %s", exc)
+
+    def pool_stats(self):
+        stats = {
+            "limit": self.limit,
+            "limit_per_host": self.limit_per_host,
+            "keepalive_timeout": self.keepalive_timeout,
+            "dns_cache_ttl": self.dns_cache_ttl,
+            "open": 0,
+            "active": 0,
+            "idle": 0,
+            "waiting": 0,
+            "hosts": {},
+        }
+        session = self._session
+        if session is None or session.closed:
+            return stats
+        connector = session.connector
+        if connector is None:
+            return stats
+        # aiohttp does not expose pool counters publicly, so read them defensively.
+        hosts = {}
+
+        def _host_entry(key):
+            host = f"{getattr(key, 'host', key)}:{getattr(key, 'port', '')}".rstrip(":")
+            return hosts.setdefault(host, {"active": 0, "idle": 0, "waiting": 0})
+
+        for key, conns in dict(getattr(connector, "_conns", {}) or {}).items():
+            count = len(conns or ())
+            stats["idle"] += count
+            _host_entry(key)["idle"] += count
+        for key, acquired in dict(getattr(connector, "_acquired_per_host", {}) or {}).items():
+            count = len(acquired or ())
+            if count:
+                _host_entry(key)["active"] += count
+        stats["active"] = len(getattr(connector, "_acquired", ()) or ())
+        for key, waiters in dict(getattr(connector, "_waiters", {}) or {}).items():
+            count = len(waiters or ())
+            if count:
+                stats["waiting"] += count
+                _host_entry(key)["waiting"] += count
+        stats["open"] = stats["active"] + stats["idle"]
+        stats["hosts"] = hosts
+        return stats
+
+
+# Shared upstream HTTP client
+upstream_http_client = SharedHttpClient()
+# Long-lived streaming responses; a limit of 0 means no cap in aiohttp.
+upstream_stream_http_client = SharedHttpClient(limit=0, limit_per_host=0)
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical upstream fetches onto one task.
+
+    The first caller for a key starts the fetch; every caller that arrives while
+    it is in flight awaits the same task and receives the same result. When
+    `result_ttl` is set, non-None results are also reused for that many seconds
+    so a burst of clients polling the same playlist only costs one upstream hit.
+    Waiters are shielded so a disconnecting client never cancels the fetch for
+    everyone else.
+    """
+
+    def __init__(self, result_ttl=0.0, max_results=1024):
+        self.result_ttl = max(0.0, float(result_ttl or 0.0))
+        self.max_results = max(1, int(max_results))
+        self._inflight = {}
+        self._results = {}
+        self.started = 0
+        self.coalesced = 0
+        self.result_hits = 0
+
+    async def run(self, key, factory):
+        if self.result_ttl > 0:
+            cached = self._results.get(key)
+            if cached is not None:
+                if cached[0] > time.monotonic():
+                    self.result_hits += 1
+                    return cached[1]
+                self._results.pop(key, None)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(factory())
+            self._inflight[key] = task
+            self.started += 1
+            task.add_done_callback(functools.partial(self._on_done, key))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _on_done(self, key, task):
+        if self._inflight.get(key) is task:
+            self._inflight.pop(key, None)
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            return
+        result = task.result()
+        if self.result_ttl <= 0 or result is None:
+            return
+        now = time.monotonic()
+        if len(self._results) >= self.max_results:
+            for stale_key in [k for k, (expires_at, _) in self._results.items() if expires_at <= now]:
+                self._results.pop(stale_key, None)
+            while len(self._results) >= self.max_results:
+                self._results.pop(next(iter(self._results)), None)
+        self._results[key] = (now + self.result_ttl, result)
+
+    def stats(self):
+        return {
+            "in_flight": len(self._inflight),
+            "started": self.started,
+            "coalesced": self.coalesced,
+            "result_hits": self.result_hits,
+        }
+
+
+# Shared in-flight maps for upstream segment and playlist fetches
+segment_fetches = SingleFlight()
+playlist_fetches = SingleFlight(result_ttl=_PLAYLIST_COALESCE_TTL)
+
+
+class ChunkRingBuffer:
+    """
+    Shared append-only chunk ring for fan-out to many readers.
+
+    The producer appends each chunk once; every reader only holds a sequence
+    cursor into the ring, so broadcasting is O(1) regardless of how many clients
+    are attached. Readers that fall further behind than their lag budget (or
+    behind the oldest retained chunk) skip forward instead of being fed copies.
+
+    `retain_bytes` is the history kept for priming new readers. Beyond that, the
+    ring only keeps chunks that an attached reader has not consumed yet, up to
+    the hard `max_bytes` ceiling.
+    """
+
+    _TRIM_INTERVAL_SECONDS = 0.5
+
+    def __init__(self, max_bytes, retain_bytes=None):
+        self.max_bytes = max(1, int(max_bytes or 1))
+        self.retain_bytes = min(self.max_bytes, max(0, int(self.max_bytes if retain_bytes is None else retain_bytes)))
+        self._chunks = {}  # seq -> (chunk, start_offset, appended_ts)
+        self._first_seq = 0
+        self._next_seq = 0
+        self._prime_floor_seq = 0
+        self._start_offset = 0
+        self._end_offset = 0
+        self._data_event = None
+        self._readers = set()
+        self._last_trim_ts = 0.0
+
+    @property
+    def retained_bytes(self):
+        return self._end_offset - self._start_offset
+
+    @property
+    def history_bytes(self):
+        if self._prime_floor_seq >= self._next_seq:
+            return 0
+        return self._end_offset - self._offset_of(max(self._first_seq, self._prime_floor_seq))
+
+    def _offset_of(self, seq):
+        if seq >= self._next_seq:
+            return self._end_offset
+        if seq < self._first_seq:
+            return self._start_offset
+        return self._chunks[seq][1]
+
+    def _pop_oldest(self):
+        chunk, _, _ = self._chunks.pop(self._first_seq)
+        self._first_seq += 1
+        self._start_offset += len(chunk)
+
+    def _trim(self, now_value):
+        while self.retained_bytes > self.max_bytes and self._next_seq - self._first_seq > 1:
+            self._pop_oldest()
+        if self.retained_bytes <= self.retain_bytes:
+            return
+        if (now_value - self._last_trim_ts) < self._TRIM_INTERVAL_SECONDS:
+            return
+        self._last_trim_ts = now_value
+        # Beyond the priming history, only keep what the slowest attached reader still needs.
+        keep_from = self._next_seq
+        for reader in self._readers:
+            if reader.seq < keep_from:
+                keep_from = reader.seq
+        while (
+            self._first_seq < keep_from
+            and self.retained_bytes > self.retain_bytes
+            and self._next_seq - self._first_seq > 1
+        ):
+            self._pop_oldest()
+
+    def _wake(self):
+        event = self._data_event
+        if event is not None:
+            self._data_event = None
+            event.set()
+
+    async def _wait_for_data(self):
+        if self._data_event is None:
+            self._data_event = asyncio.Event()
+        await self._data_event.wait()
+
+    def append(self, chunk):
+        if not chunk:
+            return
+        now_value = time.time()
+        self._chunks[self._next_seq] = (chunk, self._end_offset, now_value)
+        self._next_seq += 1
+        self._end_offset += len(chunk)
+        self._trim(now_value)
+        self._wake()
+
+    def clear_history(self):
+        """Stop offering already buffered chunks to new readers (e.g. after an upstream switch)."""
+        self._prime_floor_seq = self._next_seq
+
+    def close_readers(self):
+        """
+        Signal EOF to every currently attached reader once it has drained what was
+        already appended. Readers attached afterwards are unaffected.
+        """
+        for reader in list(self._readers):
+            reader.mark_eof()
+        self._wake()
+
+    def prebuffer_start_seq(self, prebuffer_bytes, include_cleared=False):
+        floor = self._first_seq if include_cleared else max(self._first_seq, self._prime_floor_seq)
+        if prebuffer_bytes <= 0 or floor >= self._next_seq:
+            return self._next_seq
+        target_offset = self._end_offset - int(prebuffer_bytes)
+        seq = self._next_seq
+        while seq > floor and self._offset_of(seq) > target_offset:
+            seq -= 1
+        return seq
+
+    def reader(self, prebuffer_bytes=0, max_lag_bytes=None):
+        reader = ChunkRingReader(self, self.prebuffer_start_seq(prebuffer_bytes), max_lag_bytes=max_lag_bytes)
+        self._readers.add(reader)
+        return reader
+
+    def detach(self, reader):
+        self._readers.discard(reader)
+
+    def stats(self):
+        return {
+            "chunks": self._next_seq - self._first_seq,
+            "retained_bytes": self.retained_bytes,
+            "history_bytes": self.history_bytes,
+            "max_bytes": self.max_bytes,
+            "retain_bytes": self.retain_bytes,
+            "readers": len(self._readers),
+        }
+
+
+class ChunkRingReader:
+    """
+    Read cursor into a ChunkRingBuffer.
+
+    Exposes the same consumer interface as the per-client queues it replaces
+    (`get`, `iter_items`, `put_eof`, `clear`, `stats`), returning None at EOF.
+    """
+
+    def __init__(self, ring, seq, max_lag_bytes=None):
+        self.ring = ring
+        self.seq = int(seq)
+        self.max_lag_bytes = int(max_lag_bytes) if max_lag_bytes else None
+        self.eof_seq = None
+        self.dropped_items = 0
+        self.dropped_bytes = 0
+        # Start time and count of the current run of skips; reset once the reader catches up.
+        self.drop_first_ts = None
+        self.drop_run_count = 0
+        self.primed_bytes = ring._end_offset - ring._offset_of(self.seq)
+
+    def _skip_to(self, seq):
+        ring = self.ring
+        skipped_items = seq - self.seq
+        if skipped_items <= 0:
+            return
+        skipped_bytes = ring._offset_of(seq) - ring._offset_of(self.seq)
+        self.seq = seq
+        self.dropped_items += skipped_items
+        self.dropped_bytes += max(0, skipped_bytes)
+        if self.drop_first_ts is None:
+            self.drop_first_ts = time.time()
+        self.drop_run_count += skipped_items
+
+    def lag_bytes(self):
+        return self.ring._end_offset - self.ring._offset_of(self.seq)
+
+    def is_over_lag_budget(self):
+        """True when the reader has fallen far enough behind that its next read will skip data."""
+        if self.seq < self.ring._first_seq:
+            return True
+        return self.max_lag_bytes is not None and self.lag_bytes() > self.max_lag_bytes
+
+    def pending_skip_items(self):
+        """Number of chunks the next read will skip to get back within the lag budget."""
+        ring = self.ring
+        target = max(self.seq, ring._first_seq)
+        if self.max_lag_bytes is not None and ring._end_offset - ring._offset_of(target) > self.max_lag_bytes:
+            target = max(target, ring.prebuffer_start_seq(self.max_lag_bytes, include_cleared=True))
+        return max(0, target - self.seq)
+
+    def lag_budget_exceeded_since(self):
+        """
+        When a stalled reader went over its lag budget, or None if it is within budget.
+
+        This is the arrival time of the chunk that pushed it over, taken from the ring so nothing has to
+        be tracked per append. If that chunk has already been trimmed, the oldest retained chunk's time
+        is used instead, which understates how long the reader has been behind.
+        """
+        if not self.is_over_lag_budget():
+            return None
+        ring = self.ring
+        low = max(self.seq, ring._first_seq)
+        high = ring._next_seq - 1
+        if low > high:
+            return None
+        if self.seq < ring._first_seq or self.max_lag_bytes is None:
+            return ring._chunks[low][2]
+        limit = ring._offset_of(self.seq) + self.max_lag_bytes
+        # First chunk whose end offset is past the budget; offsets grow with seq, so bisect.
+        while low < high:
+            middle = (low + high) // 2
+            if ring._offset_of(middle + 1) > limit:
+                high = middle
+            else:
+                low = middle + 1
+        return ring._chunks[low][2]
+
+    def mark_eof(self):
+        if self.eof_seq is None:
+            self.eof_seq = self.ring._next_seq
+        # A closing reader no longer holds back trimming of the shared ring.
+        self.ring.detach(self)
+
+    async def get(self):
+        ring = self.ring
+        while True:
+            if self.eof_seq is not None and self.seq >= self.eof_seq:
+                return None
+            if self.seq < ring._first_seq:
+                self._skip_to(ring._first_seq)
+            if self.max_lag_bytes is not None and self.lag_bytes() > self.max_lag_bytes:
+                self._skip_to(ring.prebuffer_start_seq(self.max_lag_bytes, include_cleared=True))
+            if self.seq < ring._next_seq and (self.eof_seq is None or self.seq < self.eof_seq):
+                chunk = ring._chunks[self.seq][0]
+                self.seq += 1
+                return chunk
+            # Caught up with the producer, so any backpressure run is over.
+            self.drop_first_ts = None
+            self.drop_run_count = 0
+            await ring._wait_for_data()
+
+    async def iter_items(self):
+        while True:
+            item = await self.get()
+            if item is None:
+                break
+            yield item
+
+    async def put_eof(self):
+        self.mark_eof()
+        self.ring._wake()
+
+    async def clear(self):
+        self.seq = self.ring._next_seq
+
+    async def stats(self):
+        ring = self.ring
+        oldest_age = 0.0
+        if ring._first_seq <= self.seq < ring._next_seq:
+            oldest_age = max(0.0, time.time() - float(ring._chunks[self.seq][2]))
+        return {
+            "queued_items": max(0, ring._next_seq - max(self.seq, ring._first_seq)),
+            "queued_bytes": int(self.lag_bytes()),
+            "max_bytes": int(self.max_lag_bytes or ring.max_bytes),
+            "oldest_age_seconds": oldest_age,
+            "dropped_items": int(self.dropped_items),
+            "dropped_bytes": int(self.dropped_bytes),
+        }
+
+
 class BaseStreamMultiplexer:
     def __init__(self, decoded_url):
         self.decoded_url = decoded_url
-        self.queues = {}  # connection_id -> asyncio.Queue
+        self.queues = {}  # connection_id -> ChunkRingReader
         self.running = False
         self.lock = asyncio.Lock()
         self.last_activity = time.time()
-        self.history = deque()
-        self.history_bytes = 0
         self.max_history_bytes = int(os.environ.get("HLS_PROXY_MAX_HISTORY_BYTES", 200 * 1024 * 1024))
+        self.ring = ChunkRingBuffer(self.max_history_bytes)
 
     async def _broadcast(self, chunk):
         if not chunk:
             return
         self.last_activity = time.time()
-
-        async with self.lock:
-            # Update shared history
-            self.history.append(chunk)
-            self.history_bytes += len(chunk)
-            while self.history_bytes > self.max_history_bytes:
-                old = self.history.popleft()
-                self.history_bytes -= len(old)
-
-            # Push to all subscriber queues
-            for q in list(self.queues.values()):
-                try:
-                    q.put_nowait(chunk)
-                except asyncio.QueueFull:
-                    # Leaky bucket: drop oldest chunk for this specific client
-                    try:
-                        q.get_nowait()
-                        q.put_nowait(chunk)
-                    except Exception:
-                        pass
+        # Single shared append; each client reads from its own cursor.
+        self.ring.append(chunk)
 
     async def add_queue(self, connection_id, prebuffer_bytes=0):
         async with self.lock:
-            # 200MB cap. Use a high chunk count (100k) to handle small network packets.
-            q = asyncio.Queue(maxsize=100000)
-
-            # Prime the new queue with history for an instant cushion
-            primed_bytes = 0
-            if prebuffer_bytes > 0 and self.history:
-                accumulated = 0
-                to_prime = []
-                # Grab the most recent data from history to fill the cushion
-                for chunk in reversed(self.history):
-                    to_prime.append(chunk)
-                    accumulated += len(chunk)
-                    if accumulated >= prebuffer_bytes:
-                        break
-                for chunk in reversed(to_prime):
-                    try:
-                        q.put_nowait(chunk)
-                        primed_bytes += len(chunk)
-                    except asyncio.QueueFull:
-                        break
-
+            # Start the new reader inside the shared ring for an instant cushion
+            q = self.ring.reader(prebuffer_bytes=prebuffer_bytes)
+            primed_bytes = q.primed_bytes
             self.queues[connection_id] = q
             proxy_logger.info(
                 f"Added queue {connection_id} for {self.decoded_url}, count: {len(self.queues)} (primed: {primed_bytes} bytes)"
@@ -126,7 +579,9 @@ class BaseStreamMultiplexer:
         should_stop = False
         queue_count = 0
         async with self.lock:
-            self.queues.pop(connection_id, None)
+            q = self.queues.pop(connection_id, None)
+            if q is not None:
+                await q.put_eof()
             queue_count = len(self.queues)
             proxy_logger.info(f"Removed queue {connection_id} for {self.decoded_url}, count: {queue_count}")
             should_stop = queue_count == 0
@@ -319,15 +774,10 @@ class AsyncFFmpegStream(BaseStreamMultiplexer):
                 except Exception:
                     pass
 
-            # Wake up all waiting queues with None to signal EOF
-            for q in self.queues.values():
-                try:
-                    q.put_nowait(None)
-                except Exception:
-                    pass
+            # Wake up all waiting readers with None to signal EOF
+            self.ring.close_readers()
+            self.ring.clear_history()
             self.queues.clear()
-            self.history.clear()
-            self.history_bytes = 0
             if self.on_stop_callback:
                 await self.on_stop_callback(self.decoded_url, "ffmpeg")
         ffmpeg_logger.info("FFmpeg process for %s cleaned up.", self.decoded_url)
@@ -339,12 +789,12 @@ class AsyncDirectStream(BaseStreamMultiplexer):
 
     How it works:
     TIC uses its native async event loop (via aiohttp) to fetch raw bits directly from the source.
-    Data is shared among all connected clients using zero-overhead Python queues.
+    Data is shared among all connected clients through one ring buffer with a read cursor per client.
 
     Benefits:
     - Maximum Efficiency: Near-zero CPU usage. No external processes or pipes.
     - Shared Connection: Only one upstream request is made regardless of the number of TIC clients.
-    - Jitter Protection: Inherits the same 200MB history buffer and configurable prebuffer cushion.
+    - Jitter Protection: Inherits the same 200MB shared ring buffer and configurable prebuffer cushion.
     - Scalability: Allows TIC to handle dozens of concurrent streams without impacting system responsiveness.
 
     Costs:
@@ -366,24 +816,19 @@ class AsyncDirectStream(BaseStreamMultiplexer):
 
     async def _read_loop(self):
         try:
-            # Use live-stream-safe timeouts: no total wall-clock cap, explicit socket timeouts.
-            timeout = aiohttp.ClientTimeout(
-                total=None,
-                connect=_DIRECT_STREAM_CONNECT_TIMEOUT,
-                sock_connect=_DIRECT_STREAM_CONNECT_TIMEOUT,
-                sock_read=_DIRECT_STREAM_READ_TIMEOUT,
-            )
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.get(self.decoded_url, headers=self.headers) as resp:
-                    if resp.status != 200:
-                        proxy_logger.error(
-                            "DirectStream upstream failed: status %s for %s", resp.status, self.decoded_url
-                        )
-                        return
-                    async for chunk in resp.content.iter_any():
-                        if not self.running:
-                            break
-                        await self._broadcast(chunk)
+            session = upstream_stream_http_client.session()
+            async with session.get(
+                self.decoded_url,
+                headers=self.headers,
+                timeout=upstream_stream_http_client.streaming_timeout(),
+            ) as resp:
+                if resp.status != 200:
+                    proxy_logger.error("DirectStream upstream failed: status %s for %s", resp.status, self.decoded_url)
+                    return
+                async for chunk in resp.content.iter_any():
+                    if not self.running:
+                        break
+                    await self._broadcast(chunk)
         except Exception as e:
             proxy_logger.error(
                 "DirectStream read error for %s: %s (%r)",
@@ -401,15 +846,10 @@ class AsyncDirectStream(BaseStreamMultiplexer):
             if not force and self.queues:
                 return
             self.running = False
-            # Signal EOF to all queues
-            for q in self.queues.values():
-                try:
-                    q.put_nowait(None)
-                except Exception:
-                    pass
+            # Signal EOF to all readers
+            self.ring.close_readers()
+            self.ring.clear_history()
             self.queues.clear()
-            self.history.clear()
-            self.history_bytes = 0
             if self.on_stop_callback:
                 await self.on_stop_callback(self.decoded_url, "direct")
         proxy_logger.info("DirectStream for %s cleaned up.", self.decoded_url)
@@ -461,55 +901,178 @@ class MultiplexerManager:
             await stream.stop(force=True)
 
 
+class _SegmentCacheShard:
+    __slots__ = ("entries", "bytes")
+
+    def __init__(self):
+        # key -> (value, size_bytes, expires_at); ordered oldest-used first
+        self.entries = OrderedDict()
+        self.bytes = 0
+
+
 class SegmentCache:
-    def __init__(self, ttl=3600):
-        self.cache = {}
-        self.expiration_times = {}
-        self._lock = asyncio.Lock()
-        self.ttl = ttl
-        self.max_size = 200  # Limit cache size to prevent memory issues
+    """
+    Byte-bounded LRU cache for proxied HLS segments and keys.
+
+    Entries are spread across shards, each an OrderedDict kept in recency order,
+    so get/set are O(1). The byte and entry budgets apply to the whole cache, so a
+    single large segment can use any free space. When over budget, the least
+    recently used entry of the fullest shard is evicted, which approximates a
+    global LRU because keys hash evenly across shards. A value larger than the
+    whole byte budget is not cached. TTLs are checked lazily on access and swept
+    in bulk by `evict_expired_items`, which the periodic HLS cleanup already
+    calls. None of the hot-path operations await, so no lock is held across viewers.
+    """
 
-    async def _cleanup_expired_items(self):
-        current_time = time.time()
-        expired_keys = [k for k, exp in self.expiration_times.items() if current_time > exp]
-        for k in expired_keys:
-            val = self.cache.get(k)
+    def __init__(
+        self,
+        ttl=3600,
+        max_bytes=_SEGMENT_CACHE_MAX_BYTES,
+        max_entries=_SEGMENT_CACHE_MAX_ENTRIES,
+        shards=_SEGMENT_CACHE_SHARDS,
+    ):
+        self.ttl = ttl
+        self.max_bytes = max(1, int(max_bytes))
+        self.max_entries = max(1, int(max_entries))
+        shard_count = max(1, int(shards))
+        self._shards = [_SegmentCacheShard() for _ in range(shard_count)]
+        self._bytes = 0
+        self._entries = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.evicted_bytes = 0
+
+    def _shard(self, key):
+        return self._shards[hash(key) % len(self._shards)]
+
+    @staticmethod
+    def _value_size(value):
+        if isinstance(value, dict):
+            value = value.get("body")
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return len(value)
+        return 0
+
+    @staticmethod
+    async def _release_values(values):
+        for val in values:
             if isinstance(val, AsyncFFmpegStream):
                 await val.stop()
-            self.cache.pop(k, None)
-            self.expiration_times.pop(k, None)
-        return len(expired_keys)
+
+    def _pop_entry(self, shard, key):
+        entry = shard.entries.pop(key, None)
+        if entry is None:
+            return None
+        shard.bytes -= entry[1]
+        self._bytes -= entry[1]
+        self._entries -= 1
+        return entry
+
+    def _evict_lru_unlocked(self, keep_key, by_bytes):
+        # The entry just written sits at the tail of its shard, so it is only a shard's oldest entry when alone.
+        candidates = [
+            shard for shard in self._shards if shard.entries and not (len(shard.entries) == 1 and keep_key in shard.entries)
+        ]
+        if not candidates:
+            return None
+        shard = max(candidates, key=(lambda item: item.bytes) if by_bytes else (lambda item: len(item.entries)))
+        _, (old_value, old_size, _) = shard.entries.popitem(last=False)
+        shard.bytes -= old_size
+        self._bytes -= old_size
+        self._entries -= 1
+        self.evictions += 1
+        self.evicted_bytes += old_size
+        return old_value
 
     async def get(self, key):
-        async with self._lock:
-            if key in self.cache and time.time() <= self.expiration_times.get(key, 0):
-                # Access refreshes TTL
-                self.expiration_times[key] = time.time() + self.ttl
-                return self.cache[key]
+        shard = self._shard(key)
+        entry = shard.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        value, size, expires_at = entry
+        now = time.time()
+        if now > expires_at:
+            self._pop_entry(shard, key)
+            self.expirations += 1
+            self.misses += 1
+            await self._release_values([value])
             return None
+        # Access refreshes TTL and recency
+        shard.entries[key] = (value, size, now + self.ttl)
+        shard.entries.move_to_end(key)
+        self.hits += 1
+        return value
 
     async def set(self, key, value, expiration_time=None):
-        async with self._lock:
-            await self._cleanup_expired_items()
-            if len(self.cache) >= self.max_size and self.expiration_times:
-                oldest_key = min(self.expiration_times.items(), key=lambda x: x[1])[0]
-                val = self.cache.get(oldest_key)
-                if isinstance(val, AsyncFFmpegStream):
-                    await val.stop()
-                self.cache.pop(oldest_key, None)
-                self.expiration_times.pop(oldest_key, None)
-            ttl = expiration_time if expiration_time is not None else self.ttl
-            self.cache[key] = value
-            self.expiration_times[key] = time.time() + ttl
+        shard = self._shard(key)
+        ttl = expiration_time if expiration_time is not None else self.ttl
+        size = self._value_size(value)
+        released = []
+        previous = self._pop_entry(shard, key)
+        if previous is not None and previous[0] is not value:
+            released.append(previous[0])
+        if size > self.max_bytes:
+            # Caching it would flush everything else and still not fit.
+            if released:
+                await self._release_values(released)
+            return
+        shard.entries[key] = (value, size, time.time() + ttl)
+        shard.bytes += size
+        self._bytes += size
+        self._entries += 1
+        # Evict until the whole cache is back within budget, always keeping the entry just written.
+        while self._bytes > self.max_bytes or self._entries > self.max_entries:
+            old_value = self._evict_lru_unlocked(key, by_bytes=self._bytes > self.max_bytes)
+            if old_value is None:
+                break
+            released.append(old_value)
+        if released:
+            await self._release_values(released)
 
     async def exists(self, key):
-        async with self._lock:
-            await self._cleanup_expired_items()
-            return key in self.cache
+        shard = self._shard(key)
+        entry = shard.entries.get(key)
+        if entry is None:
+            return False
+        if time.time() > entry[2]:
+            self._pop_entry(shard, key)
+            self.expirations += 1
+            await self._release_values([entry[0]])
+            return False
+        return True
 
     async def evict_expired_items(self):
-        async with self._lock:
-            return await self._cleanup_expired_items()
+        now = time.time()
+        released = []
+        for shard in self._shards:
+            expired_keys = [k for k, entry in shard.entries.items() if now > entry[2]]
+            for k in expired_keys:
+                entry = self._pop_entry(shard, k)
+                if entry is not None:
+                    released.append(entry[0])
+        self.expirations += len(released)
+        if released:
+            await self._release_values(released)
+        return len(released)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": self._entries,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "max_entries": self.max_entries,
+            "shards": len(self._shards),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "evicted_bytes": self.evicted_bytes,
+            "expirations": self.expirations,
+        }
 
 
 # Shared Global Manager
@@ -603,43 +1166,28 @@ async def handle_m3u8_proxy(
     """
     Standard Logic for Playlist Proxying.
     Rewrites child URLs to point back to the proxy.
+    Concurrent requests for the same playlist share one upstream fetch.
     """
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.get(decoded_url, headers=headers) as resp:
-                if resp.status != 200:
-                    return None, None, 502, {"X-Proxy-Error": "upstream-unreachable"}
-
-                response_url = str(resp.url)
-                content_type = resp.headers.get("Content-Type") or "text/plain"
-
-                # Logic for determining if we stream or return string
-                content_length = resp.content_length or 0
-                if content_length > max_buffer_bytes:
-                    # Return a generator for streaming large playlists
-                    return (
-                        _stream_rewrite_generator(
-                            resp,
-                            response_url,
-                            request_host_url,
-                            hls_proxy_prefix,
-                            instance_id,
-                            stream_key,
-                            username,
-                            connection_id,
-                            headers_query_token,
-                            proxy_base_url=proxy_base_url,
-                        ),
-                        content_type,
-                        200,
-                        {},
-                    )
-
-                # Small enough to process in memory
-                playlist_content = await resp.text()
-                modified, segment_urls = await _update_child_urls(
-                    playlist_content,
-                    response_url,
+    playlist_key = _segment_cache_key(decoded_url, headers_query_token=headers_query_token)
+    try:
+        fetched = await playlist_fetches.run(
+            playlist_key,
+            functools.partial(_fetch_playlist, decoded_url, headers, max_buffer_bytes),
+        )
+        if fetched is None:
+            return None, None, 502, {"X-Proxy-Error": "upstream-unreachable"}
+
+        if fetched.get("oversized"):
+            # Large playlists are streamed per request rather than held in memory for sharing.
+            session = upstream_http_client.session()
+            resp = await session.get(decoded_url, headers=headers)
+            if resp.status != 200:
+                resp.release()
+                return None, None, 502, {"X-Proxy-Error": "upstream-unreachable"}
+            return (
+                _stream_rewrite_generator(
+                    resp,
+                    str(resp.url),
                     request_host_url,
                     hls_proxy_prefix,
                     instance_id,
@@ -648,20 +1196,52 @@ async def handle_m3u8_proxy(
                     connection_id,
                     headers_query_token,
                     proxy_base_url=proxy_base_url,
+                ),
+                resp.headers.get("Content-Type") or "text/plain",
+                200,
+                {},
+            )
+
+        modified, segment_urls = await _update_child_urls(
+            fetched["text"],
+            fetched["url"],
+            request_host_url,
+            hls_proxy_prefix,
+            instance_id,
+            stream_key,
+            username,
+            connection_id,
+            headers_query_token,
+            proxy_base_url=proxy_base_url,
+        )
+        if prefetch_segments_enabled and segment_cache and segment_urls:
+            asyncio.create_task(
+                prefetch_segments(
+                    segment_urls,
+                    headers=headers,
+                    cache_obj=segment_cache,
+                    headers_query_token=headers_query_token,
                 )
-                if prefetch_segments_enabled and segment_cache and segment_urls:
-                    asyncio.create_task(
-                        prefetch_segments(
-                            segment_urls,
-                            headers=headers,
-                            cache_obj=segment_cache,
-                            headers_query_token=headers_query_token,
-                        )
-                    )
-                return modified, content_type, 200, {}
-        except Exception as exc:
-            proxy_logger.error(f"HLS proxy failed to fetch '{decoded_url}': {exc}")
-            return None, None, 502, {"X-Proxy-Error": "upstream-unreachable"}
+            )
+        return modified, fetched["content_type"], 200, {}
+    except Exception as exc:
+        proxy_logger.error(f"HLS proxy failed to fetch '{decoded_url}': {exc}")
+        return None, None, 502, {"X-Proxy-Error": "upstream-unreachable"}
+
+
+async def _fetch_playlist(decoded_url, headers, max_buffer_bytes):
+    session = upstream_http_client.session()
+    async with session.get(decoded_url, headers=headers) as resp:
+        if resp.status != 200:
+            return None
+        content_length = resp.content_length or 0
+        if content_length > max_buffer_bytes:
+            return {"oversized": True}
+        return {
+            "url": str(resp.url),
+            "content_type": resp.headers.get("Content-Type") or "text/plain",
+            "text": await resp.text(),
+        }
 
 
 async def _update_child_urls(
@@ -725,22 +1305,25 @@ async def _stream_rewrite_generator(
         if instance_id:
             base_proxy_url = f"{base_proxy_url.rstrip('/')}/{instance_id}"
 
-    async for chunk in resp.content.iter_chunked(8192):
-        buffer += chunk.decode("utf-8", errors="ignore")
-        while "\n" in buffer:
-            line, buffer = buffer.split("\n", 1)
-            updated_line, _ = rewrite_playlist_line(
-                line,
-                source_url,
-                base_proxy_url,
-                state,
-                stream_key,
-                username,
-                connection_id,
-                headers_query_token,
-            )
-            if updated_line:
-                yield updated_line + "\n"
+    try:
+        async for chunk in resp.content.iter_chunked(8192):
+            buffer += chunk.decode("utf-8", errors="ignore")
+            while "\n" in buffer:
+                line, buffer = buffer.split("\n", 1)
+                updated_line, _ = rewrite_playlist_line(
+                    line,
+                    source_url,
+                    base_proxy_url,
+                    state,
+                    stream_key,
+                    username,
+                    connection_id,
+                    headers_query_token,
+                )
+                if updated_line:
+                    yield updated_line + "\n"
+    finally:
+        resp.release()
     if buffer:
         updated_line, _ = rewrite_playlist_line(
             buffer,
@@ -834,30 +1417,38 @@ def _build_params(stream_key, username, connection_id, headers_query_token):
 async def prefetch_segments(segment_urls, headers=None, cache_obj=None, headers_query_token=None):
     if not cache_obj or not segment_urls:
         return
-    async with aiohttp.ClientSession() as session:
-        for url in segment_urls:
-            key = _segment_cache_key(url, headers_query_token=headers_query_token)
-            cached = await cache_obj.get(key)
-            if cached is not None:
-                continue
-            try:
-                async with session.get(url, headers=headers) as resp:
-                    if resp.status != 200:
-                        continue
-                    content = await resp.read()
-                    content_type = (resp.headers.get("Content-Type") or "").lower()
-                    await cache_obj.set(
-                        key,
-                        {"body": content, "content_type": content_type},
-                        expiration_time=30,
-                    )
-            except aiohttp.ClientError as exc:
-                proxy_logger.debug("Failed to prefetch URL '%s': %s", url, exc)
+    for url in segment_urls:
+        key = _segment_cache_key(url, headers_query_token=headers_query_token)
+        cached = await cache_obj.get(key)
+        if cached is not None:
+            continue
+        # Joins any client fetch already in flight for this segment instead of racing it.
+        await segment_fetches.run(key, functools.partial(_fetch_segment, url, headers, cache_obj, key))
+
+
+async def _fetch_segment(decoded_url, headers, cache_obj, cache_key):
+    try:
+        session = upstream_http_client.session()
+        async with session.get(decoded_url, headers=headers) as resp:
+            if resp.status != 200:
+                return None, 404, ""
+            content = await resp.read()
+            content_type = (resp.headers.get("Content-Type") or "").lower()
+            await cache_obj.set(
+                cache_key,
+                {"body": content, "content_type": content_type},
+                expiration_time=30,
+            )
+            return content, 200, content_type
+    except aiohttp.ClientError as exc:
+        proxy_logger.warning("Segment fetch failed for '%s': %s", decoded_url, exc)
+        return None, 502, ""
 
 
 async def handle_segment_proxy(decoded_url, headers, cache_obj, headers_query_token=None):
     """
     Generic logic for fetching and caching .ts, .key, .vtt files.
+    Concurrent cache misses for the same segment share one upstream fetch.
     """
     cache_key = _segment_cache_key(decoded_url, headers_query_token=headers_query_token)
     cached = await cache_obj.get(cache_key)
@@ -866,47 +1457,40 @@ async def handle_segment_proxy(decoded_url, headers, cache_obj, headers_query_to
             return cached.get("body"), 200, cached.get("content_type", "")
         return cached, 200, ""
 
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(decoded_url, headers=headers) as resp:
-                if resp.status != 200:
-                    return None, 404, ""
-                content = await resp.read()
-                content_type = (resp.headers.get("Content-Type") or "").lower()
-                await cache_obj.set(
-                    cache_key,
-                    {"body": content, "content_type": content_type},
-                    expiration_time=30,
-                )
-                return content, 200, content_type
-    except aiohttp.ClientError as exc:
-        proxy_logger.warning("Segment fetch failed for '%s': %s", decoded_url, exc)
-        return None, 502, ""
+    return await segment_fetches.run(
+        cache_key,
+        functools.partial(_fetch_segment, decoded_url, headers, cache_obj, cache_key),
+    )
 
 
 async def open_segment_passthrough(decoded_url, headers, method="GET"):
-    timeout = aiohttp.ClientTimeout(
-        total=None,
-        connect=_DIRECT_STREAM_CONNECT_TIMEOUT,
-        sock_connect=_DIRECT_STREAM_CONNECT_TIMEOUT,
-        sock_read=_DIRECT_STREAM_READ_TIMEOUT,
-    )
-    session = aiohttp.ClientSession(timeout=timeout)
+    """
+    Open an upstream passthrough response on the shared streaming pool.
+    The caller owns the returned response and must release/close it.
+    """
+    session = upstream_stream_http_client.session()
+    timeout = upstream_stream_http_client.streaming_timeout()
     request_url = _prepare_upstream_request_url(decoded_url)
     request_headers = dict(headers or {})
+    response = await session.request(
+        method, request_url, headers=request_headers, allow_redirects=True, timeout=timeout
+    )
     try:
-        response = await session.request(method, request_url, headers=request_headers, allow_redirects=True)
         if response.status >= 400 and method.upper() == "HEAD":
             response.release()
-            response = await session.request("GET", request_url, headers=request_headers, allow_redirects=True)
+            response = await session.request(
+                "GET", request_url, headers=request_headers, allow_redirects=True, timeout=timeout
+            )
         if response.status == 404 and method.upper() == "GET" and "Range" not in request_headers:
             response.release()
             request_headers["Range"] = "bytes=0-"
-            response = await session.request(method, request_url, headers=request_headers, allow_redirects=True)
+            response = await session.request(
+                method, request_url, headers=request_headers, allow_redirects=True, timeout=timeout
+            )
     except Exception:
-        await session.close()
+        response.release()
         raise
-    return session, response
+    return response
 
 
 async def handle_multiplexed_stream(
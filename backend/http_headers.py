@@ -132,3 +132,33 @@ def decode_headers_query_param(value):
     except Exception:
         return {}
     return sanitise_headers(payload)
+
+
+def etag_matches(if_none_match, etag):
+    """Weak If-None-Match comparison of a request header value against a quoted ETag."""
+    header = str(if_none_match or "").strip()
+    target = str(etag or "").strip()
+    if not header or not target:
+        return False
+    if header == "*":
+        return True
+    if target.startswith("W/"):
+        target = target[2:]
+    for candidate in header.split(","):
+        value = candidate.strip()
+        if value.startswith("W/"):
+            value = value[2:]
+        if value == target:
+            return True
+    return False
+
+
+def accepts_gzip(accept_encoding):
+    for part in str(accept_encoding or "").lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        if coding.strip() not in {"gzip", "*"}:
+            continue
+        if params.replace(" ", "") in {"q=0", "q=0.0", "q=0.00", "q=0.000"}:
+            return False
+        return True
+    return False
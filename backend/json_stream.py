@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+import json
+
+JSON_STREAM_CHUNK_CHARS = 256 * 1024
+JSON_STREAM_BATCH_SIZE = 1000
+
+_WHITESPACE = " \t\n\r"
+_ELEMENT_TERMINATORS = _WHITESPACE + ",]"
+_DECODER = json.JSONDecoder()
+
+
+def iter_json_array_items(path, chunk_chars=JSON_STREAM_CHUNK_CHARS):
+    """
+    Yield the elements of a top-level JSON array stored in ``path`` one at a time.
+    Only the element being decoded and one read chunk are held in memory.
+    Raises ValueError when the document is not an array or is truncated.
+    """
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        buffer = ""
+        pos = 0
+        eof = False
+        state = "start"
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos >= len(buffer):
+                if eof:
+                    raise ValueError(f"Truncated JSON array in {path}")
+                buffer, pos, eof = _read_more(f, buffer, pos, chunk_chars)
+                continue
+
+            char = buffer[pos]
+            if state == "start":
+                if char != "[":
+                    raise ValueError(f"Expected a JSON array in {path}, found {char!r}")
+                pos += 1
+                state = "first"
+                continue
+            if state == "separator":
+                if char == "]":
+                    return
+                if char != ",":
+                    raise ValueError(f"Unexpected {char!r} between JSON array elements in {path}")
+                pos += 1
+                state = "element"
+                continue
+            if state == "first" and char == "]":
+                return
+
+            try:
+                value, end = _DECODER.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                buffer, pos, eof = _read_more(f, buffer, pos, chunk_chars)
+                continue
+            if not eof and (end >= len(buffer) or buffer[end] not in _ELEMENT_TERMINATORS):
+                # A number cut by the chunk boundary decodes as a shorter number; wait for its terminator.
+                buffer, pos, eof = _read_more(f, buffer, pos, chunk_chars)
+                continue
+            pos = end
+            state = "separator"
+            yield value
+
+
+def _read_more(f, buffer, pos, chunk_chars):
+    chunk = f.read(chunk_chars)
+    return buffer[pos:] + chunk, 0, not chunk
+
+
+def iter_json_array_batches(path, batch_size=JSON_STREAM_BATCH_SIZE):
+    batch = []
+    for item in iter_json_array_items(path):
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
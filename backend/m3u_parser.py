@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+import re
+
+M3U_PARSE_BATCH_SIZE = 5000
+
+_EXTINF_PREFIX = "#EXTINF:"
+_ATTRIBUTE_RE = re.compile(r'([A-Za-z0-9_\-]+)\s*=\s*"([^"]*)"')
+
+
+def _split_extinf(line):
+    """Split an #EXTINF line into its attribute section and the display name after the first unquoted comma."""
+    body = line[len(_EXTINF_PREFIX) :]
+    in_quotes = False
+    for index, char in enumerate(body):
+        if char == '"':
+            in_quotes = not in_quotes
+        elif char == "," and not in_quotes:
+            return body[:index], body[index + 1 :].strip()
+    return body, ""
+
+
+def parse_extinf_line(line):
+    attributes_text, name = _split_extinf(line)
+    attributes = {key.lower(): value for key, value in _ATTRIBUTE_RE.findall(attributes_text)}
+    return name, attributes
+
+
+def iter_m3u_entries(path):
+    """
+    Yield ``(name, url, attributes)`` for each entry of an M3U file, reading it line by line.
+    Only the current entry is ever held in memory.
+    """
+    with open(path, "r", encoding="utf8", errors="ignore") as f:
+        pending = None
+        for raw_line in f:
+            line = raw_line.strip()
+            if not line:
+                continue
+            if line.startswith(_EXTINF_PREFIX):
+                pending = parse_extinf_line(line)
+                continue
+            if line.startswith("#"):
+                continue
+            if pending is None:
+                # Bare URL without an #EXTINF header.
+                yield "", line, {}
+                continue
+            name, attributes = pending
+            pending = None
+            yield name, line, attributes
+
+
+def iter_m3u_entry_batches(path, batch_size=M3U_PARSE_BATCH_SIZE):
+    batch = []
+    for entry in iter_m3u_entries(path):
+        batch.append(entry)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
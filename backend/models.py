@@ -2,6 +2,7 @@
 # -*- coding:utf-8 -*-
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     Column,
     DateTime,
@@ -58,8 +59,12 @@ class EpgChannels(Base):
     name = Column(String(500), index=True, unique=False)
     icon_url = Column(Text, index=False, unique=False)
 
-    # Link with an epg
-    epg_id = Column(Integer, ForeignKey("epgs.id"), nullable=False, index=True)
+    # Link with an epg. This is only set on the live generation of a guide's channels;
+    # rows still being imported or waiting to be garbage collected leave it NULL and
+    # record their owning guide in staging_epg_id / retired_epg_id instead.
+    epg_id = Column(Integer, ForeignKey("epgs.id"), nullable=True, index=True)
+    staging_epg_id = Column(Integer, nullable=True, index=True)
+    retired_epg_id = Column(Integer, nullable=True, index=True)
 
     guide = relationship("Epg", back_populates="epg_channels")
 
@@ -81,7 +86,10 @@ class EpgChannelProgrammes(Base):
     """
 
     __tablename__ = "epg_channel_programmes"
-    __table_args__ = (Index("ix_epg_channel_programmes_epg_channel_id_start", "epg_channel_id", "start"),)
+    __table_args__ = (
+        Index("ix_epg_channel_programmes_epg_channel_id_start", "epg_channel_id", "start"),
+        Index("ix_epg_channel_programmes_epg_channel_id_start_ts_stop_ts", "epg_channel_id", "start_ts", "stop_ts"),
+    )
     id = Column(Integer, primary_key=True)
 
     channel_id = Column(Text, index=True, unique=False)
@@ -95,6 +103,9 @@ class EpgChannelProgrammes(Base):
     stop = Column(Text, index=False, unique=False)
     start_timestamp = Column(Text, index=False, unique=False)
     stop_timestamp = Column(Text, index=False, unique=False)
+    # Native epoch seconds mirrors of start_timestamp/stop_timestamp used for indexed range queries
+    start_ts = Column(BigInteger, nullable=True)
+    stop_ts = Column(BigInteger, nullable=True)
     categories = Column(Text, index=True, unique=False)
     # Extended optional XMLTV / TVHeadend supported metadata (all nullable / optional)
     summary = Column(Text, index=False, unique=False)
@@ -281,6 +292,7 @@ class XcVodItem(Base):
     direct_source = Column(Text, nullable=True)
     added = Column(String(64), nullable=True)
     summary_json = Column(Text, nullable=True)
+    payload_hash = Column(String(32), nullable=True)
     stream_probe_at = Column(DateTime, nullable=True, unique=False)
     stream_probe_details = Column(Text, nullable=True, unique=False)
 
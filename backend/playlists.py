@@ -2,6 +2,7 @@
 # -*- coding:utf-8 -*-
 import asyncio
 import base64
+import hashlib
 import json
 import logging
 import os
@@ -21,6 +22,7 @@ from backend.http_headers import (
     sanitise_headers,
     serialise_headers_json,
 )
+from backend.m3u_parser import iter_m3u_entry_batches
 from backend.models import (
     CsoEventLog,
     ChannelSuggestion,
@@ -34,10 +36,25 @@ from backend.models import (
     XcVodItem,
     db,
 )
+from backend.source_fetch import (
+    conditional_request_headers,
+    mark_source_imported,
+    response_validators,
+    source_unchanged_since_import,
+    write_fetch_state,
+)
+from backend.source_refresh import (
+    current_source_refresh_timings,
+    describe_source_refresh,
+    source_refresh_concurrency_limiter,
+    source_refresh_stage,
+    track_source_refresh,
+)
 from backend.stream_profiles import resolve_cso_profile_name
 from backend.streaming import build_configured_hls_proxy_url
 from backend.tvheadend.tvh_requests import get_tvh, network_template
 from backend.utils import convert_to_int, fast_url_hash
+from backend.xc.cache import XC_CATALOGUE_LIVE, invalidate_xc_catalogue
 from backend.xc_hosts import (
     first_xc_host,
     parse_xc_hosts,
@@ -314,6 +331,97 @@ async def _get_enabled_xc_accounts_async(playlist_id):
             return result.scalars().all()
 
 
+# Columns compared when deciding whether an existing playlist stream row needs updating.
+_PLAYLIST_STREAM_SYNC_COLUMNS = (
+    "name",
+    "url",
+    "channel_id",
+    "group_title",
+    "tvg_chno",
+    "tvg_id",
+    "tvg_logo",
+    "source_type",
+    "xc_stream_id",
+    "xc_category_id",
+    "xc_epg_channel_id",
+    "xc_tv_archive",
+    "xc_tv_archive_duration",
+)
+# Integer columns; providers often send these as strings, which must hash the same as the stored int.
+_PLAYLIST_STREAM_SYNC_INT_COLUMNS = ("tvg_chno", "xc_stream_id", "xc_category_id", "xc_tv_archive_duration")
+_PLAYLIST_STREAM_SYNC_BATCH_SIZE = 5000
+
+
+def _playlist_stream_fingerprint(row):
+    values = [row.get(column) for column in _PLAYLIST_STREAM_SYNC_COLUMNS]
+    # Normalise defaults so freshly parsed rows compare equal to what the DB stored for them.
+    values[_PLAYLIST_STREAM_SYNC_COLUMNS.index("xc_tv_archive")] = bool(row.get("xc_tv_archive"))
+    for column in _PLAYLIST_STREAM_SYNC_INT_COLUMNS:
+        values[_PLAYLIST_STREAM_SYNC_COLUMNS.index(column)] = convert_to_int(row.get(column), None)
+    payload = json.dumps(values, separators=(",", ":"), default=str)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).digest()
+
+
+async def sync_playlist_stream_rows(session, playlist_id, row_batches):
+    """
+    Reconcile the stored streams of a playlist with freshly imported rows, matching on url_hash.
+
+    Unchanged rows keep their ids, changed rows are updated in place, new rows are inserted
+    and rows that have vanished upstream are deleted. ``row_batches`` is an async iterable of
+    lists of row dicts. Returns added/changed/removed/unchanged counts.
+    """
+    existing_by_hash = {}
+    sync_columns = [getattr(PlaylistStreams, column) for column in _PLAYLIST_STREAM_SYNC_COLUMNS]
+    result = await session.stream(
+        select(PlaylistStreams.id, PlaylistStreams.url_hash, *sync_columns)
+        .where(PlaylistStreams.playlist_id == playlist_id)
+        .order_by(PlaylistStreams.id.asc())
+        .execution_options(yield_per=_PLAYLIST_STREAM_SYNC_BATCH_SIZE)
+    )
+    async for partition in result.mappings().partitions():
+        for row in partition:
+            existing_by_hash.setdefault(row["url_hash"], []).append((row["id"], _playlist_stream_fingerprint(row)))
+
+    stats = {"added": 0, "changed": 0, "removed": 0, "unchanged": 0}
+    async for batch in row_batches:
+        inserts = []
+        updates = []
+        for row in batch:
+            candidates = existing_by_hash.get(row["url_hash"])
+            if not candidates:
+                inserts.append(row)
+                continue
+            fingerprint = _playlist_stream_fingerprint(row)
+            match_index = next(
+                (index for index, (_, existing_fp) in enumerate(candidates) if existing_fp == fingerprint),
+                None,
+            )
+            if match_index is not None:
+                candidates.pop(match_index)
+                stats["unchanged"] += 1
+                continue
+            existing_id, _ = candidates.pop(0)
+            updates.append({**row, "id": existing_id})
+        if inserts:
+            await session.execute(insert(PlaylistStreams), inserts)
+            stats["added"] += len(inserts)
+        if updates:
+            await session.execute(update(PlaylistStreams), updates)
+            stats["changed"] += len(updates)
+
+    stale_ids = [existing_id for candidates in existing_by_hash.values() for existing_id, _ in candidates]
+    for offset in range(0, len(stale_ids), _PLAYLIST_STREAM_SYNC_BATCH_SIZE):
+        chunk = stale_ids[offset : offset + _PLAYLIST_STREAM_SYNC_BATCH_SIZE]
+        await session.execute(delete(PlaylistStreams).where(PlaylistStreams.id.in_(chunk)))
+    stats["removed"] = len(stale_ids)
+    return stats
+
+
+async def _iter_row_batches(rows, batch_size=_PLAYLIST_STREAM_SYNC_BATCH_SIZE):
+    for offset in range(0, len(rows), batch_size):
+        yield rows[offset : offset + batch_size]
+
+
 async def _import_xc_playlist_streams(settings, playlist):
     host_urls = parse_xc_hosts(playlist.url)
     account = await _get_primary_xc_account_async(playlist.id)
@@ -330,78 +438,80 @@ async def _import_xc_playlist_streams(settings, playlist):
     categories = []
     streams = []
 
-    async with aiohttp.ClientSession(headers=headers) as session:
-        last_error = None
-        for candidate_host in host_urls:
-            try:
-                auth_info = await _xc_request(
-                    session,
-                    candidate_host,
-                    {
-                        "username": account.username,
-                        "password": account.password,
-                    },
-                )
-                if not isinstance(auth_info, dict) or not auth_info.get("user_info"):
-                    logger.warning("XC auth failed for playlist %s host=%s", playlist.id, candidate_host)
-                    continue
+    # Hold the provider's per-host download slot only while the live catalogue is being fetched.
+    async with source_refresh_stage("download", url=host_urls[0]):
+        async with aiohttp.ClientSession(headers=headers) as session:
+            last_error = None
+            for candidate_host in host_urls:
+                try:
+                    auth_info = await _xc_request(
+                        session,
+                        candidate_host,
+                        {
+                            "username": account.username,
+                            "password": account.password,
+                        },
+                    )
+                    if not isinstance(auth_info, dict) or not auth_info.get("user_info"):
+                        logger.warning("XC auth failed for playlist %s host=%s", playlist.id, candidate_host)
+                        continue
 
-                candidate_categories = await _xc_request(
-                    session,
-                    candidate_host,
-                    {
-                        "username": account.username,
-                        "password": account.password,
-                        "action": "get_live_categories",
-                    },
-                )
-                if not isinstance(candidate_categories, list):
-                    logger.warning(
-                        "XC categories response invalid for playlist %s host=%s",
-                        playlist.id,
+                    candidate_categories = await _xc_request(
+                        session,
                         candidate_host,
+                        {
+                            "username": account.username,
+                            "password": account.password,
+                            "action": "get_live_categories",
+                        },
                     )
-                    continue
+                    if not isinstance(candidate_categories, list):
+                        logger.warning(
+                            "XC categories response invalid for playlist %s host=%s",
+                            playlist.id,
+                            candidate_host,
+                        )
+                        continue
 
-                candidate_streams = await _xc_request(
-                    session,
-                    candidate_host,
-                    {
-                        "username": account.username,
-                        "password": account.password,
-                        "action": "get_live_streams",
-                    },
-                )
-                if not isinstance(candidate_streams, list):
+                    candidate_streams = await _xc_request(
+                        session,
+                        candidate_host,
+                        {
+                            "username": account.username,
+                            "password": account.password,
+                            "action": "get_live_streams",
+                        },
+                    )
+                    if not isinstance(candidate_streams, list):
+                        logger.warning(
+                            "XC streams response invalid for playlist %s host=%s",
+                            playlist.id,
+                            candidate_host,
+                        )
+                        continue
+
+                    host_url = candidate_host
+                    categories = candidate_categories
+                    streams = candidate_streams
+                    break
+                except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as exc:
+                    last_error = exc
                     logger.warning(
-                        "XC streams response invalid for playlist %s host=%s",
+                        "XC host attempt failed for playlist %s host=%s error=%s",
                         playlist.id,
                         candidate_host,
+                        exc,
                     )
                     continue
 
-                host_url = candidate_host
-                categories = candidate_categories
-                streams = candidate_streams
-                break
-            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as exc:
-                last_error = exc
-                logger.warning(
-                    "XC host attempt failed for playlist %s host=%s error=%s",
-                    playlist.id,
-                    candidate_host,
-                    exc,
-                )
-                continue
-
-        if not host_url:
-            if last_error:
-                logger.error("XC host attempts failed for playlist %s error=%s", playlist.id, last_error)
-            else:
-                logger.error("XC host attempts failed for playlist %s", playlist.id)
-            return False
+            if not host_url:
+                if last_error:
+                    logger.error("XC host attempts failed for playlist %s error=%s", playlist.id, last_error)
+                else:
+                    logger.error("XC host attempts failed for playlist %s", playlist.id)
+                return False
 
-        category_map = {str(c.get("category_id")): c.get("category_name") for c in categories}
+            category_map = {str(c.get("category_id")): c.get("category_name") for c in categories}
 
     items = []
     seen_items = {}
@@ -433,7 +543,7 @@ async def _import_xc_playlist_streams(settings, playlist):
             "tvg_id": epg_id,
             "tvg_logo": tvg_logo,
             "source_type": XC_ACCOUNT_TYPE,
-            "xc_stream_id": stream_id,
+            "xc_stream_id": convert_to_int(stream_id, None),
             "xc_category_id": int(category_id) if category_id is not None and str(category_id).isdigit() else None,
             "xc_epg_channel_id": (stream.get("epg_channel_id") or "").strip() or None,
             "xc_tv_archive": bool(convert_to_int(stream.get("tv_archive"), 0)),
@@ -468,16 +578,14 @@ async def _import_xc_playlist_streams(settings, playlist):
 
     items = list(seen_items.values())
 
-    async with Session() as session:
-        async with session.begin():
-            stmt = delete(PlaylistStreams).where(PlaylistStreams.playlist_id == playlist.id)
-            await session.execute(stmt)
-            if items:
-                await session.execute(insert(PlaylistStreams), items)
-            await session.commit()
+    async with source_refresh_stage("write"):
+        async with Session() as session:
+            async with session.begin():
+                sync_stats = await sync_playlist_stream_rows(session, playlist.id, _iter_row_batches(items))
+                await session.commit()
 
-    logger.info("Imported %s XC streams for playlist #%s", len(items), playlist.id)
-    return True
+    logger.info("Imported %s XC streams for playlist #%s (%s)", len(items), playlist.id, sync_stats)
+    return sync_stats
 
 
 async def read_config_all_playlists(config, output_for_export=False):
@@ -644,6 +752,7 @@ async def add_new_playlist(config, data):
             await session.flush()
             if account_type == XC_ACCOUNT_TYPE:
                 await _upsert_xc_accounts(session, playlist, data)
+    invalidate_xc_catalogue()
     return playlist.id
 
 
@@ -688,6 +797,7 @@ async def update_playlist(config, playlist_id, data):
             playlist.hls_proxy_path = data.get("hls_proxy_path", playlist.hls_proxy_path)
             if playlist.account_type == XC_ACCOUNT_TYPE:
                 await _upsert_xc_accounts(session, playlist, data)
+    invalidate_xc_catalogue()
 
 
 def _extract_xc_accounts_payload(data):
@@ -791,14 +901,17 @@ async def delete_playlist(config, playlist_id):
             await session.delete(playlist)
     if affected_vod_group_ids:
         try:
-            from backend.vod import rebuild_vod_group_cache, queue_vod_category_strm_sync
+            from backend.vod import queue_vod_category_strm_sync, rebuild_vod_group_cache, record_vod_group_changeset
 
             for group_id in affected_vod_group_ids:
+                # The playlist's sources are gone without a changeset, so these groups need a full rebuild.
+                record_vod_group_changeset(group_id)
                 await rebuild_vod_group_cache(group_id)
                 await queue_vod_category_strm_sync(group_id)
         except Exception:
             logger.exception("Failed to rebuild VOD group caches after deleting playlist #%s", playlist_id)
     _clear_playlist_health(config, playlist_id)
+    invalidate_xc_catalogue()
     return net_uuids
 
 
@@ -848,6 +961,10 @@ def _resolve_hls_proxy_headers(playlist_info):
 
 
 async def download_playlist_file(settings, url, output, source_headers=None):
+    """
+    Download a playlist into ``output`` using a conditional request against the cached copy.
+    Returns False when the upstream reported the cached copy is still current, otherwise True.
+    """
     logger.info("Downloading Playlist from url - '%s'", url)
     if not os.path.exists(os.path.dirname(output)):
         os.makedirs(os.path.dirname(output))
@@ -859,12 +976,17 @@ async def download_playlist_file(settings, url, output, source_headers=None):
     headers.update(sanitise_headers(source_headers))
     if not headers.get("User-Agent"):
         headers["User-Agent"] = _resolve_user_agent(settings, None)
+    headers.update(conditional_request_headers(output, url))
+    part_file = f"{output}.part"
     timeout = aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=300)
     last_error = None
     for attempt in range(1, 4):
         try:
             async with aiohttp.ClientSession(timeout=timeout) as session:
                 async with session.get(url, headers=headers, allow_redirects=True) as response:
+                    if response.status == 304:
+                        logger.info("Playlist at url '%s' is unchanged since the last download.", url)
+                        return False
                     if response.status < 200 or response.status >= 400:
                         # Some providers return non-standard status codes but still send a valid M3U.
                         peek = b""
@@ -879,12 +1001,15 @@ async def download_playlist_file(settings, url, output, source_headers=None):
                                 response.status,
                                 url,
                             )
-                            async with aiofiles.open(output, "wb") as f:
+                            async with aiofiles.open(part_file, "wb") as f:
                                 if peek:
                                     await f.write(peek)
                                 async for chunk in response.content.iter_chunked(8192):
                                     await f.write(chunk)
-                            return output
+                            os.replace(part_file, output)
+                            # Validators from a non-standard status are not trusted for later revalidation.
+                            await asyncio.to_thread(write_fetch_state, output, response_validators(url, {}))
+                            return True
 
                         body_preview = ""
                         try:
@@ -906,10 +1031,12 @@ async def download_playlist_file(settings, url, output, source_headers=None):
                             headers=response.headers,
                         )
 
-                    async with aiofiles.open(output, "wb") as f:
+                    async with aiofiles.open(part_file, "wb") as f:
                         async for chunk in response.content.iter_chunked(8192):
                             await f.write(chunk)
-            return output
+                    os.replace(part_file, output)
+                    await asyncio.to_thread(write_fetch_state, output, response_validators(url, response.headers))
+            return True
         except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
             last_error = exc
             logger.warning(
@@ -923,73 +1050,84 @@ async def download_playlist_file(settings, url, output, source_headers=None):
     raise last_error
 
 
+def _m3u_entry_to_stream_row(playlist_id, name, url, attributes):
+    tvg_chno = attributes.get("tvg-chno")
+    try:
+        tvg_channel_number = int(tvg_chno) if tvg_chno is not None else None
+    except (TypeError, ValueError):
+        tvg_channel_number = None
+    return {
+        "playlist_id": playlist_id,
+        "name": name,
+        "url": url,
+        "url_hash": fast_url_hash(url),
+        "channel_id": attributes.get("channel-id"),
+        "group_title": attributes.get("group-title"),
+        "tvg_chno": tvg_channel_number,
+        "tvg_id": attributes.get("tvg-id"),
+        "tvg_logo": attributes.get("tvg-logo"),
+        "source_type": M3U_ACCOUNT_TYPE,
+        "xc_stream_id": None,
+        "xc_category_id": None,
+    }
+
+
 async def store_playlist_streams(config, playlist_id):
     m3u_file = os.path.join(config.config_path, "cache", "playlists", f"{playlist_id}.m3u")
     if not os.path.exists(m3u_file):
         logger.error("No such file '%s'", m3u_file)
         return False
-    # Read cache file contents asynchronously
-    async with aiofiles.open(m3u_file, mode="r", encoding="utf8", errors="ignore") as f:
-        contents = await f.read()
-    # noinspection PyPackageRequirements
-    from ipytv import playlist
+    logger.info(
+        "Updating list of available streams for playlist #%s from path - '%s'",
+        playlist_id,
+        m3u_file,
+    )
+    # The M3U is parsed line by line on a worker thread one batch at a time, so memory
+    # stays flat and the event loop keeps running between batches.
+    batches = iter_m3u_entry_batches(m3u_file)
+    stream_count = 0
+
+    async def parsed_row_batches():
+        nonlocal stream_count
+        while True:
+            batch = await asyncio.to_thread(next, batches, None)
+            if batch is None:
+                return
+            items = [_m3u_entry_to_stream_row(playlist_id, *entry) for entry in batch]
+            stream_count += len(items)
+            yield items
 
-    pl = playlist.loads(contents)
     async with Session() as session:
         async with session.begin():
-            # Delete all existing playlist streams
-            stmt = delete(PlaylistStreams).where(PlaylistStreams.playlist_id == playlist_id)
-            await session.execute(stmt)
-            # Add an updated list of streams from the M3U file to the DB
-            logger.info(
-                "Updating list of available streams for playlist #%s from path - '%s'",
-                playlist_id,
-                m3u_file,
-            )
-            items = []
-            for stream in pl:
-                tvg_chno = stream.attributes.get("tvg-chno")
-                try:
-                    tvg_channel_number = int(tvg_chno) if tvg_chno is not None else None
-                except (TypeError, ValueError):
-                    tvg_channel_number = None
-                items.append(
-                    {
-                        "playlist_id": playlist_id,
-                        "name": stream.name,
-                        "url": stream.url,
-                        "url_hash": fast_url_hash(stream.url),
-                        "channel_id": stream.attributes.get("channel-id"),
-                        "group_title": stream.attributes.get("group-title"),
-                        "tvg_chno": tvg_channel_number,
-                        "tvg_id": stream.attributes.get("tvg-id"),
-                        "tvg_logo": stream.attributes.get("tvg-logo"),
-                        "source_type": M3U_ACCOUNT_TYPE,
-                        "xc_stream_id": None,
-                        "xc_category_id": None,
-                    }
-                )
-            # Perform bulk insert
-            await session.execute(insert(PlaylistStreams), items)
+            sync_stats = await sync_playlist_stream_rows(session, playlist_id, parsed_row_batches())
             # Commit all updates to playlist sources
             await session.commit()
-            logger.info(
-                "Successfully imported %s streams from path - '%s'",
-                len(items),
-                m3u_file,
-            )
+    logger.info(
+        "Successfully imported %s streams from path - '%s' (%s)",
+        stream_count,
+        m3u_file,
+        sync_stats,
+    )
+    return sync_stats
 
 
-async def import_playlist_data(config, playlist_id):
+async def import_playlist_data(config, playlist_id, force=False):
+    """Download and import a playlist. ``force`` re-imports even when the downloaded content is unchanged."""
     try:
         playlist_id = int(playlist_id)
     except (TypeError, ValueError) as err:
         raise ValueError(f"Invalid playlist id: {playlist_id}") from err
+    async with track_source_refresh("playlist", playlist_id):
+        return await _import_playlist_data(config, playlist_id, force=force)
+
+
+async def _import_playlist_data(config, playlist_id, force=False):
     settings = config.read_settings()
     async with Session() as session:
         async with session.begin():
             result = await session.execute(select(Playlist).where(Playlist.id == playlist_id))
             playlist = result.scalar_one()
+    describe_source_refresh(f"Playlist: {playlist.name}" if playlist.name else None)
     attempt_ts = int(time.time())
     source_url = playlist.url
 
@@ -997,8 +1135,8 @@ async def import_playlist_data(config, playlist_id):
         if playlist.account_type == XC_ACCOUNT_TYPE:
             logger.info("Updating XC playlist #%s from host - '%s'", playlist_id, playlist.url)
             xc_started_at = time.perf_counter()
-            ok = await _import_xc_playlist_streams(settings, playlist)
-            if not ok:
+            sync_stats = await _import_xc_playlist_streams(settings, playlist)
+            if not sync_stats:
                 raise RuntimeError("Failed to import Xtream Codes source")
             logger.debug(
                 "XC live import completed for playlist #%s in %.2fs",
@@ -1009,6 +1147,7 @@ async def import_playlist_data(config, playlist_id):
             from backend.channel_suggestions import update_channel_suggestions_for_playlist
 
             vod_started_at = time.perf_counter()
+            # The VOD sync enters its own download and write stages.
             await sync_xc_vod_catalogue(playlist)
             logger.debug(
                 "XC VOD sync completed for playlist #%s in %.2fs",
@@ -1016,7 +1155,8 @@ async def import_playlist_data(config, playlist_id):
                 time.perf_counter() - vod_started_at,
             )
             suggestions_started_at = time.perf_counter()
-            await update_channel_suggestions_for_playlist(playlist_id)
+            async with source_refresh_stage("write"):
+                await update_channel_suggestions_for_playlist(playlist_id)
             logger.debug(
                 "XC channel suggestions refresh completed for playlist #%s in %.2fs",
                 playlist_id,
@@ -1037,9 +1177,11 @@ async def import_playlist_data(config, playlist_id):
                     "last_attempt_at": attempt_ts,
                     "last_success_at": int(time.time()),
                     "source_url": source_url,
+                    "stream_changes": sync_stats,
+                    "refresh_stage_seconds": current_source_refresh_timings(),
                 },
             )
-            return
+            return True
 
         # Download playlist data and save to YAML cache file
         logger.info(
@@ -1049,22 +1191,48 @@ async def import_playlist_data(config, playlist_id):
         )
         start_time = time.time()
         m3u_file = os.path.join(config.config_path, "cache", "playlists", f"{playlist_id}.m3u")
-        await download_playlist_file(
-            settings,
-            playlist.url,
-            m3u_file,
-            source_headers=_resolve_source_request_headers(settings, playlist),
-        )
+        async with source_refresh_stage("download", url=playlist.url):
+            downloaded = await download_playlist_file(
+                settings,
+                playlist.url,
+                m3u_file,
+                source_headers=_resolve_source_request_headers(settings, playlist),
+            )
         execution_time = time.time() - start_time
         logger.info(
             "Updated M3U file for playlist #%s was downloaded in '%s' seconds",
             playlist_id,
             int(execution_time),
         )
+        async with source_refresh_stage("parse"):
+            unchanged, content_sha256 = await asyncio.to_thread(source_unchanged_since_import, m3u_file)
+        # Only scheduled refreshes skip unchanged content; a manual update always re-imports.
+        if unchanged and not force:
+            logger.info(
+                "M3U content for playlist #%s is unchanged since the last import (not_modified=%s). Skipping import.",
+                playlist_id,
+                not downloaded,
+            )
+            _set_playlist_health(
+                config,
+                playlist_id,
+                {
+                    "status": "ok",
+                    "error": None,
+                    "http_status": None,
+                    "last_attempt_at": attempt_ts,
+                    "last_success_at": int(time.time()),
+                    "source_url": source_url,
+                    "content_unchanged": True,
+                },
+            )
+            return False
         # Parse the M3U file and cache the data in a YAML file for faster parsing
         logger.info("Importing updated data for playlist #%s", playlist_id)
         start_time = time.time()
-        await store_playlist_streams(config, playlist_id)
+        # The M3U parser feeds the stream sync batch by batch, so parsing runs inside the write stage.
+        async with source_refresh_stage("write"):
+            sync_stats = await store_playlist_streams(config, playlist_id)
         execution_time = time.time() - start_time
         logger.info(
             "Updated data for playlist #%s was imported in '%s' seconds",
@@ -1073,9 +1241,12 @@ async def import_playlist_data(config, playlist_id):
         )
         from backend.channel_suggestions import update_channel_suggestions_for_playlist
 
-        await update_channel_suggestions_for_playlist(playlist_id)
+        async with source_refresh_stage("write"):
+            await update_channel_suggestions_for_playlist(playlist_id)
         # Publish changes to TVH
         await publish_playlist_networks(config)
+        await asyncio.to_thread(mark_source_imported, m3u_file, content_sha256)
+        invalidate_xc_catalogue(XC_CATALOGUE_LIVE)
         _set_playlist_health(
             config,
             playlist_id,
@@ -1086,8 +1257,12 @@ async def import_playlist_data(config, playlist_id):
                 "last_attempt_at": attempt_ts,
                 "last_success_at": int(time.time()),
                 "source_url": source_url,
+                "stream_changes": sync_stats or None,
+                "content_unchanged": False,
+                "refresh_stage_seconds": current_source_refresh_timings(),
             },
         )
+        return True
     except Exception as exc:
         _set_playlist_health(
             config,
@@ -1109,12 +1284,15 @@ async def import_playlist_data_for_all_playlists(config):
     playlist_health_map = _read_playlist_health_map(config)
     updated_playlist_ids = []
     skipped_not_due = 0
+    skipped_unchanged = 0
     skipped_off = 0
+    failed = 0
 
     async with Session() as session:
         result = await session.execute(select(Playlist.id, Playlist.update_schedule).where(Playlist.enabled))
         playlist_rows = result.all()
 
+    due_playlist_ids = []
     for playlist_id, configured_schedule in playlist_rows:
         schedule = _parsed_playlist_update_schedule(configured_schedule)
         if schedule == "off":
@@ -1140,14 +1318,35 @@ async def import_playlist_data_for_all_playlists(config):
             skipped_not_due += 1
             continue
 
-        await import_playlist_data(config, playlist_id)
-        updated_playlist_ids.append(int(playlist_id))
+        due_playlist_ids.append(int(playlist_id))
+
+    # Refresh due playlists concurrently. Each refresh is further bounded per stage and per upstream host.
+    semaphore = source_refresh_concurrency_limiter()
+
+    async def import_one(playlist_id):
+        async with semaphore:
+            try:
+                return await import_playlist_data(config, playlist_id)
+            except Exception as e:
+                logger.error("Failed to import playlist #%s, continuing with the others. Error: %s", playlist_id, e)
+                return None
+
+    results = await asyncio.gather(*(import_one(playlist_id) for playlist_id in due_playlist_ids))
+    for playlist_id, imported in zip(due_playlist_ids, results):
+        if imported:
+            updated_playlist_ids.append(playlist_id)
+        elif imported is False:
+            skipped_unchanged += 1
+        else:
+            failed += 1
 
     logger.info(
-        "Playlist update check complete updated=%s skipped_not_due=%s skipped_off=%s",
+        "Playlist update check complete updated=%s skipped_not_due=%s skipped_unchanged=%s skipped_off=%s failed=%s",
         len(updated_playlist_ids),
         skipped_not_due,
+        skipped_unchanged,
         skipped_off,
+        failed,
     )
     return updated_playlist_ids
 
@@ -1328,7 +1527,33 @@ async def delete_playlist_network_in_tvh(config, net_uuid):
         await tvh.delete_network(net_uuid)
 
 
+_PLAYLIST_NETWORK_PUBLISH_LOCK = asyncio.Lock()
+_queued_playlist_network_publish = None
+
+
 async def publish_playlist_networks(config):
+    """
+    Publish every playlist/XC account network to TVH. Runs are serialised so concurrent refreshes can not
+    both create a network for the same playlist; callers arriving while a run is already queued share it.
+    """
+    global _queued_playlist_network_publish
+    queued = _queued_playlist_network_publish
+    if queued is None or queued.done():
+        queued = asyncio.create_task(_run_queued_playlist_network_publish(config))
+        _queued_playlist_network_publish = queued
+    return await asyncio.shield(queued)
+
+
+async def _run_queued_playlist_network_publish(config):
+    global _queued_playlist_network_publish
+    async with _PLAYLIST_NETWORK_PUBLISH_LOCK:
+        if _queued_playlist_network_publish is asyncio.current_task():
+            # From here on, new callers need a fresh run that sees their changes.
+            _queued_playlist_network_publish = None
+        await _publish_playlist_networks_locked(config)
+
+
+async def _publish_playlist_networks_locked(config):
     logger.info("Publishing all playlist networks to TVH")
     async with await get_tvh(config) as tvh:
         async with Session() as session:
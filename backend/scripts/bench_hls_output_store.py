@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+"""
+Micro-benchmark filesystem calls per served HLS segment: HlsOutputStore against the previous polling reads.
+
+A fake ffmpeg writes segments and the playlist into a temporary directory (temp file then rename, rotating
+old segments out) while a number of viewers poll the playlist and fetch every new segment. Filesystem calls
+made by the read path are counted from Python (``open``/``scandir`` audit events and ``os.stat`` calls,
+which ``Path.exists``/``is_file``/``stat`` go through); the writer's own calls are excluded. The store's
+``DirEntry.stat`` of the playlist (once per directory scan) bypasses ``os.stat`` and is not counted.
+
+    python -m backend.scripts.bench_hls_output_store [--viewers 30] [--seconds 20] [--segment-seconds 1]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from backend.cso.hls_output_store import HlsOutputStore
+
+PLAYLIST_NAME = "index.m3u8"
+LIST_SIZE = 6
+
+
+class FsCallCounter:
+    def __init__(self):
+        self.counts = Counter()
+        self.writer_thread = None
+        self.writer_active = False
+        self._real_stat = os.stat
+
+    def install(self):
+        sys.addaudithook(self._on_audit)
+        real_stat = self._real_stat
+
+        def _counting_stat(*args, **kwargs):
+            self._count("stat")
+            return real_stat(*args, **kwargs)
+
+        os.stat = _counting_stat
+
+    def uninstall(self):
+        os.stat = self._real_stat
+
+    def _count(self, kind):
+        if self.writer_active and threading.get_ident() == self.writer_thread:
+            return
+        self.counts[kind] += 1
+
+    def _on_audit(self, event, args):
+        if event == "open":
+            self._count("open")
+        elif event in {"os.scandir", "os.listdir"}:
+            self._count("scandir")
+
+    def reset(self):
+        self.counts.clear()
+
+
+class FakeFfmpegWriter:
+    def __init__(self, output_dir: Path, counter: FsCallCounter, segment_bytes: int, segment_seconds: float):
+        self.output_dir = output_dir
+        self.counter = counter
+        self.payload = os.urandom(segment_bytes)
+        self.segment_seconds = segment_seconds
+        self.sequence = 0
+
+    def _write_atomic(self, name, data, mode="wb"):
+        tmp_path = self.output_dir / f"{name}.tmp"
+        with open(tmp_path, mode) as handle:
+            handle.write(data)
+        os.replace(tmp_path, self.output_dir / name)
+
+    def write_next(self):
+        self.counter.writer_thread = threading.get_ident()
+        self.counter.writer_active = True
+        try:
+            name = f"{self.sequence:06d}.ts"
+            self._write_atomic(name, self.payload)
+            first = max(0, self.sequence - LIST_SIZE + 1)
+            lines = [
+                "#EXTM3U",
+                "#EXT-X-VERSION:3",
+                f"#EXT-X-TARGETDURATION:{int(self.segment_seconds + 1)}",
+                f"#EXT-X-MEDIA-SEQUENCE:{first}",
+            ]
+            for sequence in range(first, self.sequence + 1):
+                lines.append(f"#EXTINF:{self.segment_seconds:.3f},")
+                lines.append(f"{sequence:06d}.ts")
+            self._write_atomic(PLAYLIST_NAME, ("\n".join(lines) + "\n").encode("utf-8"))
+            stale = self.output_dir / f"{self.sequence - LIST_SIZE - 3:06d}.ts"
+            if self.sequence - LIST_SIZE - 3 >= 0:
+                try:
+                    os.unlink(stale)
+                except FileNotFoundError:
+                    pass
+            self.sequence += 1
+        finally:
+            self.counter.writer_active = False
+
+    async def run(self, stop_event):
+        while not stop_event.is_set():
+            self.write_next()
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=self.segment_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+
+class PollingReader:
+    """The read path before HlsOutputStore: per-request playlist validation and 50 ms segment polling."""
+
+    def __init__(self, output_dir: Path):
+        self.output_dir = output_dir
+        self.playlist_path = output_dir / PLAYLIST_NAME
+        self._last_good_playlist_text = None
+
+    async def read_playlist_text(self):
+        if not self.playlist_path.exists():
+            return self._last_good_playlist_text
+        try:
+            playlist_text = await asyncio.to_thread(self.playlist_path.read_text, "utf-8")
+        except Exception:
+            return self._last_good_playlist_text
+        segment_names = _playlist_segment_names(playlist_text)
+        if not segment_names:
+            return self._last_good_playlist_text
+        for segment_name in segment_names:
+            segment_path = (self.output_dir / segment_name).resolve()
+            if not str(segment_path).startswith(str(self.output_dir.resolve())):
+                return self._last_good_playlist_text
+            if not segment_path.exists() or not segment_path.is_file():
+                return self._last_good_playlist_text
+            try:
+                if int(segment_path.stat().st_size or 0) <= 0:
+                    return self._last_good_playlist_text
+            except Exception:
+                return self._last_good_playlist_text
+        self._last_good_playlist_text = playlist_text
+        return playlist_text
+
+    async def read_segment_bytes(self, name):
+        segment_path = (self.output_dir / name).resolve()
+        if not str(segment_path).startswith(str(self.output_dir.resolve())):
+            return None
+        deadline = time.time() + 5.0
+        while time.time() < deadline:
+            if segment_path.exists() and segment_path.is_file():
+                try:
+                    if int(segment_path.stat().st_size or 0) > 0:
+                        break
+                except Exception:
+                    pass
+            await asyncio.sleep(0.05)
+        if not segment_path.exists() or not segment_path.is_file():
+            return None
+        return await asyncio.to_thread(segment_path.read_bytes)
+
+    async def close(self):
+        return None
+
+
+class StoreReader:
+    def __init__(self, output_dir: Path):
+        self.store = HlsOutputStore(output_dir, playlist_name=PLAYLIST_NAME, max_segments=LIST_SIZE + 3)
+        self.store.start()
+
+    async def read_playlist_text(self):
+        return self.store.playlist_text
+
+    async def read_segment_bytes(self, name):
+        return await self.store.read_segment(name, timeout_seconds=5.0)
+
+    async def close(self):
+        await self.store.stop()
+
+
+def _playlist_segment_names(playlist_text):
+    return [
+        line.strip().split("?", 1)[0]
+        for line in str(playlist_text or "").splitlines()
+        if line.strip() and not line.strip().startswith("#")
+    ]
+
+
+async def _viewer(reader, stop_event, poll_seconds, stats):
+    fetched = set()
+    while not stop_event.is_set():
+        playlist_text = await reader.read_playlist_text()
+        stats["playlist_requests"] += 1
+        for name in _playlist_segment_names(playlist_text):
+            if name in fetched:
+                continue
+            data = await reader.read_segment_bytes(name)
+            fetched.add(name)
+            if data:
+                stats["segments_served"] += 1
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=poll_seconds)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def _run_mode(mode, args, counter):
+    with tempfile.TemporaryDirectory(prefix="tic-hls-bench-") as tmp:
+        output_dir = Path(tmp)
+        writer = FakeFfmpegWriter(output_dir, counter, int(args.segment_kib * 1024), args.segment_seconds)
+        # Prime the directory so viewers join a running output, as they would in production.
+        for _ in range(LIST_SIZE):
+            writer.write_next()
+        reader = StoreReader(output_dir) if mode == "store" else PollingReader(output_dir)
+        await asyncio.sleep(0.2)
+        counter.reset()
+        stats = Counter()
+        stop_event = asyncio.Event()
+        tasks = [asyncio.create_task(writer.run(stop_event))]
+        tasks += [
+            asyncio.create_task(_viewer(reader, stop_event, args.segment_seconds / 2, stats))
+            for _ in range(args.viewers)
+        ]
+        await asyncio.sleep(args.seconds)
+        stop_event.set()
+        await asyncio.gather(*tasks)
+        counts = dict(counter.counts)
+        await reader.close()
+    served = max(1, stats["segments_served"])
+    total_calls = sum(counts.values())
+    return {
+        "mode": mode,
+        "viewers": args.viewers,
+        "segments_served": stats["segments_served"],
+        "playlist_requests": stats["playlist_requests"],
+        "fs_calls": total_calls,
+        "fs_calls_per_segment": round(total_calls / served, 2),
+        "fs_calls_per_second": round(total_calls / args.seconds, 1),
+        "breakdown": counts,
+    }
+
+
+async def _run(args):
+    counter = FsCallCounter()
+    counter.install()
+    try:
+        for mode in ("polling", "store"):
+            print(await _run_mode(mode, args, counter), flush=True)
+    finally:
+        counter.uninstall()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--viewers", type=int, default=30)
+    parser.add_argument("--seconds", type=float, default=20.0, help="Measured duration per mode.")
+    parser.add_argument("--segment-seconds", type=float, default=1.0, help="Fake ffmpeg segment duration.")
+    parser.add_argument("--segment-kib", type=float, default=512, help="Size of each fake segment.")
+    args = parser.parse_args()
+    try:
+        asyncio.run(_run(args))
+    except Exception as exc:
+        print(f"[hls-output-bench] Failed: {exc}", file=sys.stderr)
+        raise
+
+
+if __name__ == "__main__":
+    main()
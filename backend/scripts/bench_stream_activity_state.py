@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+"""
+Benchmark stream activity persistence: snapshot + journal against the previous full JSON rewrite.
+
+The tracker is loaded with a number of concurrent sessions plus an hour of history. Each simulated persist
+tick touches every session and replaces a few with new ones, then saves. Reported per mode: bytes
+written, how long ``tracker.lock`` is held, and the worst event-loop stall during a save (the previous
+path serialised and fsynced on the loop).
+
+    python -m backend.scripts.bench_stream_activity_state [--sessions 500] [--history 1500] [--ticks 40]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from backend.stream_activity import StreamActivityTracker
+
+
+class TimedLock(asyncio.Lock):
+    """asyncio.Lock that records how long each acquisition is held."""
+
+    def __init__(self):
+        super().__init__()
+        self.held_seconds = []
+        self._acquired_at = None
+
+    async def acquire(self):
+        result = await super().acquire()
+        self._acquired_at = time.perf_counter()
+        return result
+
+    def release(self):
+        if self._acquired_at is not None:
+            self.held_seconds.append(time.perf_counter() - self._acquired_at)
+            self._acquired_at = None
+        super().release()
+
+
+def _session_entry(index, now):
+    connection_id = f"bench-{index:06d}"
+    return connection_id, {
+        "identity": f"http://127.0.0.1:9985/tic-hls-proxy/instance/{index % 40}/stream.m3u8",
+        "connection_id": connection_id,
+        "user_id": index % 25 + 1,
+        "username": f"user{index % 25 + 1}",
+        "stream_key": f"key{index % 25 + 1:04d}",
+        "ip_address": f"10.0.{index % 250}.{index % 200 + 1}",
+        "user_agent": "Mozilla/5.0 (SMART-TV; Linux; Tizen 6.5) AppleWebKit/537.36 (KHTML, like Gecko)",
+        "endpoint": "/tic-hls-proxy",
+        "started_at": now - 600,
+        "last_seen": now,
+        "channel_id": index % 40 + 1,
+        "channel_name": f"Channel {index % 40 + 1}",
+        "channel_logo_url": f"/tic-api/channels/{index % 40 + 1}/logo/logo.png",
+        "stream_name": f"Channel {index % 40 + 1} HD",
+        "source_url": f"http://provider.example/live/user/pass/{100000 + index}.ts",
+        "display_url": f"http://provider.example/live/***/***/{100000 + index}.ts",
+        "details": f"http://127.0.0.1:9985/tic-hls-proxy/instance/{index % 40}/stream.m3u8",
+        "related_identities": [f"http://127.0.0.1:9985/tic-hls-proxy/instance/{index % 40}/stream.m3u8"],
+        "client_hints": {"device": "tv", "player": "tivimate"},
+    }
+
+
+def _build_tracker(sessions, history):
+    tracker = StreamActivityTracker(activity_ttl=20)
+    now = time.time()
+    for index in range(sessions):
+        connection_id, entry = _session_entry(index, now)
+        tracker.sessions[connection_id] = entry
+    for index in range(sessions, sessions + history):
+        connection_id, entry = _session_entry(index, now - 1800)
+        tracker.history[connection_id] = {"last_seen": now - 1800, "entry": entry}
+    tracker.lock = TimedLock()
+    return tracker
+
+
+async def _full_rewrite_save(tracker, file_path, counters):
+    """The previous save_state: payload built under the lock, then serialised and fsynced on the loop."""
+    async with tracker.lock:
+        payload = {
+            "version": 3,
+            "saved_at": time.time(),
+            "sessions": tracker.sessions,
+            "history": tracker.history,
+        }
+    temp_path = f"{file_path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as fh:
+        json.dump(payload, fh, separators=(",", ":"), ensure_ascii=True)
+        fh.flush()
+        os.fsync(fh.fileno())
+        counters["bytes"] += fh.tell()
+    os.replace(temp_path, file_path)
+
+
+def _count_journal_writes(tracker, counters):
+    append_lines = tracker._append_journal_lines
+    write_snapshot = tracker._write_snapshot_file
+
+    def _append(journal_path, records):
+        written = append_lines(journal_path, records)
+        counters["bytes"] += written
+        return written
+
+    def _snapshot(file_path, data):
+        write_snapshot(file_path, data)
+        counters["bytes"] += len(data)
+        counters["compactions"] += 1
+
+    tracker._append_journal_lines = _append
+    tracker._write_snapshot_file = _snapshot
+
+
+async def _simulate_tick(tracker, churn, next_index):
+    now = time.time()
+    for connection_id in list(tracker.sessions):
+        await tracker.touch(connection_id)
+    for connection_id in list(tracker.sessions)[:churn]:
+        await tracker.stop(connection_id, perform_audit=False)
+    for _ in range(churn):
+        connection_id, entry = _session_entry(next_index, now)
+        next_index += 1
+        async with tracker.lock:
+            tracker.sessions[connection_id] = entry
+            tracker._journal_mark(connection_id)
+    return next_index
+
+
+async def _loop_lag_probe(stop_event, lags):
+    while not stop_event.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0.001)
+        lags.append(time.perf_counter() - started - 0.001)
+
+
+async def _run_mode(mode, args, work_dir):
+    tracker = _build_tracker(args.sessions, args.history)
+    file_path = os.path.join(work_dir, f"{mode}-stream_activity_state.json")
+    counters = {"bytes": 0, "compactions": 0}
+    if mode == "journal":
+        _count_journal_writes(tracker, counters)
+        # Start from a compacted snapshot, as load_state leaves it after a restart.
+        await tracker.save_state(file_path)
+        await tracker.compact()
+    else:
+        await _full_rewrite_save(tracker, file_path, {"bytes": 0})
+    counters["bytes"] = 0
+    counters["compactions"] = 0
+    next_index = args.sessions + args.history
+    save_lock_held = []
+    save_stalls = []
+    save_seconds = []
+    for _ in range(args.ticks):
+        next_index = await _simulate_tick(tracker, args.churn, next_index)
+        tracker.lock.held_seconds.clear()
+        lags = []
+        stop_event = asyncio.Event()
+        probe = asyncio.create_task(_loop_lag_probe(stop_event, lags))
+        await asyncio.sleep(0)
+        started = time.perf_counter()
+        if mode == "journal":
+            await tracker.save_state(file_path)
+        else:
+            await _full_rewrite_save(tracker, file_path, counters)
+        save_seconds.append(time.perf_counter() - started)
+        stop_event.set()
+        await probe
+        save_lock_held.append(sum(tracker.lock.held_seconds))
+        save_stalls.append(max(lags or [0.0]))
+    return {
+        "mode": mode,
+        "sessions": args.sessions,
+        "history": args.history,
+        "ticks": args.ticks,
+        "bytes_per_save": int(counters["bytes"] / args.ticks),
+        "compactions": counters["compactions"],
+        "lock_held_ms_p50": round(statistics.median(save_lock_held) * 1000, 3),
+        "lock_held_ms_max": round(max(save_lock_held) * 1000, 3),
+        "loop_stall_ms_max": round(max(save_stalls) * 1000, 2),
+        "save_ms_p50": round(statistics.median(save_seconds) * 1000, 2),
+    }
+
+
+async def _run(args):
+    with tempfile.TemporaryDirectory(prefix="tic-activity-bench-") as work_dir:
+        for mode in ("full_rewrite", "journal"):
+            print(await _run_mode(mode, args, work_dir), flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=500, help="Concurrent active sessions.")
+    parser.add_argument("--history", type=int, default=1500, help="History entries retained.")
+    parser.add_argument("--ticks", type=int, default=40, help="Persist ticks to simulate.")
+    parser.add_argument("--churn", type=int, default=5, help="Sessions stopped and started per tick.")
+    args = parser.parse_args()
+    try:
+        asyncio.run(_run(args))
+    except Exception as exc:
+        print(f"[stream-activity-bench] Failed: {exc}", file=sys.stderr)
+        raise
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+"""
+Benchmark CSO VOD cache fills: the aiohttp downloader against the previous requests + to_thread path.
+
+A local aiohttp server stands in for the upstream (Range aware, optional per-connection rate limit). For each
+path the given number of fills run concurrently while a probe measures how long an unrelated
+``asyncio.to_thread`` call waits for an executor thread. Reported per path: wall time, aggregate throughput,
+peak thread count and probe latency.
+
+    python -m backend.scripts.bench_vod_cache_download [--fills 12] [--size-mib 16] [--rate-mib 16]
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import aiofiles
+import requests
+from aiohttp import web
+
+from backend.cso.constants import VOD_CACHE_CHUNK_BYTES
+from backend.cso.types import CsoSource, VodCacheEntry
+from backend.cso.vod_cache import _run_vod_cache_download
+
+
+class StandInUpstream:
+    """Serves one in-memory payload with Range support, optionally throttled per connection."""
+
+    def __init__(self, size_bytes, rate_bytes_per_second):
+        self.payload = bytes(range(256)) * (size_bytes // 256) + bytes(size_bytes % 256)
+        self.rate_bytes_per_second = rate_bytes_per_second
+        self.runner = None
+        self.port = None
+
+    def url(self, name):
+        return f"http://127.0.0.1:{self.port}/{name}.mkv"
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/{name}.mkv", self._handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self.runner is not None:
+            await self.runner.cleanup()
+
+    async def _handle(self, request):
+        total = len(self.payload)
+        start = 0
+        status = 200
+        range_header = request.headers.get("Range", "")
+        if range_header.startswith("bytes="):
+            start_text = range_header[len("bytes=") :].split("-", 1)[0]
+            if start_text.isdigit():
+                start = min(int(start_text), total)
+                status = 206
+        headers = {"Content-Type": "video/x-matroska", "Content-Length": str(total - start)}
+        if status == 206:
+            headers["Content-Range"] = f"bytes {start}-{total - 1}/{total}"
+        response = web.StreamResponse(status=status, headers=headers)
+        await response.prepare(request)
+        step = 256 * 1024
+        started = time.monotonic()
+        sent = 0
+        for offset in range(start, total, step):
+            chunk = self.payload[offset : offset + step]
+            await response.write(chunk)
+            sent += len(chunk)
+            if self.rate_bytes_per_second:
+                ahead = sent / self.rate_bytes_per_second - (time.monotonic() - started)
+                if ahead > 0:
+                    await asyncio.sleep(ahead)
+        await response.write_eof()
+        return response
+
+
+async def _threaded_download(entry: VodCacheEntry):
+    """The pre-aiohttp fill loop: a blocking requests stream with one to_thread hop per chunk."""
+    http_session = requests.Session()
+    response = await asyncio.to_thread(
+        lambda: http_session.get(entry.upstream_url, headers={"Range": "bytes=0-"}, stream=True, timeout=(15, 30))
+    )
+    try:
+        entry.expected_size = int(response.headers.get("Content-Length") or 0)
+        iterator = response.iter_content(chunk_size=VOD_CACHE_CHUNK_BYTES)
+        async with aiofiles.open(entry.part_path, "wb") as handle:
+            while True:
+                chunk = await asyncio.to_thread(next, iterator, None)
+                if not chunk:
+                    break
+                await handle.write(chunk)
+                entry.bytes_written += len(chunk)
+                entry.progress_event.set()
+                entry.progress_event = asyncio.Event()
+            await handle.flush()
+        entry.complete = entry.bytes_written >= entry.expected_size
+    finally:
+        await asyncio.to_thread(response.close)
+        await asyncio.to_thread(http_session.close)
+
+
+async def _aiohttp_download(entry: VodCacheEntry):
+    await _run_vod_cache_download(entry, owner_key=f"bench-{entry.key}")
+
+
+async def _probe_executor(stop_event, samples):
+    while not stop_event.is_set():
+        started = time.monotonic()
+        await asyncio.to_thread(time.sleep, 0)
+        samples.append(time.monotonic() - started)
+        await asyncio.sleep(0.05)
+
+
+async def _sample_threads(stop_event, peak):
+    while not stop_event.is_set():
+        peak[0] = max(peak[0], threading.active_count())
+        await asyncio.sleep(0.01)
+
+
+async def _run_path(name, download, upstream, fills, work_dir):
+    entries = []
+    for index in range(fills):
+        source = CsoSource(id=index + 1, source_type="vod_movie", url=upstream.url(f"{name}-{index}"), playlist_id=None)
+        entries.append(
+            VodCacheEntry(
+                key=f"{name}-{index}",
+                source=source,
+                upstream_url=source.url,
+                final_path=work_dir / f"{name}-{index}.mkv",
+                part_path=work_dir / f"{name}-{index}.mkv.part",
+            )
+        )
+    stop_event = asyncio.Event()
+    probe_samples = []
+    peak_threads = [threading.active_count()]
+    monitors = [
+        asyncio.create_task(_probe_executor(stop_event, probe_samples)),
+        asyncio.create_task(_sample_threads(stop_event, peak_threads)),
+    ]
+    started = time.monotonic()
+    await asyncio.gather(*(download(entry) for entry in entries))
+    elapsed = time.monotonic() - started
+    stop_event.set()
+    await asyncio.gather(*monitors)
+    completed = [entry for entry in entries if entry.complete]
+    total_bytes = sum(int(entry.bytes_written or 0) for entry in entries)
+    probe_ms = sorted(sample * 1000 for sample in probe_samples) or [0.0]
+    return {
+        "path": name,
+        "fills": fills,
+        "completed": len(completed),
+        "seconds": round(elapsed, 3),
+        "mib_per_second": round(total_bytes / (1024 * 1024) / max(elapsed, 1e-9), 1),
+        "peak_threads": peak_threads[0],
+        "probe_p50_ms": round(statistics.median(probe_ms), 2),
+        "probe_max_ms": round(probe_ms[-1], 2),
+    }
+
+
+async def _run(args):
+    if args.executor_workers:
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=args.executor_workers))
+    upstream = StandInUpstream(int(args.size_mib * 1024 * 1024), int(args.rate_mib * 1024 * 1024))
+    await upstream.start()
+    try:
+        with tempfile.TemporaryDirectory(prefix="tic-vod-bench-") as tmp:
+            work_dir = Path(tmp)
+            for name, download in (("threaded", _threaded_download), ("aiohttp", _aiohttp_download)):
+                print(await _run_path(name, download, upstream, args.fills, work_dir), flush=True)
+    finally:
+        await upstream.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--fills", type=int, default=12, help="Concurrent cache fills per path.")
+    parser.add_argument("--size-mib", type=float, default=16, help="Size of each stand-in asset.")
+    parser.add_argument("--rate-mib", type=float, default=16, help="Per-connection upstream rate, 0 for unlimited.")
+    parser.add_argument("--executor-workers", type=int, default=0, help="Default executor size (0 keeps Python's).")
+    args = parser.parse_args()
+    try:
+        asyncio.run(_run(args))
+    except Exception as exc:
+        print(f"[vod-cache-bench] Failed: {exc}", file=sys.stderr)
+        raise
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+"""
+Measure the CSO failover gap with and without a warm standby.
+
+Two local fake MPEG-TS sources are served over HTTP (ffmpeg test pattern, real-time). A CSO ingest session
+is pointed at both, the primary is killed once the standby has had time to connect, and the gap between
+the last chunk from the primary and the first chunk from the backup is reported for each mode. The warm
+mode also checks that another stream can reclaim the standby's capacity slot.
+
+    python -m backend.scripts.cso_warm_standby_harness [--warmup-seconds 12] [--runs 3]
+"""
+import argparse
+import asyncio
+import shutil
+import statistics
+import sys
+import time
+
+from aiohttp import web
+
+from backend import create_app
+from backend.cso.capacity import cso_capacity_registry, source_capacity_key
+from backend.cso.constants import CSO_WARM_STANDBY_START_DELAY_SECONDS
+from backend.cso.live_ingest import CsoIngestSession
+from backend.cso.types import CsoSource
+
+FAKE_TS_COMMAND = [
+    "ffmpeg",
+    "-hide_banner",
+    "-loglevel",
+    "error",
+    "-re",
+    "-f",
+    "lavfi",
+    "-i",
+    "testsrc2=size=640x360:rate=25",
+    "-f",
+    "lavfi",
+    "-i",
+    "sine=frequency=440:sample_rate=48000",
+    "-c:v",
+    "libx264",
+    "-preset",
+    "ultrafast",
+    "-tune",
+    "zerolatency",
+    "-g",
+    "25",
+    "-c:a",
+    "aac",
+    "-f",
+    "mpegts",
+    "pipe:1",
+]
+
+
+class FakeTsSource:
+    """Local HTTP endpoint streaming a live test pattern as MPEG-TS until killed."""
+
+    def __init__(self, name):
+        self.name = name
+        self.alive = True
+        self.processes = set()
+        self.runner = None
+        self.port = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.port}/{self.name}.ts"
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get(f"/{self.name}.ts", self._handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def _handle(self, request):
+        if not self.alive:
+            return web.Response(status=503, text="source killed")
+        process = await asyncio.create_subprocess_exec(
+            *FAKE_TS_COMMAND,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        self.processes.add(process)
+        response = web.StreamResponse(headers={"Content-Type": "video/mp2t"})
+        await response.prepare(request)
+        try:
+            while True:
+                chunk = await process.stdout.read(65536)
+                if not chunk:
+                    break
+                await response.write(chunk)
+        except (ConnectionResetError, asyncio.CancelledError):
+            pass
+        finally:
+            self.processes.discard(process)
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+        return response
+
+    async def kill(self):
+        self.alive = False
+        for process in list(self.processes):
+            if process.returncode is None:
+                process.kill()
+
+    async def revive(self):
+        self.alive = True
+
+    async def stop(self):
+        await self.kill()
+        if self.runner is not None:
+            await self.runner.cleanup()
+
+
+async def _measure_failover(primary, backup, warm_standby, warmup_seconds, run_index):
+    sources = [
+        CsoSource(id=900001, source_type="harness", url=primary.url, playlist_id=None, priority=10),
+        CsoSource(id=900002, source_type="harness", url=backup.url, playlist_id=None, priority=5),
+    ]
+    mode = "warm" if warm_standby else "cold"
+    session = CsoIngestSession(
+        key=f"harness-{mode}-{run_index}",
+        channel_id=0,
+        sources=sources,
+        request_base_url="http://127.0.0.1",
+        instance_id="harness",
+        capacity_owner_key=f"harness-{mode}-{run_index}",
+        warm_standby=warm_standby,
+    )
+    await primary.revive()
+    await backup.revive()
+    await session.start()
+    if not session.running:
+        raise RuntimeError(f"ingest failed to start: {session.last_error}")
+    queue = await session.add_subscriber("harness-subscriber")
+    chunk_times = []
+    failover_source_ids = []
+
+    async def _consume():
+        while True:
+            chunk = await queue.get()
+            if chunk is None:
+                return
+            chunk_times.append((time.monotonic(), getattr(session.current_source, "id", None)))
+
+    consumer = asyncio.create_task(_consume())
+    result = {"mode": mode, "standby_connected": False, "reclaimed": None}
+    try:
+        await asyncio.sleep(warmup_seconds)
+        result["standby_connected"] = session.warm_standby is not None
+        killed_at = time.monotonic()
+        await primary.kill()
+        deadline = killed_at + 30.0
+        while time.monotonic() < deadline:
+            if getattr(session.current_source, "id", None) == sources[1].id and any(
+                ts > killed_at and source_id == sources[1].id for ts, source_id in chunk_times
+            ):
+                break
+            await asyncio.sleep(0.02)
+        before = [ts for ts, source_id in chunk_times if ts <= killed_at]
+        after = [ts for ts, source_id in chunk_times if ts > killed_at and source_id == sources[1].id]
+        if after:
+            last_before = before[-1] if before else killed_at
+            result["gap_ms"] = int((after[0] - last_before) * 1000)
+            result["kill_to_first_chunk_ms"] = int((after[0] - killed_at) * 1000)
+        failover_source_ids.append(getattr(session.current_source, "id", None))
+
+        if warm_standby:
+            # Let the standby loop re-arm on the (revived) primary, then take its slot from another owner.
+            await primary.revive()
+            await asyncio.sleep(warmup_seconds)
+            standby = session.warm_standby
+            if standby is not None:
+                capacity_key = source_capacity_key(standby.source)
+                usage = await cso_capacity_registry.get_usage(capacity_key)
+                reserved = await cso_capacity_registry.try_reserve(
+                    capacity_key, "harness-other-owner", limit=int(usage["total"]), slot_id="harness"
+                )
+                await asyncio.sleep(0.5)
+                result["reclaimed"] = bool(reserved and session.warm_standby is None)
+                await cso_capacity_registry.release(capacity_key, "harness-other-owner", slot_id="harness")
+    finally:
+        await session.stop(force=True)
+        consumer.cancel()
+        try:
+            await consumer
+        except asyncio.CancelledError:
+            pass
+    result["active_source_after_failover"] = failover_source_ids[-1] if failover_source_ids else None
+    return result
+
+
+async def _run(warmup_seconds, runs):
+    app = create_app()
+    primary = FakeTsSource("primary")
+    backup = FakeTsSource("backup")
+    await primary.start()
+    await backup.start()
+    results = []
+    try:
+        async with app.app_context():
+            for run_index in range(runs):
+                for warm_standby in (False, True):
+                    result = await _measure_failover(primary, backup, warm_standby, warmup_seconds, run_index)
+                    results.append(result)
+                    print(result, flush=True)
+    finally:
+        await primary.stop()
+        await backup.stop()
+    for mode in ("cold", "warm"):
+        gaps = [item["gap_ms"] for item in results if item["mode"] == mode and "gap_ms" in item]
+        if gaps:
+            print(
+                f"{mode}: runs={len(gaps)} gap_ms median={int(statistics.median(gaps))} "
+                f"min={min(gaps)} max={max(gaps)}",
+                flush=True,
+            )
+        else:
+            print(f"{mode}: no successful failovers", flush=True)
+    reclaim_checks = [item["reclaimed"] for item in results if item["reclaimed"] is not None]
+    if reclaim_checks:
+        print(f"standby capacity reclaimed: {sum(reclaim_checks)}/{len(reclaim_checks)}", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--warmup-seconds",
+        type=float,
+        default=CSO_WARM_STANDBY_START_DELAY_SECONDS * 2 + 2,
+        help="Time to let the primary (and standby) settle before killing the primary.",
+    )
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+    if shutil.which("ffmpeg") is None:
+        print("[cso-warm-standby-harness] ffmpeg is required", file=sys.stderr)
+        sys.exit(1)
+    try:
+        asyncio.run(_run(args.warmup_seconds, max(1, args.runs)))
+    except Exception as exc:
+        print(f"[cso-warm-standby-harness] Failed: {exc}", file=sys.stderr)
+        raise
+
+
+if __name__ == "__main__":
+    main()
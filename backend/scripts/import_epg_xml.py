@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+import json
+import sys
+
+from backend.epgs import _import_epg_xml_in_worker_process
+
+
+def main():
+    if len(sys.argv) != 3:
+        print("Usage: python -m backend.scripts.import_epg_xml <epg_id> <xmltv_file>", file=sys.stderr)
+        sys.exit(2)
+    try:
+        stats = _import_epg_xml_in_worker_process(int(sys.argv[1]), sys.argv[2])
+    except Exception as exc:
+        print(f"[epg-import] Failed: {exc}", file=sys.stderr)
+        raise
+    # Stats are the last stdout line; logging goes to stderr.
+    print(json.dumps(stats, separators=(",", ":")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+import hashlib
+import json
+import os
+
+_FETCH_STATE_SUFFIX = ".fetch.json"
+_HASH_CHUNK_BYTES = 1024 * 1024
+
+
+def _fetch_state_path(cache_file):
+    return f"{cache_file}{_FETCH_STATE_SUFFIX}"
+
+
+def read_fetch_state(cache_file):
+    """Return the validators and content hashes recorded for a cached source file."""
+    try:
+        with open(_fetch_state_path(cache_file), "r", encoding="utf-8") as f:
+            payload = json.load(f)
+        if isinstance(payload, dict):
+            return payload
+    except Exception:
+        pass
+    return {}
+
+
+def write_fetch_state(cache_file, updates):
+    state = read_fetch_state(cache_file)
+    state.update(updates)
+    path = _fetch_state_path(cache_file)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+    return state
+
+
+def conditional_request_headers(cache_file, url):
+    """
+    Build If-None-Match / If-Modified-Since headers for a source, but only when the
+    cached copy they describe is still on disk and was fetched from the same URL.
+    """
+    if not os.path.exists(cache_file):
+        return {}
+    state = read_fetch_state(cache_file)
+    if state.get("url") != url:
+        return {}
+    headers = {}
+    if state.get("etag"):
+        headers["If-None-Match"] = state["etag"]
+    if state.get("last_modified"):
+        headers["If-Modified-Since"] = state["last_modified"]
+    return headers
+
+
+def response_validators(url, response_headers):
+    return {
+        "url": url,
+        "etag": response_headers.get("ETag"),
+        "last_modified": response_headers.get("Last-Modified"),
+    }
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(_HASH_CHUNK_BYTES)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_unchanged_since_import(cache_file):
+    """
+    Hash the cached source file, record the hash and report whether it matches the
+    content of the last successful import. Returns ``(unchanged, sha256)``.
+    """
+    sha256 = file_sha256(cache_file)
+    state = write_fetch_state(cache_file, {"sha256": sha256})
+    return state.get("imported_sha256") == sha256, sha256
+
+
+def mark_source_imported(cache_file, sha256):
+    write_fetch_state(cache_file, {"imported_sha256": sha256})
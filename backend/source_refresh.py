@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+import asyncio
+import contextvars
+import logging
+import time
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+
+from backend import config as app_config
+
+logger = logging.getLogger("tic.source_refresh")
+
+SOURCE_REFRESH_STAGES = ("download", "parse", "write")
+
+_current_refresh = contextvars.ContextVar("tic_source_refresh", default=None)
+_active_refreshes = {}
+_stage_semaphores = {}
+_host_semaphores = {}
+
+
+def _stage_limit(stage):
+    if stage == "download":
+        return app_config.source_refresh_download_concurrency
+    if stage == "parse":
+        return app_config.source_refresh_parse_concurrency
+    return app_config.source_refresh_write_concurrency
+
+
+def _stage_semaphore(stage):
+    semaphore = _stage_semaphores.get(stage)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(_stage_limit(stage))
+        _stage_semaphores[stage] = semaphore
+    return semaphore
+
+
+def _host_key(url):
+    try:
+        parsed = urlparse(str(url or "").strip())
+    except ValueError:
+        return None
+    if parsed.scheme not in {"http", "https"} or not parsed.hostname:
+        return None
+    return parsed.hostname.lower()
+
+
+def _host_semaphore(url):
+    host = _host_key(url)
+    if not host:
+        return None
+    semaphore = _host_semaphores.get(host)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(app_config.source_refresh_per_host_concurrency)
+        _host_semaphores[host] = semaphore
+    return semaphore
+
+
+def source_refresh_key(kind, source_id):
+    return f"{kind}:{source_id}"
+
+
+def source_refresh_concurrency_limiter():
+    """Return a semaphore bounding how many sources a bulk refresh processes at once."""
+    return asyncio.Semaphore(app_config.source_refresh_concurrency)
+
+
+@asynccontextmanager
+async def track_source_refresh(kind, source_id, name=None):
+    """
+    Register a playlist/EPG refresh so its progress is visible to the background task API.
+    Stages entered through ``source_refresh_stage`` within this context are attributed to it.
+    """
+    key = source_refresh_key(kind, source_id)
+    now = time.time()
+    entry = {
+        "key": key,
+        "kind": kind,
+        "source_id": source_id,
+        "name": name or f"{kind.capitalize()} #{source_id}",
+        "stage": None,
+        "state": "starting",
+        "started_at": now,
+        "stage_started_at": now,
+        "stage_seconds": {},
+        "wait_seconds": {},
+    }
+    _active_refreshes[key] = entry
+    token = _current_refresh.set(entry)
+    try:
+        yield entry
+    finally:
+        _current_refresh.reset(token)
+        _active_refreshes.pop(key, None)
+        logger.debug(
+            "Refresh of %s finished in %.2fs stages=%s waits=%s",
+            key,
+            time.time() - now,
+            {stage: round(seconds, 2) for stage, seconds in entry["stage_seconds"].items()},
+            {stage: round(seconds, 2) for stage, seconds in entry["wait_seconds"].items()},
+        )
+
+
+@asynccontextmanager
+async def source_refresh_stage(stage, url=None):
+    """
+    Run one stage of a source refresh under that stage's concurrency limit. Download stages
+    for HTTP(S) sources first take the per-host limit for the upstream in ``url``.
+    """
+    if stage not in SOURCE_REFRESH_STAGES:
+        raise ValueError(f"Unknown source refresh stage: {stage}")
+    entry = _current_refresh.get()
+    queued_at = time.time()
+    if entry is not None:
+        entry["stage"] = stage
+        entry["state"] = "waiting"
+        entry["stage_started_at"] = queued_at
+    host_semaphore = _host_semaphore(url) if stage == "download" else None
+    if host_semaphore is None:
+        async with _stage_semaphore(stage):
+            async with _run_stage(entry, stage, queued_at):
+                yield
+    else:
+        # Wait for the host slot first so a refresh queued behind a busy provider does not sit on a
+        # global download slot that sources on other hosts could be using.
+        async with host_semaphore:
+            async with _stage_semaphore(stage):
+                async with _run_stage(entry, stage, queued_at):
+                    yield
+
+
+@asynccontextmanager
+async def _run_stage(entry, stage, queued_at):
+    started_at = time.time()
+    if entry is not None:
+        entry["state"] = "running"
+        entry["stage_started_at"] = started_at
+        entry["wait_seconds"][stage] = entry["wait_seconds"].get(stage, 0.0) + (started_at - queued_at)
+    try:
+        yield
+    finally:
+        if entry is not None:
+            entry["stage_seconds"][stage] = entry["stage_seconds"].get(stage, 0.0) + (time.time() - started_at)
+            entry["state"] = "idle"
+
+
+def describe_source_refresh(name):
+    """Set the display name of the refresh running in the current task once the source is loaded."""
+    entry = _current_refresh.get()
+    if entry is not None and name:
+        entry["name"] = name
+
+
+def current_source_refresh_timings():
+    """Stage timings of the refresh running in the current task, rounded for health reporting."""
+    entry = _current_refresh.get()
+    if entry is None:
+        return {}
+    return {stage: round(seconds, 2) for stage, seconds in entry["stage_seconds"].items()}
+
+
+def get_source_refresh_progress():
+    """
+    Snapshot of in-flight refreshes. Only absolute timestamps are reported for the running stage so the
+    snapshot changes on stage transitions rather than every second (the task API long-polls on changes).
+    """
+    progress = []
+    for entry in sorted(_active_refreshes.values(), key=lambda item: item["started_at"]):
+        progress.append(
+            {
+                "key": entry["key"],
+                "kind": entry["kind"],
+                "source_id": entry["source_id"],
+                "name": entry["name"],
+                "stage": entry["stage"],
+                "state": entry["state"],
+                "started_at": int(entry["started_at"]),
+                "stage_started_at": int(entry["stage_started_at"]),
+                "stage_seconds": {stage: round(seconds, 2) for stage, seconds in entry["stage_seconds"].items()},
+                "wait_seconds": {stage: round(seconds, 2) for stage, seconds in entry["wait_seconds"].items()},
+            }
+        )
+    return progress
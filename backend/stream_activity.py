@@ -22,6 +22,12 @@ from backend.auth import (
 
 logger = logging.getLogger("stream_activity")
 
+STREAM_ACTIVITY_STATE_VERSION = 3
+# Start/stop records are appended to the journal this long after the change, coalescing bursts.
+STREAM_ACTIVITY_JOURNAL_FLUSH_DELAY_SECONDS = 1.0
+# The snapshot is rewritten (and the journal truncated) once the journal outgrows both this and the snapshot.
+STREAM_ACTIVITY_JOURNAL_COMPACT_MIN_BYTES = 1024 * 1024
+
 
 class _AuditUser:
     def __init__(self, user_id, username, stream_key=None):
@@ -66,8 +72,11 @@ class StreamActivityTracker:
     - Active sessions expire after `activity_ttl` seconds of inactivity (default 20s).
     - On expiry, a `stream_stop` audit event is emitted and the session moves to history.
     - History items are pruned after `history_ttl` seconds (default 1 hour).
-    - Both `sessions` and `history` are persisted to `stream_activity_state.json`
-      every 15 seconds, allowing full state recovery after a process restart.
+    - Both `sessions` and `history` are persisted as a snapshot (`stream_activity_state.json`) plus an
+      append-only journal of per-connection changes (`stream_activity_state.journal`). Starts and stops
+      are journaled within a second; touches are coalesced into one record per connection and written
+      on the 15 second persist tick. The snapshot is only rewritten when the journal outgrows it, and
+      `load_state` replays the journal over it, allowing full state recovery after a process restart.
 
     Concurrency model:
     - All state modifications are guarded by `self.lock`.
@@ -82,6 +91,41 @@ class StreamActivityTracker:
         self.lock = asyncio.Lock()
         self.activity_ttl = activity_ttl
         self.history_ttl = history_ttl
+        self._state_path = None
+        self._journal_dirty = {}  # connection_id -> "touch" (last_seen only) or "full"
+        self._journal_lock = asyncio.Lock()
+        self._journal_flush_task = None
+        self._journal_bytes = 0
+        self._snapshot_bytes = 0
+
+    @staticmethod
+    def _journal_fingerprint(session):
+        # Everything except last_seen; lists are mutated in place, so compare their length instead.
+        return tuple(
+            (key, len(value) if isinstance(value, list) else value)
+            for key, value in session.items()
+            if key != "last_seen"
+        )
+
+    def _journal_mark(self, connection_id, kind="full", flush_soon=False):
+        """Record that a connection changed since the last journal flush. Caller must hold ``self.lock``."""
+        if self._journal_dirty.get(connection_id) != "full":
+            self._journal_dirty[connection_id] = kind
+        if flush_soon and self._state_path:
+            task = self._journal_flush_task
+            if task is None or task.done():
+                self._journal_flush_task = asyncio.create_task(self._delayed_journal_flush())
+
+    async def _delayed_journal_flush(self):
+        await asyncio.sleep(STREAM_ACTIVITY_JOURNAL_FLUSH_DELAY_SECONDS)
+        try:
+            await self.flush_journal()
+        except Exception as exc:
+            logger.warning("Failed to append stream activity journal: %s", exc)
+
+    @staticmethod
+    def _journal_path(file_path):
+        return f"{os.path.splitext(file_path)[0]}.journal"
 
     @staticmethod
     def _request_user():
@@ -380,6 +424,7 @@ class StreamActivityTracker:
             # 1. Update existing active session
             session = self.sessions.get(connection_id)
             if session:
+                fingerprint = self._journal_fingerprint(session)
                 session["last_seen"] = now
                 session["ip_address"] = ip_address
                 session["user_agent"] = user_agent
@@ -402,6 +447,9 @@ class StreamActivityTracker:
                         rel.append(normalized_identity)
 
                 self._apply_sticky_metadata(session, **resolved_metadata)
+                self._journal_mark(
+                    connection_id, "touch" if self._journal_fingerprint(session) == fingerprint else "full"
+                )
                 return "touched"
 
             # 2. Rehydrate from history
@@ -427,6 +475,7 @@ class StreamActivityTracker:
                         rel.append(normalized_identity)
 
                 self.sessions[connection_id] = session
+                self._journal_mark(connection_id, flush_soon=True)
                 if perform_audit:
                     audit_user = user if user_id else _AuditUser(user_id, username, stream_key)
                     await audit_stream_event(
@@ -470,6 +519,7 @@ class StreamActivityTracker:
                 "xc_account_id": resolved_metadata.get("xc_account_id"),
             }
             self.sessions[connection_id] = session
+            self._journal_mark(connection_id, flush_soon=True)
 
             if perform_audit:
                 audit_user = user if user_id else _AuditUser(user_id, username, stream_key)
@@ -532,6 +582,7 @@ class StreamActivityTracker:
                 if not session:
                     return False
                 self._apply_sticky_metadata(session, **resolved_metadata)
+                self._journal_mark(connection_id)
             return True
         finally:
             async with self.lock:
@@ -544,6 +595,7 @@ class StreamActivityTracker:
         async with self.lock:
             if connection_id in self.sessions:
                 session = self.sessions[connection_id]
+                fingerprint = self._journal_fingerprint(session)
                 session["last_seen"] = now
                 if ip_address:
                     session["ip_address"] = ip_address
@@ -556,6 +608,9 @@ class StreamActivityTracker:
                     # If current identity is a segment but new one isn't, upgrade it
                     if identity and not self._is_segment(identity) and self._is_segment(session.get("identity")):
                         session["identity"] = identity
+                self._journal_mark(
+                    connection_id, "touch" if self._journal_fingerprint(session) == fingerprint else "full"
+                )
                 return True
         return False
 
@@ -578,6 +633,7 @@ class StreamActivityTracker:
             if not session:
                 return False
             self.history[connection_id] = {"last_seen": now, "entry": session}
+            self._journal_mark(connection_id, flush_soon=True)
 
         if perform_audit:
             user_id = session.get("user_id")
@@ -643,11 +699,13 @@ class StreamActivityTracker:
             for cid, s in expired_active:
                 self.sessions.pop(cid)
                 self.history[cid] = {"last_seen": now, "entry": s}
+                self._journal_mark(cid, flush_soon=True)
 
             # Prune history
             for cid, h in list(self.history.items()):
                 if now - h["last_seen"] > self.history_ttl:
                     self.history.pop(cid)
+                    self._journal_mark(cid)
 
             # Prune playlist parents (simple time-based prune)
             if len(self.playlist_parents) > 1000:
@@ -675,48 +733,191 @@ class StreamActivityTracker:
         async with self.lock:
             self.playlist_parents[child_url] = parent_url
 
-    async def save_state(self, file_path: str):
-        if not file_path:
-            return False
-        async with self.lock:
-            payload = {
-                "version": 3,
-                "saved_at": time.time(),
-                "sessions": self.sessions,
-                "history": self.history,
-            }
+    @staticmethod
+    def _journal_entry_copy(entry):
+        # Only lists are mutated in place (related_identities); other values are replaced, so a shallow copy
+        # is enough to encode the record after the lock is released.
+        return {key: list(value) if isinstance(value, list) else value for key, value in (entry or {}).items()}
+
+    def _collect_journal_records_unlocked(self):
+        records = []
+        for cid, kind in self._journal_dirty.items():
+            session = self.sessions.get(cid)
+            if session is not None:
+                if kind == "touch":
+                    record = {"op": "touch", "id": cid, "last_seen": session.get("last_seen")}
+                else:
+                    record = {"op": "session", "id": cid, "entry": self._journal_entry_copy(session)}
+            elif cid in self.history:
+                item = self.history[cid]
+                record = {
+                    "op": "history",
+                    "id": cid,
+                    "last_seen": item.get("last_seen"),
+                    "entry": self._journal_entry_copy(item.get("entry")),
+                }
+            else:
+                record = {"op": "remove", "id": cid}
+            records.append(record)
+        self._journal_dirty = {}
+        return records
+
+    @staticmethod
+    def _append_journal_lines(journal_path, records):
+        lines = [json.dumps(record, separators=(",", ":"), ensure_ascii=True) for record in records]
+        data = ("\n".join(lines) + "\n").encode("ascii")
+        with open(journal_path, "ab") as fh:
+            fh.write(data)
+            fh.flush()
+            os.fsync(fh.fileno())
+        return len(data)
 
+    @staticmethod
+    def _write_snapshot_file(file_path, data):
         directory = os.path.dirname(file_path)
         if directory:
             os.makedirs(directory, exist_ok=True)
         temp_path = f"{file_path}.tmp"
         try:
-            with open(temp_path, "w", encoding="utf-8") as fh:
-                json.dump(payload, fh, separators=(",", ":"), ensure_ascii=True)
+            with open(temp_path, "wb") as fh:
+                fh.write(data)
                 fh.flush()
                 os.fsync(fh.fileno())
             os.replace(temp_path, file_path)
-            return True
         except Exception:
             try:
                 if os.path.exists(temp_path):
                     os.remove(temp_path)
             except Exception:
                 pass
+            raise
+
+    @staticmethod
+    def _truncate_journal(journal_path):
+        with open(journal_path, "wb") as fh:
+            fh.flush()
+            os.fsync(fh.fileno())
+
+    async def flush_journal(self):
+        """Append one record per connection changed since the last flush. Lock time scales with the changes."""
+        file_path = self._state_path
+        if not file_path:
             return False
+        async with self._journal_lock:
+            async with self.lock:
+                records = self._collect_journal_records_unlocked()
+            if not records:
+                return True
+            directory = os.path.dirname(file_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._journal_bytes += await asyncio.to_thread(
+                self._append_journal_lines, self._journal_path(file_path), records
+            )
+        return True
 
-    async def load_state(self, file_path: str):
-        if not file_path or not os.path.exists(file_path):
+    async def compact(self):
+        """Rewrite the snapshot from memory and truncate the journal."""
+        file_path = self._state_path
+        if not file_path:
+            return False
+        async with self._journal_lock:
+            async with self.lock:
+                payload = {
+                    "version": STREAM_ACTIVITY_STATE_VERSION,
+                    "saved_at": time.time(),
+                    "sessions": self.sessions,
+                    "history": self.history,
+                }
+                data = json.dumps(payload, separators=(",", ":"), ensure_ascii=True).encode("ascii")
+                # Everything dirty is now in the snapshot.
+                self._journal_dirty = {}
+            await asyncio.to_thread(self._write_snapshot_file, file_path, data)
+            # A crash before truncation only replays records the new snapshot already contains.
+            await asyncio.to_thread(self._truncate_journal, self._journal_path(file_path))
+            self._snapshot_bytes = len(data)
+            self._journal_bytes = 0
+        return True
+
+    async def save_state(self, file_path: str):
+        if not file_path:
             return False
+        self._state_path = file_path
         try:
+            await self.flush_journal()
+            if self._journal_bytes > max(STREAM_ACTIVITY_JOURNAL_COMPACT_MIN_BYTES, self._snapshot_bytes):
+                await self.compact()
+            return True
+        except Exception as exc:
+            logger.debug("Stream activity state save failed path=%s error=%s", file_path, exc)
+            return False
+
+    @staticmethod
+    def _apply_journal_record(sessions, history, record):
+        op = record.get("op")
+        cid = record.get("id")
+        if not cid:
+            return
+        if op == "session":
+            sessions[cid] = record.get("entry") or {}
+            history.pop(cid, None)
+        elif op == "history":
+            history[cid] = {"last_seen": record.get("last_seen"), "entry": record.get("entry") or {}}
+            sessions.pop(cid, None)
+        elif op == "touch":
+            if cid in sessions:
+                sessions[cid]["last_seen"] = record.get("last_seen")
+        elif op == "remove":
+            sessions.pop(cid, None)
+            history.pop(cid, None)
+
+    def _read_state_files(self, file_path):
+        sessions = {}
+        history = {}
+        loaded = False
+        if os.path.exists(file_path):
             with open(file_path, "r", encoding="utf-8") as fh:
                 payload = json.load(fh)
+            sessions = payload.get("sessions") or {}
+            history = payload.get("history") or {}
+            loaded = True
+        journal_path = self._journal_path(file_path)
+        if os.path.exists(journal_path):
+            with open(journal_path, "r", encoding="utf-8", errors="replace") as fh:
+                for line in fh:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # A crash mid-append leaves at most one torn trailing record.
+                        continue
+                    if isinstance(record, dict):
+                        self._apply_journal_record(sessions, history, record)
+                        loaded = True
+        return loaded, sessions, history
+
+    async def load_state(self, file_path: str):
+        if not file_path:
+            return False
+        self._state_path = file_path
+        try:
+            loaded, sessions, history = await asyncio.to_thread(self._read_state_files, file_path)
         except Exception:
             return False
+        if not loaded:
+            return False
 
         async with self.lock:
-            self.sessions = payload.get("sessions") or {}
-            self.history = payload.get("history") or {}
+            self.sessions = sessions
+            self.history = history
+            self._journal_dirty = {}
+        # Fold the replayed journal into a fresh snapshot so it does not carry over between restarts.
+        try:
+            await self.compact()
+        except Exception as exc:
+            logger.warning("Failed to compact stream activity state path=%s error=%s", file_path, exc)
         return True
 
 
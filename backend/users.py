@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 # -*- coding:utf-8 -*-
 import secrets
+from functools import wraps
+
 from sqlalchemy import select, func
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
@@ -17,6 +19,21 @@ ALLOWED_DVR_ACCESS_MODES = ("none", "read_write_own", "read_all_write_own")
 ALLOWED_VOD_ACCESS_MODES = ("none", "movies", "series", "movies_series")
 
 
+def _invalidates_cached_credentials(func):
+    """Drop the user's cached stream credential lookups once the wrapped update has committed."""
+
+    @wraps(func)
+    async def wrapper(user_id, *args, **kwargs):
+        try:
+            return await func(user_id, *args, **kwargs)
+        finally:
+            from backend.auth import invalidate_user_credentials
+
+            invalidate_user_credentials(user_id)
+
+    return wrapper
+
+
 def user_has_admin_role(user: User | None) -> bool:
     if not user or not user.roles:
         return False
@@ -117,6 +134,7 @@ async def create_user(username: str, password: str, role_names=None):
         return user, stream_key
 
 
+@_invalidates_cached_credentials
 async def update_user_roles(user_id: int, role_names):
     async with Session() as session:
         async with session.begin():
@@ -150,6 +168,7 @@ def clean_vod_access_mode(mode: str | None) -> str:
     return cleaned if cleaned in ALLOWED_VOD_ACCESS_MODES else "none"
 
 
+@_invalidates_cached_credentials
 async def update_user_dvr_settings(
     user_id: int,
     dvr_access_mode: str | None = None,
@@ -178,6 +197,7 @@ async def update_user_dvr_settings(
             return user
 
 
+@_invalidates_cached_credentials
 async def update_user_vod_settings(
     user_id: int, vod_access_mode: str | None = None, vod_generate_strm_files: bool | None = None
 ):
@@ -206,6 +226,7 @@ async def update_user_vod_settings(
             return user
 
 
+@_invalidates_cached_credentials
 async def set_user_active(user_id: int, is_active: bool):
     async with Session() as session:
         async with session.begin():
@@ -244,6 +265,7 @@ async def change_user_password(user_id: int, current_password: str, new_password
             return user, None
 
 
+@_invalidates_cached_credentials
 async def rotate_stream_key(user_id: int):
     async with Session() as session:
         async with session.begin():
@@ -284,6 +306,7 @@ async def set_user_stream_key_last_used(user_id: int):
             return user
 
 
+@_invalidates_cached_credentials
 async def delete_user(user_id: int):
     async with Session() as session:
         async with session.begin():
@@ -429,7 +452,12 @@ async def provision_or_update_oidc_user(claims: dict, config: OidcConfig):
                     user.last_login_at = utc_now_naive()
                     session.add(user)
 
-                    return user, None
+            if not is_new_user:
+                # Login may have re-synced roles; drop cached stream credential lookups now that it has committed.
+                from backend.auth import invalidate_user_credentials
+
+                invalidate_user_credentials(user.id)
+            return user, None
         except IntegrityError:
             if attempt == 0:
                 # Retry once to recover from concurrent first-login provisioning races.
@@ -17,8 +17,12 @@ from urllib.parse import quote, urlparse
 
 import aiohttp
 from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import joinedload, selectinload
 
+from backend import config as app_config
+from backend.json_stream import iter_json_array_batches
+
 from backend.models import (
     Playlist,
     Session,
@@ -35,11 +39,13 @@ from backend.models import (
     XcVodMetadataCache,
 )
 from backend.source_media import load_source_media_shape, persist_source_media_shape, probe_stream_media_shape
+from backend.source_refresh import source_refresh_stage
 from backend.stream_activity import get_stream_activity_snapshot
 from backend.stream_profiles import get_stream_profile_definitions
 from backend.url_resolver import get_tvh_publish_base_url
 from backend.users import user_has_admin_role
-from backend.utils import as_naive_utc, clean_key, clean_text, utc_now
+from backend.utils import as_naive_utc, clean_key, clean_text, convert_to_int, utc_now
+from backend.xc.cache import XC_CATALOGUE_VOD, invalidate_xc_catalogue
 from backend.xc_hosts import parse_xc_hosts
 
 logger = logging.getLogger("tic.vod")
@@ -52,6 +58,11 @@ VOD_ACCESS_SERIES = "series"
 VOD_ACCESS_BOTH = "movies_series"
 METADATA_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
 VOD_SYNC_ITEM_BATCH_SIZE = 500
+VOD_SYNC_UPSERT_CHUNK_SIZE = 1000
+VOD_SYNC_CHECKPOINT_MAX_AGE_SECONDS = 6 * 60 * 60
+VOD_SYNC_DOWNLOAD_CHUNK_BYTES = 256 * 1024
+VOD_SYNC_DOWNLOAD_READ_TIMEOUT_SECONDS = 120
+VOD_GROUP_CHANGESET_MAX_ITEMS = 20000
 VOD_SYNC_SERIES_REFRESH_CONCURRENCY = 6
 VOD_UPSTREAM_METADATA_RETRY_ATTEMPTS = 3
 VOD_UPSTREAM_METADATA_RETRY_BASE_DELAY_SECONDS = 1.5
@@ -1403,6 +1414,8 @@ async def sync_vod_library_subprocess(category_id: int | None = None) -> bool:
     if rc != 0:
         label = f"category {category_id}" if category_id else "full library"
         raise RuntimeError(f"VOD sync subprocess for {label} failed with code {rc}")
+    # The subprocess rewrote group caches this process serves XC VOD listings from
+    invalidate_xc_catalogue(XC_CATALOGUE_VOD)
 
 
 async def _refresh_series_items(item_ids, concurrency: int = VOD_SYNC_SERIES_REFRESH_CONCURRENCY):
@@ -1954,6 +1967,102 @@ def _build_upstream_series_url(host_url: str, account: XcAccount, upstream_episo
     return f"{str(host_url).rstrip('/')}/series/{quote(account.username)}/{quote(account.password)}/{upstream_episode_id}.{suffix}"
 
 
+def _vod_sync_dir() -> str:
+    return os.path.join(app_config.config_path, "cache", "vod_sync")
+
+
+def _vod_sync_catalogue_path(playlist_id: int, kind: str) -> str:
+    return os.path.join(_vod_sync_dir(), f"{int(playlist_id)}_{kind}.json")
+
+
+def _vod_sync_checkpoint_path(playlist_id: int, kind: str) -> str:
+    return os.path.join(_vod_sync_dir(), f"{int(playlist_id)}_{kind}.checkpoint.json")
+
+
+def _read_vod_sync_checkpoint(playlist_id: int, kind: str) -> dict[str, object]:
+    return _load_json_file_sync(Path(_vod_sync_checkpoint_path(playlist_id, kind)))
+
+
+def _write_vod_sync_checkpoint(playlist_id: int, kind: str, checkpoint: dict[str, object]):
+    path = _vod_sync_checkpoint_path(playlist_id, kind)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _discard_vod_sync_state(playlist_id: int, kind: str):
+    for path in (_vod_sync_checkpoint_path(playlist_id, kind), _vod_sync_catalogue_path(playlist_id, kind)):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def _resumable_vod_sync_checkpoint(playlist_id: int, kind: str) -> dict[str, object] | None:
+    """Return the checkpoint of an interrupted sync whose downloaded catalogue can still be resumed."""
+    checkpoint = _read_vod_sync_checkpoint(playlist_id, kind)
+    if not checkpoint or not os.path.exists(_vod_sync_catalogue_path(playlist_id, kind)):
+        return None
+    started_at = convert_to_int(checkpoint.get("started_at"), 0)
+    if time.time() - started_at > VOD_SYNC_CHECKPOINT_MAX_AGE_SECONDS:
+        return None
+    return checkpoint
+
+
+async def _download_xc_vod_catalogue(http_session, host_url: str, params: dict[str, str], output: str, retries: int = 3):
+    """Stream a player_api catalogue response to ``output`` without buffering it in memory."""
+    url = f"{str(host_url).rstrip('/')}/player_api.php"
+    part_file = f"{output}.part"
+    timeout = aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=VOD_SYNC_DOWNLOAD_READ_TIMEOUT_SECONDS)
+    for attempt in range(1, int(retries) + 1):
+        try:
+            async with http_session.get(url, params=params, timeout=timeout) as response:
+                response.raise_for_status()
+                with open(part_file, "wb") as f:
+                    async for chunk in response.content.iter_chunked(VOD_SYNC_DOWNLOAD_CHUNK_BYTES):
+                        f.write(chunk)
+            os.replace(part_file, output)
+            return
+        except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+            if attempt < int(retries):
+                logger.debug("XC catalogue download attempt %s failed url=%s error=%s", attempt, url, exc)
+                await asyncio.sleep(attempt)
+                continue
+            raise
+
+
+async def _fetch_xc_vod_catalogue(http_session, host_url: str, account: XcAccount, playlist_id: int, kind: str) -> bool:
+    """
+    Make the provider's catalogue for ``kind`` available on disk for the upsert. An interrupted sync with a
+    recent checkpoint reuses the catalogue it downloaded. Returns True when resuming.
+    """
+    checkpoint = _resumable_vod_sync_checkpoint(playlist_id, kind)
+    if checkpoint is not None:
+        logger.info(
+            "Resuming XC VOD %s sync for playlist #%s from item %s",
+            kind,
+            playlist_id,
+            checkpoint.get("items_processed", 0),
+        )
+        return True
+    _discard_vod_sync_state(playlist_id, kind)
+    os.makedirs(_vod_sync_dir(), exist_ok=True)
+    action = "get_vod_streams" if kind == VOD_KIND_MOVIE else "get_series"
+    await _download_xc_vod_catalogue(
+        http_session,
+        host_url,
+        {"username": account.username, "password": account.password, "action": action},
+        _vod_sync_catalogue_path(playlist_id, kind),
+    )
+    _write_vod_sync_checkpoint(
+        playlist_id,
+        kind,
+        {"started_at": int(time.time()), "items_processed": 0, "stats": _empty_vod_sync_stats()},
+    )
+    return False
+
+
 async def sync_xc_vod_catalogue(playlist: Playlist):
     if not playlist or str(getattr(playlist, "account_type", "")).upper() != "XC":
         return
@@ -1963,173 +2072,282 @@ async def sync_xc_vod_catalogue(playlist: Playlist):
         logger.warning("Skipping XC VOD sync; no working XC host playlist=%s", getattr(playlist, "id", None))
         return
 
+    playlist_id = int(playlist.id)
     headers = _resolve_source_request_headers({}, playlist)
     fetch_started_at = time.perf_counter()
-    async with aiohttp.ClientSession(headers=headers) as http_session:
-        movie_categories = await _xc_request(
-            http_session,
-            host_url,
-            {"username": account.username, "password": account.password, "action": "get_vod_categories"},
-        )
-        movie_items = await _xc_request(
-            http_session,
-            host_url,
-            {"username": account.username, "password": account.password, "action": "get_vod_streams"},
-        )
-        series_categories = await _xc_request(
-            http_session,
-            host_url,
-            {"username": account.username, "password": account.password, "action": "get_series_categories"},
-        )
-        series_items = await _xc_request(
-            http_session,
-            host_url,
-            {"username": account.username, "password": account.password, "action": "get_series"},
-        )
+    async with source_refresh_stage("download", url=host_url):
+        async with aiohttp.ClientSession(headers=headers) as http_session:
+            movie_categories = await _xc_request(
+                http_session,
+                host_url,
+                {"username": account.username, "password": account.password, "action": "get_vod_categories"},
+            )
+            movie_resumed = await _fetch_xc_vod_catalogue(http_session, host_url, account, playlist_id, VOD_KIND_MOVIE)
+            series_categories = await _xc_request(
+                http_session,
+                host_url,
+                {"username": account.username, "password": account.password, "action": "get_series_categories"},
+            )
+            series_resumed = await _fetch_xc_vod_catalogue(
+                http_session, host_url, account, playlist_id, VOD_KIND_SERIES
+            )
     logger.debug(
-        "XC VOD fetch completed for playlist #%s in %.2fs (movie_categories=%s, movie_items=%s, series_categories=%s, series_items=%s)",
-        getattr(playlist, "id", None),
+        "XC VOD fetch completed for playlist #%s in %.2fs (movie_categories=%s, series_categories=%s, movies_resumed=%s, series_resumed=%s)",
+        playlist_id,
         time.perf_counter() - fetch_started_at,
         len(movie_categories) if isinstance(movie_categories, list) else 0,
-        len(movie_items) if isinstance(movie_items, list) else 0,
         len(series_categories) if isinstance(series_categories, list) else 0,
-        len(series_items) if isinstance(series_items, list) else 0,
-    )
-
-    movie_upsert_started_at = time.perf_counter()
-    await _upsert_vod_type(
-        int(playlist.id),
-        VOD_KIND_MOVIE,
-        movie_categories if isinstance(movie_categories, list) else [],
-        movie_items if isinstance(movie_items, list) else [],
-    )
-    logger.debug(
-        "XC VOD movie upsert completed for playlist #%s in %.2fs",
-        getattr(playlist, "id", None),
-        time.perf_counter() - movie_upsert_started_at,
+        movie_resumed,
+        series_resumed,
     )
 
-    series_upsert_started_at = time.perf_counter()
-    await _upsert_vod_type(
-        int(playlist.id),
-        VOD_KIND_SERIES,
-        series_categories if isinstance(series_categories, list) else [],
-        series_items if isinstance(series_items, list) else [],
-    )
-    logger.debug(
-        "XC VOD series upsert completed for playlist #%s in %.2fs",
-        getattr(playlist, "id", None),
-        time.perf_counter() - series_upsert_started_at,
-    )
+    changesets = []
+    for kind, categories in (
+        (VOD_KIND_MOVIE, movie_categories),
+        (VOD_KIND_SERIES, series_categories),
+    ):
+        upsert_started_at = time.perf_counter()
+        try:
+            async with source_refresh_stage("write"):
+                stats, changeset = await _upsert_vod_type(
+                    playlist_id, kind, categories if isinstance(categories, list) else []
+                )
+        except ValueError as exc:
+            # The provider returned something other than a catalogue (usually an error object). Keep the
+            # existing rows rather than treating it as an empty catalogue, and fetch afresh next time.
+            logger.warning("Skipping XC VOD %s sync for playlist #%s; invalid catalogue: %s", kind, playlist_id, exc)
+            _discard_vod_sync_state(playlist_id, kind)
+            continue
+        logger.debug(
+            "XC VOD %s upsert completed for playlist #%s in %.2fs (%s)",
+            kind,
+            playlist_id,
+            time.perf_counter() - upsert_started_at,
+            stats,
+        )
+        changesets.append(changeset)
 
-    await rebuild_vod_group_caches_for_playlist(int(playlist.id))
+    await rebuild_vod_group_caches_for_playlist(playlist_id, changesets=changesets)
     logger.debug(
         "XC VOD sync completed for playlist #%s in %.2fs",
-        getattr(playlist, "id", None),
+        playlist_id,
         time.perf_counter() - overall_started_at,
     )
 
 
-async def _upsert_vod_type(playlist_id: int, kind: str, categories: list[dict], items: list[dict]):
-    kind = require_vod_content_type(kind)
+def _empty_vod_sync_stats() -> dict[str, int]:
+    return {"added": 0, "changed": 0, "removed": 0, "unchanged": 0}
+
+
+def _empty_vod_changeset(kind: str) -> dict[str, object]:
+    return {
+        "kind": kind,
+        "full": False,
+        "added": [],
+        "modified": [],
+        "removed": [],
+        "removed_category_items": {},
+    }
+
+
+def _vod_item_payload_hash(summary_json: str, category_id: int | None) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(category_id if category_id is not None else "").encode("utf-8"))
+    digest.update(b"\x1f")
+    digest.update(summary_json.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _xc_vod_item_row(playlist_id: int, kind: str, upstream_item_id: str, payload: dict, category_id: int | None):
+    title = _truncated_vod_text(payload.get("name") or payload.get("title")) or upstream_item_id
+    summary_json = _summary_json(payload)
+    return {
+        "playlist_id": int(playlist_id),
+        "category_id": category_id,
+        "item_type": kind,
+        "upstream_item_id": upstream_item_id,
+        "title": title,
+        "sort_title": title,
+        "release_date": clean_text(payload.get("releaseDate") or payload.get("release_date")),
+        "year": _extract_year(payload),
+        "rating": clean_text(payload.get("rating")),
+        "poster_url": _poster_url(payload, kind),
+        "container_extension": _container_extension(payload),
+        "direct_source": clean_text(payload.get("direct_source")),
+        "added": clean_text(payload.get("added")),
+        "summary_json": summary_json,
+        "payload_hash": _vod_item_payload_hash(summary_json, category_id),
+    }
+
+
+_XC_VOD_ITEM_UPSERT_COLUMNS = (
+    "category_id",
+    "title",
+    "sort_title",
+    "release_date",
+    "year",
+    "rating",
+    "poster_url",
+    "container_extension",
+    "direct_source",
+    "added",
+    "summary_json",
+    "payload_hash",
+)
+
+
+async def _upsert_xc_vod_categories(playlist_id: int, kind: str, categories: list[dict]) -> dict[str, int]:
+    rows = {}
+    for payload in categories or []:
+        if not isinstance(payload, dict):
+            continue
+        upstream_category_id = clean_text(payload.get("category_id"))
+        if not upstream_category_id or upstream_category_id in rows:
+            continue
+        rows[upstream_category_id] = {
+            "playlist_id": int(playlist_id),
+            "category_type": kind,
+            "upstream_category_id": upstream_category_id,
+            "name": _truncated_vod_text(payload.get("category_name")) or upstream_category_id,
+            "parent_id": clean_text(payload.get("parent_id")),
+        }
+    category_ids = {}
     async with Session() as session:
         async with session.begin():
-            existing_categories_result = await session.execute(
-                select(XcVodCategory).where(
-                    XcVodCategory.playlist_id == int(playlist_id),
-                    XcVodCategory.category_type == kind,
-                )
-            )
-            existing_categories = {
-                str(item.upstream_category_id): item for item in existing_categories_result.scalars().all()
-            }
-            seen_category_ids = set()
-            category_by_upstream = {}
-            for payload in categories or []:
-                upstream_category_id = clean_text(payload.get("category_id"))
-                if not upstream_category_id:
-                    continue
-                seen_category_ids.add(upstream_category_id)
-                row = existing_categories.get(upstream_category_id)
-                if row is None:
-                    row = XcVodCategory(
-                        playlist_id=int(playlist_id),
-                        category_type=kind,
-                        upstream_category_id=upstream_category_id,
-                        name=_truncated_vod_text(payload.get("category_name")) or upstream_category_id,
-                        parent_id=clean_text(payload.get("parent_id")),
-                    )
-                    session.add(row)
-                    await session.flush()
-                else:
-                    row.name = _truncated_vod_text(payload.get("category_name")) or row.name
-                    row.parent_id = clean_text(payload.get("parent_id"))
-                category_by_upstream[upstream_category_id] = row
-            stale_categories = [
-                item.id for upstream_id, item in existing_categories.items() if upstream_id not in seen_category_ids
-            ]
-            if stale_categories:
-                await _delete_ids_in_batches(session, XcVodCategory, stale_categories)
+            for batch in _batched(list(rows.values()), VOD_SYNC_UPSERT_CHUNK_SIZE):
+                stmt = pg_insert(XcVodCategory).values(batch)
+                stmt = stmt.on_conflict_do_update(
+                    constraint="uq_xc_vod_category_upstream",
+                    set_={"name": stmt.excluded.name, "parent_id": stmt.excluded.parent_id},
+                ).returning(XcVodCategory.id, XcVodCategory.upstream_category_id)
+                result = await session.execute(stmt)
+                category_ids.update({str(upstream_id): int(row_id) for row_id, upstream_id in result.all()})
+    return category_ids
+
+
+async def _upsert_xc_vod_item_rows(rows: list[dict]) -> dict[str, int]:
+    item_ids = {}
+    for batch in _batched(rows, VOD_SYNC_UPSERT_CHUNK_SIZE):
+        stmt = pg_insert(XcVodItem).values(batch)
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_xc_vod_item_upstream",
+            set_={column: stmt.excluded[column] for column in _XC_VOD_ITEM_UPSERT_COLUMNS},
+        ).returning(XcVodItem.id, XcVodItem.upstream_item_id)
+        # One short transaction per chunk so readers and other writers are never blocked for long.
+        async with Session() as session:
+            async with session.begin():
+                result = await session.execute(stmt)
+                item_ids.update({str(upstream_id): int(row_id) for row_id, upstream_id in result.all()})
+    return item_ids
 
-            existing_items_result = await session.execute(
-                select(XcVodItem).where(
-                    XcVodItem.playlist_id == int(playlist_id),
-                    XcVodItem.item_type == kind,
-                )
+
+async def _upsert_vod_type(
+    playlist_id: int, kind: str, categories: list[dict]
+) -> tuple[dict[str, int], dict[str, object]]:
+    """
+    Sync one XC catalogue kind from the downloaded catalogue file. Items are decoded from disk in batches and
+    only new or changed items (by payload hash) are written, in chunked ``INSERT ... ON CONFLICT`` upserts.
+    Progress is checkpointed after every batch so an interrupted sync resumes where it stopped.
+
+    Returns the sync stats and a changeset of added, modified and removed ``XcVodItem`` ids for the
+    incremental group cache rebuild. A resumed sync cannot account for the items committed before the
+    interruption, so its changeset asks for a full rebuild instead.
+    """
+    kind = require_vod_content_type(kind)
+    category_by_upstream = await _upsert_xc_vod_categories(playlist_id, kind, categories)
+
+    async with Session() as session:
+        existing_result = await session.execute(
+            select(XcVodItem.upstream_item_id, XcVodItem.payload_hash).where(
+                XcVodItem.playlist_id == int(playlist_id),
+                XcVodItem.item_type == kind,
             )
-            existing_items = {str(item.upstream_item_id): item for item in existing_items_result.scalars().all()}
-            seen_item_ids = set()
+        )
+        existing_hashes = {str(upstream_id): payload_hash for upstream_id, payload_hash in existing_result.all()}
+
+    checkpoint = _read_vod_sync_checkpoint(playlist_id, kind)
+    resume_from = convert_to_int(checkpoint.get("items_processed"), 0)
+    stats = _empty_vod_sync_stats()
+    stats.update(checkpoint.get("stats") or {})
+    changeset = _empty_vod_changeset(kind)
+    changeset["full"] = resume_from > 0
+
+    seen_item_ids = set()
+    items_processed = 0
+    batches = iter_json_array_batches(_vod_sync_catalogue_path(playlist_id, kind), VOD_SYNC_ITEM_BATCH_SIZE)
+    while True:
+        batch = await asyncio.to_thread(next, batches, None)
+        if batch is None:
+            break
+        pending_rows = []
+        pending_added = set()
+        for payload in batch:
+            items_processed += 1
+            if not isinstance(payload, dict):
+                continue
+            upstream_item_id = clean_text(payload.get("stream_id") or payload.get("series_id"))
+            if not upstream_item_id or upstream_item_id in seen_item_ids:
+                continue
+            seen_item_ids.add(upstream_item_id)
+            if items_processed <= resume_from:
+                # Committed before the previous attempt was interrupted; only needed for stale detection.
+                continue
+            category_id = category_by_upstream.get(clean_text(payload.get("category_id")))
+            row = _xc_vod_item_row(playlist_id, kind, upstream_item_id, payload, category_id)
+            if upstream_item_id not in existing_hashes:
+                stats["added"] += 1
+                pending_added.add(upstream_item_id)
+            elif existing_hashes[upstream_item_id] == row["payload_hash"]:
+                stats["unchanged"] += 1
+                continue
+            else:
+                stats["changed"] += 1
+            pending_rows.append(row)
+        if items_processed <= resume_from:
+            continue
+        if pending_rows:
+            item_ids = await _upsert_xc_vod_item_rows(pending_rows)
+            if not changeset["full"]:
+                for upstream_item_id, item_id in item_ids.items():
+                    changeset["added" if upstream_item_id in pending_added else "modified"].append(item_id)
+        _write_vod_sync_checkpoint(
+            playlist_id,
+            kind,
+            {
+                "started_at": checkpoint.get("started_at") or int(time.time()),
+                "items_processed": items_processed,
+                "stats": stats,
+            },
+        )
 
-            for payload in items or []:
-                upstream_item_id = clean_text(payload.get("stream_id") or payload.get("series_id"))
-                if not upstream_item_id or upstream_item_id in seen_item_ids:
-                    continue
-                seen_item_ids.add(upstream_item_id)
-                row = existing_items.get(upstream_item_id)
-                if row is None:
-                    title = _truncated_vod_text(payload.get("name") or payload.get("title")) or upstream_item_id
-                    row = XcVodItem(
-                        playlist_id=int(playlist_id),
-                        category_id=None,
-                        item_type=kind,
-                        upstream_item_id=upstream_item_id,
-                        title=title,
-                        sort_title=title,
-                        release_date=clean_text(payload.get("releaseDate") or payload.get("release_date")),
-                        year=_extract_year(payload),
-                        rating=clean_text(payload.get("rating")),
-                        poster_url=_poster_url(payload, kind),
-                        container_extension=_container_extension(payload),
-                        direct_source=clean_text(payload.get("direct_source")),
-                        added=clean_text(payload.get("added")),
-                        summary_json=_summary_json(payload),
+    stale_upstream_item_ids = [upstream_id for upstream_id in existing_hashes if upstream_id not in seen_item_ids]
+    stats["removed"] = len(stale_upstream_item_ids)
+    for batch in _batched(stale_upstream_item_ids, VOD_SYNC_UPSERT_CHUNK_SIZE):
+        async with Session() as session:
+            async with session.begin():
+                # Record the group items that lose a source before the links cascade away with the item.
+                links_result = await session.execute(
+                    select(VodCategoryItem.category_id, VodCategoryItemSource.category_item_id)
+                    .join(VodCategoryItemSource, VodCategoryItemSource.category_item_id == VodCategoryItem.id)
+                    .join(XcVodItem, XcVodItem.id == VodCategoryItemSource.source_item_id)
+                    .where(
+                        XcVodItem.playlist_id == int(playlist_id),
+                        XcVodItem.item_type == kind,
+                        XcVodItem.upstream_item_id.in_(batch),
                     )
-                    session.add(row)
-                else:
-                    row.category_id = None
-                    row.title = _truncated_vod_text(payload.get("name") or payload.get("title")) or row.title
-                    row.sort_title = row.title
-                    row.release_date = clean_text(payload.get("releaseDate") or payload.get("release_date"))
-                    row.year = _extract_year(payload)
-                    row.rating = clean_text(payload.get("rating"))
-                    row.poster_url = _poster_url(payload, kind)
-                    row.container_extension = _container_extension(payload)
-                    row.direct_source = clean_text(payload.get("direct_source"))
-                    row.added = clean_text(payload.get("added"))
-                    row.summary_json = _summary_json(payload)
-
-                category = category_by_upstream.get(clean_text(payload.get("category_id")))
-                row.category_id = category.id if category is not None else None
-
-            stale_item_db_ids = [
-                item.id for upstream_id, item in existing_items.items() if upstream_id not in seen_item_ids
-            ]
-            stale_upstream_item_ids = [
-                str(upstream_id) for upstream_id in existing_items.keys() if upstream_id not in seen_item_ids
-            ]
-            if stale_item_db_ids:
-                await _delete_ids_in_batches(session, XcVodItem, stale_item_db_ids)
-            for batch in _batched(stale_upstream_item_ids):
+                )
+                for group_id, category_item_id in links_result.all():
+                    changeset["removed_category_items"].setdefault(str(group_id), []).append(int(category_item_id))
+                deleted_result = await session.execute(
+                    delete(XcVodItem)
+                    .where(
+                        XcVodItem.playlist_id == int(playlist_id),
+                        XcVodItem.item_type == kind,
+                        XcVodItem.upstream_item_id.in_(batch),
+                    )
+                    .returning(XcVodItem.id)
+                )
+                changeset["removed"].extend(int(row[0]) for row in deleted_result.all())
                 await session.execute(
                     delete(XcVodMetadataCache).where(
                         XcVodMetadataCache.playlist_id == int(playlist_id),
@@ -2137,23 +2355,108 @@ async def _upsert_vod_type(playlist_id: int, kind: str, categories: list[dict],
                     )
                 )
 
+    async with Session() as session:
+        async with session.begin():
+            stale_categories_result = await session.execute(
+                select(XcVodCategory.id).where(
+                    XcVodCategory.playlist_id == int(playlist_id),
+                    XcVodCategory.category_type == kind,
+                    XcVodCategory.upstream_category_id.not_in(list(category_by_upstream.keys()) or [""]),
+                )
+            )
+            stale_categories = [int(row[0]) for row in stale_categories_result.all()]
+            if stale_categories:
+                await _delete_ids_in_batches(session, XcVodCategory, stale_categories)
+
+    _discard_vod_sync_state(playlist_id, kind)
+    return stats, changeset
+
+
+def _vod_group_changeset_path(group_id: int) -> str:
+    return os.path.join(_vod_sync_dir(), f"group_{int(group_id)}.changes.json")
+
+
+def record_vod_group_changeset(group_id: int, changeset: dict[str, object] | None = None) -> bool:
+    """
+    Merge a catalogue changeset into the changes pending for a group's next cache rebuild. Passing no
+    changeset (or one flagged ``full``) requests a full rebuild. Returns True when the group has anything
+    pending, i.e. when a rebuild needs to be queued.
+    """
+    path = _vod_group_changeset_path(group_id)
+    pending = _load_json_file_sync(Path(path))
+    if changeset is not None and not changeset.get("full"):
+        removed_category_items = (changeset.get("removed_category_items") or {}).get(str(int(group_id))) or []
+        if not (changeset.get("added") or changeset.get("modified") or removed_category_items) and not pending:
+            return False
+    pending.setdefault("full", False)
+    if changeset is None or changeset.get("full"):
+        pending = {"full": True}
+    elif not pending["full"]:
+        for key in ("added", "modified", "removed"):
+            pending[key] = sorted(set(pending.get(key) or []) | set(changeset.get(key) or []))
+        pending["removed_category_item_ids"] = sorted(
+            set(pending.get("removed_category_item_ids") or []) | set(removed_category_items)
+        )
+        change_count = sum(len(pending[key]) for key in ("added", "modified", "removed_category_item_ids"))
+        if change_count > VOD_GROUP_CHANGESET_MAX_ITEMS:
+            pending = {"full": True}
+    _write_json_file_sync(Path(path), pending)
+    return True
 
-async def rebuild_vod_group_caches_for_playlist(playlist_id: int) -> int:
+
+def _take_vod_group_changeset(group_id: int) -> dict[str, object] | None:
+    """Claim the pending changeset of a group. None means nothing was recorded and a full rebuild is needed."""
+    path = _vod_group_changeset_path(group_id)
+    claimed_path = f"{path}.{os.getpid()}.claimed"
+    try:
+        os.replace(path, claimed_path)
+    except FileNotFoundError:
+        return None
+    try:
+        return _load_json_file_sync(Path(claimed_path)) or None
+    finally:
+        try:
+            os.remove(claimed_path)
+        except FileNotFoundError:
+            pass
+
+
+async def rebuild_vod_group_caches_for_playlist(playlist_id: int, changesets: list[dict] | None = None) -> int:
+    """
+    Queue cache rebuilds for every group fed by the playlist. With catalogue ``changesets`` from a sync, only
+    groups of a changed content type are queued and their rebuild applies just that delta.
+    """
     async with Session() as session:
         result = await session.execute(
-            select(VodCategory.id)
+            select(VodCategory.id, VodCategory.content_type)
             .join(VodCategoryXcCategory, VodCategoryXcCategory.category_id == VodCategory.id)
             .join(XcVodCategory, XcVodCategory.id == VodCategoryXcCategory.xc_category_id)
             .where(XcVodCategory.playlist_id == int(playlist_id))
         )
-        group_ids = sorted({int(row[0]) for row in result.all() if row and row[0] is not None})
-    for group_id in group_ids:
-        await queue_rebuild_vod_group_cache(group_id)
+        groups = sorted({(int(row[0]), row[1]) for row in result.all() if row and row[0] is not None})
+    queued = 0
+    for group_id, content_type in groups:
+        if changesets is None:
+            pending = record_vod_group_changeset(group_id)
+        else:
+            pending = False
+            for changeset in changesets:
+                if changeset.get("kind") == content_type:
+                    pending = record_vod_group_changeset(group_id, changeset) or pending
+        if not pending:
+            continue
+        await queue_rebuild_vod_group_cache(group_id, full=False)
+        queued += 1
+    return queued
 
 
-async def queue_rebuild_vod_group_cache(group_id: int) -> bool:
+async def queue_rebuild_vod_group_cache(group_id: int, full: bool = True) -> bool:
     from backend.api.tasks import TaskQueueBroker
 
+    if full:
+        # Group configuration changed, so any pending delta no longer describes the cache correctly.
+        record_vod_group_changeset(group_id)
+
     async with Session() as session:
         group = await session.get(VodCategory, int(group_id))
         if group is None:
@@ -2176,29 +2479,213 @@ async def queue_rebuild_vod_group_cache(group_id: int) -> bool:
 
 
 async def rebuild_vod_group_cache(group_id: int, queue_sync: bool = True) -> bool:
+    """
+    Bring a group's deduplicated item cache up to date. A pending catalogue changeset is applied
+    incrementally; without one (or if applying it fails) the whole cache is rebuilt.
+    """
+    changeset = _take_vod_group_changeset(group_id)
+    applied = False
+    if changeset is not None and not changeset.get("full"):
+        try:
+            applied = await _apply_vod_group_changeset(group_id, changeset)
+        except Exception:
+            logger.exception("Incremental cache rebuild failed for VOD group #%s; rebuilding in full", group_id)
+    if not applied and not await _rebuild_vod_group_cache_full(group_id):
+        return False
+
+    if queue_sync:
+        await queue_vod_category_strm_sync(int(group_id))
+    return True
+
+
+def _vod_group_source_sort_key(category_priority_by_id: dict[int, int]):
+    return lambda item: (
+        -int(category_priority_by_id.get(int(getattr(item, "category_id", 0) or 0), 0)),
+        clean_text(getattr(item, "title", "")).lower(),
+        int(getattr(item, "id", 0) or 0),
+    )
+
+
+def _apply_vod_group_item_fields(group_item: VodCategoryItem, representative: XcVodItem, strip_rules):
+    strip_prefixes, strip_suffixes = strip_rules
+    display_title = _export_title_from_source_title(
+        representative.title,
+        prefixes=strip_prefixes,
+        suffixes=strip_suffixes,
+    )
+    group_item.title = _truncated_vod_text(display_title or representative.title)
+    group_item.sort_title = _truncated_vod_text(display_title or representative.sort_title)
+    group_item.release_date = representative.release_date
+    group_item.year = representative.year
+    group_item.rating = representative.rating
+    group_item.poster_url = representative.poster_url
+    group_item.container_extension = representative.container_extension
+    group_item.summary_json = representative.summary_json
+
+
+async def _load_vod_group_rules(session, group_id: int):
+    result = await session.execute(
+        select(VodCategory).options(selectinload(VodCategory.xc_category_links)).where(VodCategory.id == int(group_id))
+    )
+    group = result.scalars().first()
+    if group is None:
+        return None, [], {}, {}
+    ordered_links = _ordered_vod_category_links(group.xc_category_links)
+    category_ids = _ordered_vod_category_ids(ordered_links)
+    strip_rules_by_category_id = {
+        int(link.xc_category_id): (
+            _group_category_strip_prefixes(link),
+            _group_category_strip_suffixes(link),
+        )
+        for link in ordered_links
+    }
+    return group, category_ids, strip_rules_by_category_id, _vod_category_priority_map(ordered_links)
+
+
+async def _apply_vod_group_changeset(group_id: int, changeset: dict[str, object]) -> bool:
+    """
+    Apply a catalogue changeset to a group's dedupe buckets. Only buckets that contain a changed or removed
+    source, or that a changed source now maps into, are recomputed. Returns False when a full rebuild is needed.
+    """
+    started_at = time.perf_counter()
+    changed_source_ids = {int(item_id) for item_id in (changeset.get("added") or []) + (changeset.get("modified") or [])}
+    removed_category_item_ids = {int(item_id) for item_id in changeset.get("removed_category_item_ids") or []}
     async with Session() as session:
         async with session.begin():
-            result = await session.execute(
-                select(VodCategory)
-                .options(selectinload(VodCategory.xc_category_links))
-                .where(VodCategory.id == int(group_id))
+            group, category_ids, strip_rules_by_category_id, category_priority_by_id = await _load_vod_group_rules(
+                session, group_id
             )
-            group = result.scalars().first()
-            if group is None:
+            if group is None or not category_ids:
                 return False
 
-            ordered_links = _ordered_vod_category_links(group.xc_category_links)
-            category_ids = _ordered_vod_category_ids(ordered_links)
-            if not category_ids:
+            affected_item_ids = set(removed_category_item_ids)
+            changed_sources_by_key = {}
+            for batch in _batched(sorted(changed_source_ids)):
+                links_result = await session.execute(
+                    select(VodCategoryItemSource.category_item_id)
+                    .join(VodCategoryItem, VodCategoryItem.id == VodCategoryItemSource.category_item_id)
+                    .where(
+                        VodCategoryItem.category_id == int(group_id),
+                        VodCategoryItemSource.source_item_id.in_(batch),
+                    )
+                )
+                affected_item_ids.update(int(row[0]) for row in links_result.all())
+                sources_result = await session.execute(
+                    select(XcVodItem).where(
+                        XcVodItem.id.in_(batch),
+                        XcVodItem.category_id.in_(category_ids),
+                        XcVodItem.item_type == group.content_type,
+                    )
+                )
+                for source_item in sources_result.scalars().all():
+                    strip_prefixes, strip_suffixes = strip_rules_by_category_id.get(
+                        int(source_item.category_id or 0), ([], [])
+                    )
+                    dedupe_key = _dedupe_key_for_item(source_item, prefixes=strip_prefixes, suffixes=strip_suffixes)
+                    changed_sources_by_key.setdefault(dedupe_key, []).append(source_item)
+
+            affected_keys = set(changed_sources_by_key.keys())
+            for batch in _batched(sorted(affected_item_ids)):
+                keys_result = await session.execute(
+                    select(VodCategoryItem.dedupe_key).where(
+                        VodCategoryItem.category_id == int(group_id),
+                        VodCategoryItem.id.in_(batch),
+                    )
+                )
+                affected_keys.update(clean_text(row[0]) for row in keys_result.all() if clean_text(row[0]))
+            if not affected_keys:
                 return True
-            strip_rules_by_category_id = {
-                int(link.xc_category_id): (
-                    _group_category_strip_prefixes(link),
-                    _group_category_strip_suffixes(link),
+
+            group_items_by_key = {}
+            for batch in _batched(sorted(affected_keys)):
+                items_result = await session.execute(
+                    select(VodCategoryItem).where(
+                        VodCategoryItem.category_id == int(group_id),
+                        VodCategoryItem.dedupe_key.in_(batch),
+                    )
                 )
-                for link in ordered_links
-            }
-            category_priority_by_id = _vod_category_priority_map(ordered_links)
+                for group_item in items_result.scalars().all():
+                    group_items_by_key[clean_text(group_item.dedupe_key)] = group_item
+
+            # Unchanged sources keep the bucket they were linked to by the previous rebuild.
+            buckets = {key: list(sources) for key, sources in changed_sources_by_key.items()}
+            key_by_item_id = {int(item.id): key for key, item in group_items_by_key.items()}
+            for batch in _batched(sorted(key_by_item_id.keys())):
+                existing_sources_result = await session.execute(
+                    select(VodCategoryItemSource.category_item_id, XcVodItem)
+                    .join(XcVodItem, XcVodItem.id == VodCategoryItemSource.source_item_id)
+                    .where(
+                        VodCategoryItemSource.category_item_id.in_(batch),
+                        XcVodItem.id.not_in(list(changed_source_ids) or [0]),
+                        XcVodItem.category_id.in_(category_ids),
+                    )
+                )
+                for category_item_id, source_item in existing_sources_result.all():
+                    buckets.setdefault(key_by_item_id[int(category_item_id)], []).append(source_item)
+
+            sort_key = _vod_group_source_sort_key(category_priority_by_id)
+            stale_item_ids = []
+            touched_items = []
+            for dedupe_key in affected_keys:
+                sources = sorted(buckets.get(dedupe_key) or [], key=sort_key)
+                group_item = group_items_by_key.get(dedupe_key)
+                if not sources:
+                    if group_item is not None:
+                        stale_item_ids.append(int(group_item.id))
+                    continue
+                if group_item is None:
+                    group_item = VodCategoryItem(
+                        category_id=int(group.id),
+                        item_type=group.content_type,
+                        dedupe_key=dedupe_key,
+                    )
+                    session.add(group_item)
+                representative = sources[0]
+                _apply_vod_group_item_fields(
+                    group_item,
+                    representative,
+                    strip_rules_by_category_id.get(int(getattr(representative, "category_id", 0) or 0), ([], [])),
+                )
+                touched_items.append((group_item, sources))
+
+            await session.flush()
+            touched_item_ids = [int(group_item.id) for group_item, _ in touched_items]
+            for batch in _batched(touched_item_ids):
+                await session.execute(
+                    delete(VodCategoryItemSource).where(VodCategoryItemSource.category_item_id.in_(batch))
+                )
+            session.add_all(
+                [
+                    VodCategoryItemSource(category_item_id=int(group_item.id), source_item_id=int(source_item.id))
+                    for group_item, sources in touched_items
+                    for source_item in sources
+                ]
+            )
+            for batch in _batched(stale_item_ids):
+                await session.execute(delete(VodCategoryItem).where(VodCategoryItem.id.in_(batch)))
+
+    logger.info(
+        "Applied catalogue changes to VOD group #%s in %.2fs (added=%s, modified=%s, removed=%s, buckets=%s)",
+        group_id,
+        time.perf_counter() - started_at,
+        len(changeset.get("added") or []),
+        len(changeset.get("modified") or []),
+        len(changeset.get("removed") or []),
+        len(affected_keys),
+    )
+    return True
+
+
+async def _rebuild_vod_group_cache_full(group_id: int) -> bool:
+    async with Session() as session:
+        async with session.begin():
+            group, category_ids, strip_rules_by_category_id, category_priority_by_id = await _load_vod_group_rules(
+                session, group_id
+            )
+            if group is None:
+                return False
+            if not category_ids:
+                return True
 
             source_result = await session.execute(
                 select(XcVodItem).where(
@@ -2207,12 +2694,7 @@ async def rebuild_vod_group_cache(group_id: int, queue_sync: bool = True) -> boo
                 )
             )
             source_items = sorted(
-                source_result.scalars().all(),
-                key=lambda item: (
-                    -int(category_priority_by_id.get(int(getattr(item, "category_id", 0) or 0), 0)),
-                    clean_text(getattr(item, "title", "")).lower(),
-                    int(getattr(item, "id", 0) or 0),
-                ),
+                source_result.scalars().all(), key=_vod_group_source_sort_key(category_priority_by_id)
             )
             buckets = {}
             for source_item in source_items:
@@ -2238,15 +2720,6 @@ async def rebuild_vod_group_cache(group_id: int, queue_sync: bool = True) -> boo
 
             for dedupe_key, bucket in buckets.items():
                 representative = bucket["representative"]
-                strip_prefixes, strip_suffixes = strip_rules_by_category_id.get(
-                    int(getattr(representative, "category_id", 0) or 0),
-                    ([], []),
-                )
-                display_title = _export_title_from_source_title(
-                    representative.title,
-                    prefixes=strip_prefixes,
-                    suffixes=strip_suffixes,
-                )
                 group_item = existing_items_by_dedupe.get(dedupe_key)
                 if group_item is None:
                     group_item = VodCategoryItem(
@@ -2255,14 +2728,11 @@ async def rebuild_vod_group_cache(group_id: int, queue_sync: bool = True) -> boo
                         dedupe_key=dedupe_key,
                     )
                     session.add(group_item)
-                group_item.title = _truncated_vod_text(display_title or representative.title)
-                group_item.sort_title = _truncated_vod_text(display_title or representative.sort_title)
-                group_item.release_date = representative.release_date
-                group_item.year = representative.year
-                group_item.rating = representative.rating
-                group_item.poster_url = representative.poster_url
-                group_item.container_extension = representative.container_extension
-                group_item.summary_json = representative.summary_json
+                _apply_vod_group_item_fields(
+                    group_item,
+                    representative,
+                    strip_rules_by_category_id.get(int(getattr(representative, "category_id", 0) or 0), ([], [])),
+                )
                 seen_dedupe_keys.add(dedupe_key)
 
             await session.flush()
@@ -2311,9 +2781,6 @@ async def rebuild_vod_group_cache(group_id: int, queue_sync: bool = True) -> boo
             if stale_item_ids:
                 await session.execute(delete(VodCategoryItem).where(VodCategoryItem.id.in_(stale_item_ids)))
         await session.commit()
-
-    if queue_sync:
-        await queue_vod_category_strm_sync(int(group_id))
     return True
 
 
@@ -3345,6 +3812,7 @@ async def delete_vod_group(group_id: int) -> bool:
             if group is None:
                 return False
             await session.delete(group)
+    invalidate_xc_catalogue(XC_CATALOGUE_VOD)
     await queue_all_vod_category_strm_syncs()
     return True
 
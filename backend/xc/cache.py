@@ -1,7 +1,12 @@
 #!/usr/bin/env python3
 # -*- coding:utf-8 -*-
+import asyncio
+import hashlib
+import json
 import time
-from typing import Any
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
 
 
 class TtlCache:
@@ -24,3 +29,85 @@ class TtlCache:
 
 
 xc_cache = TtlCache()
+
+
+XC_CATALOGUE_LIVE = "live"
+XC_CATALOGUE_VOD = "vod"
+XC_CATALOGUE_MAX_ENTRIES = 512
+
+
+@dataclass(frozen=True)
+class XcJsonSnapshot:
+    body: bytes
+    etag: str
+
+
+class XcCatalogueCache:
+    """
+    Versioned snapshots of the XC catalogue. Entries stay valid until their scope is invalidated by a
+    channel, playlist, settings or VOD change, instead of expiring on a timer. Concurrent requests for the
+    same entry share one build, so a burst of client start-up requests only builds each snapshot once.
+    Builds for different entries run independently and may themselves read other entries of the same scope.
+    """
+
+    def __init__(self, max_entries: int = XC_CATALOGUE_MAX_ENTRIES):
+        self._max_entries = max_entries
+        self._versions: dict[str, int] = {}
+        self._entries: OrderedDict[tuple, tuple[int, Any]] = OrderedDict()
+        self._inflight: dict[tuple, asyncio.Task] = {}
+
+    def version(self, scope: str) -> int:
+        return self._versions.get(scope, 0)
+
+    def invalidate(self, *scopes: str):
+        for scope in scopes:
+            self._versions[scope] = self.version(scope) + 1
+            for key in [key for key in self._entries if key[0] == scope]:
+                self._entries.pop(key, None)
+
+    def _lookup(self, entry_key: tuple, version: int):
+        entry = self._entries.get(entry_key)
+        if entry is None or entry[0] != version:
+            return None
+        self._entries.move_to_end(entry_key)
+        return entry
+
+    async def get_or_build(self, scope: str, key: tuple, builder: Callable[[], Awaitable[Any]]):
+        entry_key = (scope, *key)
+        entry = self._lookup(entry_key, self.version(scope))
+        if entry is not None:
+            return entry[1]
+        version = self.version(scope)
+        flight_key = (entry_key, version)
+        task = self._inflight.get(flight_key)
+        if task is None:
+            task = asyncio.create_task(self._build(entry_key, version, builder))
+            self._inflight[flight_key] = task
+            task.add_done_callback(lambda _task: self._inflight.pop(flight_key, None))
+        # Shielded so a disconnecting client never cancels the build for everyone else.
+        return await asyncio.shield(task)
+
+    async def _build(self, entry_key: tuple, version: int, builder: Callable[[], Awaitable[Any]]):
+        value = await builder()
+        # Store against the version the build started from, so an invalidation during the build wins.
+        if self.version(entry_key[0]) == version:
+            self._entries[entry_key] = (version, value)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    async def get_json_snapshot(
+        self, scope: str, key: tuple, builder: Callable[[], Awaitable[Any]]
+    ) -> XcJsonSnapshot:
+        async def build_snapshot():
+            body = json.dumps(await builder(), separators=(",", ":")).encode("utf-8")
+            return XcJsonSnapshot(body=body, etag=f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"')
+
+        return await self.get_or_build(scope, ("json", *key), build_snapshot)
+
+
+xc_catalogue_cache = XcCatalogueCache()
+
+
+def invalidate_xc_catalogue(*scopes: str):
+    xc_catalogue_cache.invalidate(*(scopes or (XC_CATALOGUE_LIVE, XC_CATALOGUE_VOD)))
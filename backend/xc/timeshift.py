@@ -11,7 +11,7 @@ from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlunparse
 import aiohttp
 from quart import Response, current_app, jsonify, request
 
-from backend.hls_multiplexer import open_segment_passthrough
+from backend.hls_multiplexer import open_segment_passthrough, upstream_http_client
 from backend.playlists import _resolve_source_request_headers
 from backend.stream_activity import stop_stream_activity, touch_stream_activity
 from backend.stream_profiles import content_type_for_media_path
@@ -155,11 +155,13 @@ async def detect_xc_timeshift_datetime_format(archive_source: dict, request_head
     probe_url = f"{host_url}/player_api.php"
     timeout = aiohttp.ClientTimeout(total=10)
     try:
-        async with aiohttp.ClientSession(timeout=timeout) as client_session:
-            async with client_session.get(probe_url, params=query_params, headers=probe_headers) as response:
-                if response.status >= 400:
-                    return None
-                payload = await response.json(content_type=None)
+        client_session = upstream_http_client.session()
+        async with client_session.get(
+            probe_url, params=query_params, headers=probe_headers, timeout=timeout
+        ) as response:
+            if response.status >= 400:
+                return None
+            payload = await response.json(content_type=None)
     except Exception:
         return None
 
@@ -328,11 +330,10 @@ async def stream_xc_timeshift_response(
     Stream a timeshift TS response back to the client while keeping the
     upstream response shape close enough for playback and seeking.
     """
-    client_session = None
     upstream_response = None
 
     try:
-        client_session, upstream_response = await open_segment_passthrough(
+        upstream_response = await open_segment_passthrough(
             upstream_url,
             headers=headers,
             method=request.method,
@@ -342,10 +343,6 @@ async def stream_xc_timeshift_response(
 
     # Startup failures should tear down the activity entry immediately.
     if upstream_response is None:
-        if upstream_response is not None:
-            upstream_response.release()
-        if client_session is not None:
-            await client_session.close()
         await stop_stream_activity(
             identity,
             connection_id=connection_id,
@@ -364,8 +361,6 @@ async def stream_xc_timeshift_response(
         content_type = upstream_response.headers.get("Content-Type", "text/plain")
         status = upstream_response.status
         upstream_response.release()
-        if client_session is not None:
-            await client_session.close()
         await stop_stream_activity(
             identity,
             connection_id=connection_id,
@@ -386,8 +381,6 @@ async def stream_xc_timeshift_response(
         )
         copy_xc_passthrough_response_headers(response, upstream_response.headers)
         upstream_response.release()
-        if client_session is not None:
-            await client_session.close()
         return response
 
     async def _generator():
@@ -404,8 +397,6 @@ async def stream_xc_timeshift_response(
                 upstream_response.close()
             except Exception:
                 pass
-            if client_session is not None:
-                await client_session.close()
             await stop_stream_activity(
                 identity,
                 connection_id=connection_id,
@@ -485,14 +476,17 @@ async def fetch_and_rewrite_xc_timeshift_manifest(
     """
     current_app.logger.warning("XC timeshift upstream manifest request: %s", upstream_url)
     timeout = aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=120)
-    async with aiohttp.ClientSession(headers=request_headers, timeout=timeout) as client_session:
-        try:
-            upstream_response = await client_session.get(upstream_url, allow_redirects=True)
-        except (aiohttp.ClientError, asyncio.TimeoutError):
-            response = jsonify({"error": "Unable to start timeshift playback"})
-            response.status_code = 502
-            return response
+    client_session = upstream_http_client.session()
+    try:
+        upstream_response = await client_session.get(
+            upstream_url, headers=request_headers, allow_redirects=True, timeout=timeout
+        )
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        response = jsonify({"error": "Unable to start timeshift playback"})
+        response.status_code = 502
+        return response
 
+    async with upstream_response:
         if upstream_response.status >= 400:
             body = await upstream_response.read()
             return Response(
@@ -54,6 +54,15 @@ export default function pollForBackgroundTasks() {
             taskState: 'running',
           });
         }
+        for (let i in (payload.data['source_refreshes'] || [])) {
+          const refresh = payload.data['source_refreshes'][i];
+          const stageLabel = refresh.stage ? ` - ${refresh.stage}${refresh.state === 'waiting' ? ' (waiting)' : ''}` : '';
+          tasks.push({
+            icon: refresh.state === 'waiting' ? 'hourglass_empty' : 'pending',
+            name: `Refreshing ${refresh.name}${stageLabel}`,
+            taskState: refresh.state === 'waiting' ? 'queued' : 'running',
+          });
+        }
         for (let i in payload.data['pending_tasks']) {
           tasks.push({
             icon: 'radio_button_unchecked',
@@ -0,0 +1,53 @@
+"""add integer start/stop timestamps to epg programmes
+
+Revision ID: b7c8d9e0f1a2
+Revises: a6b7c8d9e0f1
+Create Date: 2026-04-14 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7c8d9e0f1a2'
+down_revision = 'a6b7c8d9e0f1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('epg_channel_programmes', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('start_ts', sa.BigInteger(), nullable=True))
+        batch_op.add_column(sa.Column('stop_ts', sa.BigInteger(), nullable=True))
+
+    op.execute(
+        """
+        UPDATE epg_channel_programmes
+        SET start_ts = CASE
+                WHEN trim(coalesce(start_timestamp, '')) ~ '^-?[0-9]{1,18}$' THEN trim(start_timestamp)::bigint
+                ELSE NULL
+            END,
+            stop_ts = CASE
+                WHEN trim(coalesce(stop_timestamp, '')) ~ '^-?[0-9]{1,18}$' THEN trim(stop_timestamp)::bigint
+                ELSE NULL
+            END
+        """
+    )
+
+    op.create_index(
+        'ix_epg_channel_programmes_epg_channel_id_start_ts_stop_ts',
+        'epg_channel_programmes',
+        ['epg_channel_id', 'start_ts', 'stop_ts'],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index(
+        'ix_epg_channel_programmes_epg_channel_id_start_ts_stop_ts',
+        table_name='epg_channel_programmes',
+    )
+    with op.batch_alter_table('epg_channel_programmes', schema=None) as batch_op:
+        batch_op.drop_column('stop_ts')
+        batch_op.drop_column('start_ts')
@@ -0,0 +1,43 @@
+"""add staging and retired generations to epg channels
+
+Revision ID: c8d9e0f1a2b3
+Revises: b7c8d9e0f1a2
+Create Date: 2026-04-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c8d9e0f1a2b3'
+down_revision = 'b7c8d9e0f1a2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('epg_channels', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('staging_epg_id', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('retired_epg_id', sa.Integer(), nullable=True))
+        batch_op.alter_column('epg_id', existing_type=sa.Integer(), nullable=True)
+        batch_op.create_index('ix_epg_channels_staging_epg_id', ['staging_epg_id'], unique=False)
+        batch_op.create_index('ix_epg_channels_retired_epg_id', ['retired_epg_id'], unique=False)
+
+
+def downgrade():
+    op.execute(
+        """
+        DELETE FROM epg_channel_programmes AS p
+        USING epg_channels AS c
+        WHERE p.epg_channel_id = c.id
+          AND c.epg_id IS NULL
+        """
+    )
+    op.execute("DELETE FROM epg_channels WHERE epg_id IS NULL")
+    with op.batch_alter_table('epg_channels', schema=None) as batch_op:
+        batch_op.drop_index('ix_epg_channels_retired_epg_id')
+        batch_op.drop_index('ix_epg_channels_staging_epg_id')
+        batch_op.alter_column('epg_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.drop_column('retired_epg_id')
+        batch_op.drop_column('staging_epg_id')
@@ -0,0 +1,26 @@
+"""add payload hash to xc vod items
+
+Revision ID: d9e0f1a2b3c4
+Revises: c8d9e0f1a2b3
+Create Date: 2026-04-16 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd9e0f1a2b3c4'
+down_revision = 'c8d9e0f1a2b3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('xc_vod_items', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('payload_hash', sa.String(length=32), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('xc_vod_items', schema=None) as batch_op:
+        batch_op.drop_column('payload_hash')
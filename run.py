@@ -21,9 +21,10 @@ from backend.api.tasks import (
     reconcile_plex_live_tv,
 )
 from backend.api.routes_hls_proxy import cleanup_hls_proxy_state
+from backend.hls_multiplexer import upstream_http_client, upstream_stream_http_client
 from backend.cso import cleanup_vod_proxy_cache, vod_cache_manager
 from backend.stream_activity import load_stream_activity_state, persist_stream_activity_state
-from backend.auth import cleanup_stream_audit_logs, audit_stream_event
+from backend.auth import cleanup_stream_audit_logs, audit_stream_event, flush_stream_audit_events
 from backend import create_app, config
 import asyncio
 import os
@@ -304,6 +305,12 @@ async def main():
     finally:
         async with app.app_context():
             await persist_stream_activity_state()
+            try:
+                await flush_stream_audit_events()
+            except Exception:
+                app.logger.exception("Failed to flush buffered stream audit events")
+        await upstream_http_client.close()
+        await upstream_stream_http_client.close()
 
 
 if __name__ == "__main__":